@@ -0,0 +1,207 @@
+# Libs
+import pandas as pd
+from typing import Iterable, List, Optional, Union
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from e_commerce.conections.sql import connect, _qualified_name
+
+# Tabela de resumo: um registro por dia x produto x categoria x forma de pagamento.
+# É uma tabela (e não uma materialized view) para permitir recalcular só os meses afetados.
+SUMMARY_TABLE = 'ecommerce_america_daily_kpis'
+
+_SUMMARY_COLUMNS = """
+    day DATE NOT NULL,
+    product TEXT NOT NULL,
+    product_category TEXT NOT NULL,
+    payment_method TEXT NOT NULL,
+    orders BIGINT NOT NULL,
+    payments BIGINT NOT NULL,
+    quantity BIGINT,
+    sales DOUBLE PRECISION,
+    gross_revenue DOUBLE PRECISION,
+    discount DOUBLE PRECISION,
+    profit DOUBLE PRECISION,
+    margin_sum DOUBLE PRECISION,
+    margin_count BIGINT,
+    PRIMARY KEY (day, product, product_category, payment_method)
+"""
+
+# Agregação das linhas brutas no grão da tabela de resumo ({source} e {where} são preenchidos na execução)
+_SUMMARY_SELECT = """
+    SELECT
+        CAST(DATE_TRUNC('day', order_date) AS DATE) AS day,
+        COALESCE(product, '') AS product,
+        COALESCE(product_category, '') AS product_category,
+        COALESCE(payment_method, '') AS payment_method,
+        COUNT(*) AS orders,
+        COUNT(payment_method) AS payments,
+        SUM(quantity) AS quantity,
+        SUM(sales) AS sales,
+        SUM(gross_revenue) AS gross_revenue,
+        SUM(discount) AS discount,
+        SUM(profit) AS profit,
+        SUM(profit / NULLIF(sales, 0)) AS margin_sum,
+        COUNT(profit / NULLIF(sales, 0)) AS margin_count
+    FROM {source}
+    {where}
+    GROUP BY 1, 2, 3, 4
+"""
+
+# KPIs do arquivo america_ecommerce_kpis.sql calculados sobre a tabela de resumo
+KPI_QUERIES = {
+    'ticket_medio': """
+        SELECT ROUND(CAST(SUM(sales) / SUM(orders) AS numeric), 2) AS ticket_medio
+        FROM {summary} {where}""",
+    'desconto_medio': """
+        SELECT ROUND(CAST(SUM(discount) / SUM(orders) AS numeric), 1) * 10 AS desconto_medio_porcentagem
+        FROM {summary} {where}""",
+    'volume_vendas': """
+        SELECT SUM(quantity) AS qtde_vendidas
+        FROM {summary} {where}""",
+    'vendas_mes': """
+        SELECT DATE_TRUNC('month', day) AS mes, SUM(sales) AS total_de_vendas
+        FROM {summary} {where}
+        GROUP BY 1 ORDER BY mes""",
+    'vendas_dia': """
+        SELECT day AS dia_mes, SUM(sales) AS total_de_vendas
+        FROM {summary} {where}
+        GROUP BY 1 ORDER BY dia_mes""",
+    'top_produtos_faturamento': """
+        SELECT product AS produto, SUM(gross_revenue) AS faturamento_bruto
+        FROM {summary} {where}
+        GROUP BY product ORDER BY faturamento_bruto DESC""",
+    'top_categorias_faturamento': """
+        SELECT product_category AS categoria_do_produto, SUM(gross_revenue) AS faturamento_bruto
+        FROM {summary} {where}
+        GROUP BY product_category ORDER BY faturamento_bruto DESC""",
+    'top_produtos_lucro': """
+        SELECT product AS produto, SUM(profit) AS lucro_por_produto
+        FROM {summary} {where}
+        GROUP BY product ORDER BY lucro_por_produto DESC""",
+    'top_categorias_lucro': """
+        SELECT product_category AS categoria_do_produto, SUM(profit) AS lucro_por_categoria
+        FROM {summary} {where}
+        GROUP BY product_category ORDER BY lucro_por_categoria DESC""",
+    'margem_produto': """
+        SELECT product, ROUND(CAST(SUM(margin_sum) / SUM(margin_count) AS numeric) * 100, 1) AS margem_lucro_media
+        FROM {summary} {where}
+        GROUP BY product ORDER BY margem_lucro_media DESC""",
+    'formas_pagamento': """
+        SELECT payment_method, SUM(payments) AS qtde_metodo_pagamento
+        FROM {summary} {where}
+        GROUP BY payment_method ORDER BY qtde_metodo_pagamento DESC""",
+}
+
+
+def months_from_frame(df: pd.DataFrame, date_column: str = 'order_date') -> List[pd.Timestamp]:
+    """
+    Meses presentes em um lote (ex.: o DataFrame passado ao bulk_load/merge_load).
+    """
+    months = pd.to_datetime(df[date_column]).dt.to_period('M').dropna().unique()
+    return sorted(month.to_timestamp() for month in months)
+
+
+def create_kpi_summary(
+    connection_string: Union[str, Engine],
+    schema: Optional[str] = 'e-commerce',
+    summary_table: str = SUMMARY_TABLE,
+    search_path: Optional[str] = None
+) -> None:
+    """
+    Cria a tabela de resumo dos KPIs (se ainda não existir).
+    """
+    with connect(connection_string, search_path=search_path) as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {_qualified_name(summary_table, schema)} ({_SUMMARY_COLUMNS})"))
+        conn.commit()
+
+
+def refresh_kpi_summary(
+    connection_string: Union[str, Engine],
+    months: Optional[Iterable] = None,
+    table_name: str = 'ecommerce_america',
+    schema: Optional[str] = 'e-commerce',
+    summary_table: str = SUMMARY_TABLE,
+    search_path: Optional[str] = None
+) -> int:
+    """
+    Recalcula a tabela de resumo dos KPIs.
+
+    Com months, apenas esses meses são apagados e recalculados (cada mês lê só a sua
+    partição da tabela base); sem months, o resumo é reconstruído por inteiro.
+    Tudo acontece em uma transação, então o dashboard nunca vê um mês pela metade.
+
+    Args:
+        connection_string: String de conexão SQLAlchemy (postgresql://...) ou Engine
+        months: Meses afetados (ex.: ['2018-03', '2018-04'] ou months_from_frame(lote))
+        table_name: Tabela base com as vendas
+        schema: Schema das tabelas
+        summary_table: Tabela de resumo
+        search_path: Schema padrão da conexão (opcional)
+
+    Returns:
+        Linhas gravadas na tabela de resumo
+    """
+    create_kpi_summary(connection_string, schema, summary_table, search_path)
+    source = _qualified_name(table_name, schema)
+    summary = _qualified_name(summary_table, schema)
+
+    written = 0
+    with connect(connection_string, search_path=search_path) as conn:
+        if months is None:
+            conn.execute(text(f"TRUNCATE {summary}"))
+            select = _SUMMARY_SELECT.format(source=source, where='')
+            written = conn.execute(text(f"INSERT INTO {summary} {select}")).rowcount
+        else:
+            starts = sorted({pd.Timestamp(month).to_period('M').to_timestamp() for month in months})
+            for start in starts:
+                params = {'start': start.to_pydatetime(), 'end': (start + pd.offsets.MonthBegin(1)).to_pydatetime()}
+                conn.execute(text(f"DELETE FROM {summary} WHERE day >= :start AND day < :end"), params)
+                select = _SUMMARY_SELECT.format(source=source, where="WHERE order_date >= :start AND order_date < :end")
+                written += conn.execute(text(f"INSERT INTO {summary} {select}"), params).rowcount
+        conn.commit()
+
+    print(f"✅ Resumo de KPIs atualizado: {written} linhas ({'todos os meses' if months is None else f'{len(starts)} mês(es)'})")
+    return written
+
+
+def get_kpi(
+    name: str,
+    connection_string: Union[str, Engine],
+    start=None,
+    end=None,
+    top: Optional[int] = None,
+    schema: Optional[str] = 'e-commerce',
+    summary_table: str = SUMMARY_TABLE,
+    search_path: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Retorna um KPI já agregado, lido da tabela de resumo (sem varrer as linhas de vendas).
+
+    Args:
+        name: KPI desejado (chaves de KPI_QUERIES, ex.: 'ticket_medio', 'vendas_mes', 'top_produtos_lucro')
+        connection_string: String de conexão SQLAlchemy (postgresql://...) ou Engine
+        start: Início do período (inclusive, opcional)
+        end: Fim do período (exclusivo, opcional)
+        top: Limita o resultado às N primeiras linhas (ex.: top 10 produtos)
+        schema: Schema da tabela de resumo
+        summary_table: Tabela de resumo
+        search_path: Schema padrão da conexão (opcional)
+    """
+    if name not in KPI_QUERIES:
+        raise ValueError(f"KPI inválido: {name}. Opções: {', '.join(KPI_QUERIES)}")
+
+    filters, params = [], {}
+    if start is not None:
+        filters.append("day >= :start")
+        params['start'] = pd.Timestamp(start).date()
+    if end is not None:
+        filters.append("day < :end")
+        params['end'] = pd.Timestamp(end).date()
+    where = f"WHERE {' AND '.join(filters)}" if filters else ''
+
+    query = KPI_QUERIES[name].format(summary=_qualified_name(summary_table, schema), where=where)
+    if top:
+        query += f" LIMIT {int(top)}"
+
+    with connect(connection_string, search_path=search_path) as conn:
+        return pd.read_sql_query(text(query), conn, params=params)
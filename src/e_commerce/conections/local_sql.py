@@ -0,0 +1,176 @@
+# Libs
+import os
+import re
+import pandas as pd
+from typing import Any, Dict, Optional
+from e_commerce.config.settings import KPI_SQL_FILE
+from e_commerce.utils.file_paths import get_file_path
+
+# Dataset usado como "e-commerce".ecommerce_america quando nenhum arquivo é informado
+DEFAULT_LOCAL_DATASET = 'e_commerce_prepared.csv'
+
+# Máscaras de data do to_char (PostgreSQL) -> strftime (DuckDB)
+_DATE_FORMATS = [
+    ('YYYY', '%Y'), ('Month', '%B'), ('Mon', '%b'), ('MM', '%m'), ('DD', '%d'),
+    ('HH24', '%H'), ('MI', '%M'), ('SS', '%S'),
+]
+
+# to_char(expr, 'máscara'), com um prefixo opcional de moeda ('$' || to_char(...))
+_TO_CHAR = re.compile(r"(?:'[^']*'\s*\|\|\s*)?to_char\(\s*(.+?)\s*,\s*'([^']*)'\s*\)", re.IGNORECASE | re.DOTALL)
+_NUMERIC = re.compile(r'\bnumeric\b', re.IGNORECASE)
+# DESC sem NULLS FIRST/LAST explícito (fora de identificadores entre aspas)
+_DESC = re.compile(r'(?<!["\'])\bDESC\b(?!["\'])(?!\s+NULLS\b)', re.IGNORECASE)
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("O modo SQL local precisa do duckdb: pip install duckdb")
+    return duckdb
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _translate_to_char(match: re.Match) -> str:
+    expr, mask = match.group(1), match.group(2)
+    if any(token in mask for token, _ in _DATE_FORMATS):
+        for token, directive in _DATE_FORMATS:
+            mask = mask.replace(token, directive)
+        return f"strftime({expr}, {_sql_literal(mask)})"
+    # Máscara numérica: mantém o número (arredondado às casas da máscara); a formatação
+    # com moeda e separadores fica para a camada de apresentação e o ORDER BY continua numérico
+    decimals = len(re.split(r'[.D]', mask, maxsplit=1)[1]) if re.search(r'[.D]', mask) else 0
+    return f"ROUND({expr}, {decimals})"
+
+
+def to_duckdb_sql(query: str) -> str:
+    """
+    Adapta uma consulta do PostgreSQL ao dialeto do DuckDB.
+
+    - to_char com máscara numérica ('L999G999G990', '999,999,990.99') vira ROUND(expr, casas),
+      junto com o prefixo de moeda ('$' || ...); o resultado continua numérico
+    - to_char com máscara de data ('YYYY-MM') vira strftime
+    - numeric sem precisão vira DECIMAL(38, 10) (no DuckDB, numeric é DECIMAL(18, 3))
+    - DESC ganha NULLS FIRST: no PostgreSQL os NULLs vêm primeiro em ordem decrescente,
+      no DuckDB vêm por último
+
+    DATE_TRUNC, ROUND, CAST e '::' já existem no DuckDB com a mesma semântica.
+    """
+    query = _TO_CHAR.sub(_translate_to_char, query)
+    query = _DESC.sub(lambda m: f'{m.group(0)} NULLS FIRST', query)
+    return _NUMERIC.sub('DECIMAL(38, 10)', query)
+
+
+def _reader(path: str) -> str:
+    """
+    Função de leitura do DuckDB para o arquivo ou dataset (pasta Parquet particionada).
+    """
+    if os.path.isdir(path):
+        return f"read_parquet({_sql_literal(os.path.join(path, '**', '*.parquet'))}, hive_partitioning = true)"
+    if path.endswith('.parquet'):
+        return f"read_parquet({_sql_literal(path)})"
+    if path.endswith('.csv'):
+        return f"read_csv({_sql_literal(path)}, header = true, auto_detect = true)"
+    raise ValueError(f"Formato não suportado pelo modo SQL local: {path}")
+
+
+def connect_local(
+    filename_or_path: Optional[str] = None,
+    type_name: str = 'processed',
+    table_name: str = 'ecommerce_america',
+    schema: Optional[str] = 'e-commerce',
+    date_column: Optional[str] = 'order_date',
+    threads: Optional[int] = None,
+    database: str = ':memory:'
+):
+    """
+    Abre um banco DuckDB embutido com o dataset registrado como "e-commerce".ecommerce_america.
+
+    A tabela é uma view sobre o arquivo: o DuckDB lê só as colunas usadas, em paralelo e de
+    forma vetorizada, sem carregar o dataset no pandas nem em um PostgreSQL.
+
+    Args:
+        filename_or_path: Arquivo CSV/Parquet ou pasta de dataset Parquet (padrão: e_commerce_prepared.csv)
+        type_name: Camada do arquivo ('raw', 'processed', 'interim')
+        table_name: Nome da tabela usada nas consultas
+        schema: Schema da tabela (None = schema padrão)
+        date_column: Coluna convertida para TIMESTAMP (para DATE_TRUNC e filtros por período)
+        threads: Número de threads do DuckDB (padrão: todos os núcleos)
+        database: Arquivo do banco DuckDB (padrão: em memória)
+
+    Returns:
+        Conexão DuckDB
+    """
+    duckdb = _import_duckdb()
+    path = get_file_path(filename_or_path or DEFAULT_LOCAL_DATASET, folder=type_name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"❌ Arquivo não encontrado: {path}")
+
+    con = duckdb.connect(database)
+    if threads:
+        con.execute(f"SET threads TO {int(threads)}")
+
+    source = _reader(path)
+    columns = {row[0]: row[1] for row in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+    select = "*"
+    if date_column in columns and not columns[date_column].startswith('TIMESTAMP'):
+        select = f'* REPLACE (TRY_CAST("{date_column}" AS TIMESTAMP) AS "{date_column}")'
+
+    name = f'"{table_name}"'
+    if schema:
+        con.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+        name = f'"{schema}".{name}'
+    con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT {select} FROM {source}")
+    return con
+
+
+def query_local(query: str, con=None, params: Optional[Any] = None, translate: bool = True, **connect_kwargs) -> pd.DataFrame:
+    """
+    Executa uma consulta (escrita para o PostgreSQL) no DuckDB local e retorna um DataFrame.
+
+    Args:
+        query: Consulta SQL (ex.: SELECT ... FROM "e-commerce".ecommerce_america)
+        con: Conexão de connect_local (opcional; sem ela, uma conexão é aberta e fechada)
+        params: Parâmetros posicionais (?) da consulta
+        translate: Aplica to_duckdb_sql antes de executar
+        **connect_kwargs: Parâmetros de connect_local (ex.: filename_or_path, type_name)
+    """
+    own = con is None
+    con = con or connect_local(**connect_kwargs)
+    try:
+        return con.execute(to_duckdb_sql(query) if translate else query, params).fetchdf()
+    except Exception as e:
+        raise Exception(f"Erro ao executar consulta no DuckDB: {e}")
+    finally:
+        if own:
+            con.close()
+
+
+def run_kpis_local(sql_path: Optional[str] = None, con=None, **connect_kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Roda o arquivo de KPIs (america_ecommerce_kpis.sql) inteiro no DuckDB local, sem PostgreSQL.
+
+    Args:
+        sql_path: Arquivo de consultas (padrão: KPI_SQL_FILE)
+        con: Conexão de connect_local (opcional)
+        **connect_kwargs: Parâmetros de connect_local (ex.: filename_or_path='e_commerce_prepared.parquet')
+
+    Returns:
+        dict {nome da consulta (comentário do arquivo): DataFrame}
+
+    Exemplo:
+        kpis = run_kpis_local()
+        kpis['Ticket Médio das Vendas']
+    """
+    from e_commerce.conections.provisioning import load_kpi_queries
+
+    own = con is None
+    con = con or connect_local(**connect_kwargs)
+    try:
+        return {name: query_local(sql, con) for name, sql in load_kpi_queries(sql_path or KPI_SQL_FILE)}
+    finally:
+        if own:
+            con.close()
@@ -0,0 +1,269 @@
+# Libs
+import re
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from e_commerce.config.settings import KPI_SQL_FILE
+from e_commerce.conections.sql import connect, _qualified_name, _quote_ident
+
+# Layout da tabela ecommerce_america (dataset e_commerce_prepared.csv) com tipos reais
+ECOMMERCE_AMERICA_COLUMNS: Dict[str, str] = {
+    'order_date': 'TIMESTAMP NOT NULL',
+    'estimated_delivery_date': 'DATE',
+    'delivery_date': 'DATE',
+    'lead_time': 'INTEGER',
+    'shipping_status': 'TEXT',
+    'customer_id': 'BIGINT',
+    'gender': 'TEXT',
+    'device_type': 'TEXT',
+    'customer_login_type': 'TEXT',
+    'product_category': 'TEXT',
+    'product': 'TEXT',
+    'sales': 'DOUBLE PRECISION',
+    'quantity': 'INTEGER',
+    'gross_revenue': 'DOUBLE PRECISION',
+    'discount': 'DOUBLE PRECISION',
+    'net_total': 'DOUBLE PRECISION',
+    'net_revenue': 'DOUBLE PRECISION',
+    'cost_difference': 'DOUBLE PRECISION',
+    'profit': 'DOUBLE PRECISION',
+    'shipping_cost': 'DOUBLE PRECISION',
+    'order_priority': 'TEXT',
+    'payment_method': 'TEXT',
+}
+
+# Índices usados pelas consultas de KPI (filtros por período e agrupamentos)
+KPI_INDEXES: List[Tuple[str, ...]] = [
+    ('order_date',),
+    ('product', 'order_date'),
+    ('product_category', 'order_date'),
+    ('payment_method', 'order_date'),
+]
+
+
+def _month_starts(start, end) -> List[pd.Timestamp]:
+    """
+    Primeiro dia de cada mês entre start e end (inclusive).
+    """
+    first = pd.Timestamp(start).to_period('M').to_timestamp()
+    last = pd.Timestamp(end).to_period('M').to_timestamp()
+    return list(pd.date_range(first, last, freq='MS'))
+
+
+def ensure_month_partitions(
+    conn,
+    table_name: str,
+    start,
+    end,
+    schema: Optional[str] = None
+) -> List[str]:
+    """
+    Cria as partições mensais que ainda não existem entre start e end.
+
+    Args:
+        conn: Conexão SQLAlchemy
+        table_name: Tabela particionada (pai)
+        start: Primeiro mês (ex.: '2018-01')
+        end: Último mês (ex.: '2018-12')
+        schema: Schema da tabela (opcional)
+
+    Returns:
+        Nomes das partições (criadas ou já existentes)
+    """
+    parent = _qualified_name(table_name, schema)
+    partitions = []
+    for month in _month_starts(start, end):
+        name = f"{table_name}_{month:%Y_%m}"
+        upper = month + pd.offsets.MonthBegin(1)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {_qualified_name(name, schema)} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        ))
+        partitions.append(name)
+    return partitions
+
+
+def provision_ecommerce_table(
+    connection_string: Union[str, Engine],
+    start,
+    end,
+    table_name: str = 'ecommerce_america',
+    schema: Optional[str] = 'e-commerce',
+    columns: Optional[Dict[str, str]] = None,
+    indexes: Optional[List[Tuple[str, ...]]] = None,
+    partition_column: str = 'order_date',
+    if_exists: str = 'fail',
+    search_path: Optional[str] = None
+) -> List[str]:
+    """
+    Cria a tabela particionada por mês (RANGE em order_date) com os índices dos KPIs.
+
+    - order_date é TIMESTAMP de verdade, então DATE_TRUNC('month', order_date) e filtros
+      por período não precisam de cast e podem usar índice e poda de partições
+    - uma partição por mês entre start e end, mais uma partição DEFAULT para datas fora da faixa
+    - índices criados na tabela pai valem para todas as partições (inclusive as futuras)
+
+    Args:
+        connection_string: String de conexão SQLAlchemy (postgresql://...) ou Engine
+        start: Primeiro mês das partições (ex.: '2018-01')
+        end: Último mês das partições (ex.: '2018-12')
+        table_name: Nome da tabela
+        schema: Schema da tabela
+        columns: Colunas e tipos SQL (padrão: ECOMMERCE_AMERICA_COLUMNS)
+        indexes: Índices a criar (padrão: KPI_INDEXES)
+        partition_column: Coluna de data usada no particionamento
+        if_exists: 'fail' ou 'replace' (apaga e recria a tabela)
+        search_path: Schema padrão da conexão (opcional)
+
+    Returns:
+        Nomes das partições mensais
+    """
+    columns = columns or ECOMMERCE_AMERICA_COLUMNS
+    indexes = KPI_INDEXES if indexes is None else indexes
+    parent = _qualified_name(table_name, schema)
+    definition = ', '.join(f"{_quote_ident(col)} {sql_type}" for col, sql_type in columns.items())
+
+    with connect(connection_string, search_path=search_path) as conn:
+        if schema:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_quote_ident(schema)}"))
+        if if_exists == 'replace':
+            conn.execute(text(f"DROP TABLE IF EXISTS {parent} CASCADE"))
+        elif if_exists != 'fail':
+            raise ValueError(f"Valor inválido para if_exists: {if_exists}")
+
+        conn.execute(text(f"CREATE TABLE {parent} ({definition}) PARTITION BY RANGE ({_quote_ident(partition_column)})"))
+        partitions = ensure_month_partitions(conn, table_name, start, end, schema)
+        conn.execute(text(f"CREATE TABLE {_qualified_name(f'{table_name}_default', schema)} PARTITION OF {parent} DEFAULT"))
+
+        for index_columns in indexes:
+            name = _quote_ident(f"{table_name}_{'_'.join(index_columns)}_idx"[:63])
+            cols = ', '.join(_quote_ident(col) for col in index_columns)
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {parent} ({cols})"))
+        conn.commit()
+
+    print(f"✅ Tabela {parent} criada com {len(partitions)} partições mensais e {len(indexes)} índices")
+    return partitions
+
+
+def load_kpi_queries(sql_path: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Lê o arquivo de KPIs e separa as consultas.
+
+    Returns:
+        Lista de (nome, sql); o nome vem do comentário logo acima da consulta
+    """
+    with open(sql_path or KPI_SQL_FILE, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    queries = []
+    for statement in content.split(';'):
+        lines = statement.strip().splitlines()
+        # Nome: primeira linha do último bloco de comentários antes da consulta
+        name, previous_is_comment = None, False
+        for line in lines:
+            is_comment = line.strip().startswith('--')
+            if is_comment and not previous_is_comment:
+                name = line.strip()[2:].strip()
+            previous_is_comment = is_comment
+        sql = '\n'.join(line for line in lines if not line.strip().startswith('--')).strip()
+        if sql:
+            queries.append((name or sql.split('\n')[0], sql))
+    return queries
+
+
+def _scanned_relations(plan: Dict[str, Any]) -> Tuple[List[str], int]:
+    """
+    Relações lidas pelo plano (EXPLAIN em JSON) e partições removidas em tempo de execução.
+    """
+    relations, removed = [], plan.get('Subplans Removed', 0)
+    if 'Relation Name' in plan:
+        relations.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        child_relations, child_removed = _scanned_relations(child)
+        relations.extend(child_relations)
+        removed += child_removed
+    return relations, removed
+
+
+def explain_partitions(
+    connection_string: Union[str, Engine],
+    query: str,
+    table_name: str = 'ecommerce_america',
+    schema: Optional[str] = 'e-commerce',
+    search_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Roda EXPLAIN (FORMAT JSON) na consulta e informa quantas partições ela lê.
+
+    Returns:
+        dict com partições lidas, total de partições e se houve poda (pruned)
+    """
+    with connect(connection_string, search_path=search_path) as conn:
+        total = conn.execute(
+            text("SELECT count(*) FROM pg_inherits WHERE inhparent = CAST(:parent AS regclass)"),
+            {'parent': _qualified_name(table_name, schema)},
+        ).scalar()
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}")).scalar()
+
+    plan = plan[0]['Plan'] if isinstance(plan, list) else plan
+    relations, removed = _scanned_relations(plan)
+    scanned = sorted({rel for rel in relations if rel.startswith(f"{table_name}_")})
+    return {
+        'partitions_scanned': scanned,
+        'total_partitions': total,
+        'subplans_removed': removed,
+        'pruned': bool(total) and (len(scanned) < total or removed > 0),
+    }
+
+
+def check_kpi_pruning(
+    connection_string: Union[str, Engine],
+    start,
+    end,
+    table_name: str = 'ecommerce_america',
+    schema: Optional[str] = 'e-commerce',
+    sql_path: Optional[str] = None,
+    search_path: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Verifica, via EXPLAIN, se as consultas de KPI restritas a um período leem só as partições do período.
+
+    Cada consulta do arquivo de KPIs é executada sobre
+    (SELECT * FROM tabela WHERE order_date >= start AND order_date < end), como faria um
+    relatório mensal; com order_date TIMESTAMP o planejador poda as demais partições.
+
+    Args:
+        connection_string: String de conexão SQLAlchemy (postgresql://...) ou Engine
+        start: Início do período (ex.: '2018-03-01')
+        end: Fim do período, exclusivo (ex.: '2018-04-01')
+        table_name: Tabela particionada
+        schema: Schema da tabela
+        sql_path: Arquivo de KPIs (padrão: KPI_SQL_FILE)
+        search_path: Schema padrão da conexão (opcional)
+
+    Returns:
+        DataFrame com uma linha por consulta: partições lidas, total e se houve poda
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    parent = _qualified_name(table_name, schema)
+    window = (
+        f"(SELECT * FROM {parent} WHERE order_date >= '{start:%Y-%m-%d %H:%M:%S}' "
+        f"AND order_date < '{end:%Y-%m-%d %H:%M:%S}') AS {_quote_ident(table_name)}"
+    )
+    # Casa o nome da tabela com ou sem schema/aspas (ex.: "e-commerce".ecommerce_america)
+    table = rf'(?:"{re.escape(table_name)}"|{re.escape(table_name)}\b)'
+    prefix = rf'(?:(?:"{re.escape(schema)}"|{re.escape(schema)})\.)?' if schema else ''
+    pattern = re.compile(rf'FROM\s+{prefix}{table}', re.IGNORECASE)
+
+    rows = []
+    for name, sql in load_kpi_queries(sql_path):
+        windowed = pattern.sub(lambda _: f"FROM {window}", sql)
+        result = explain_partitions(connection_string, windowed, table_name, schema, search_path)
+        rows.append({
+            'consulta': name,
+            'particoes_lidas': len(result['partitions_scanned']),
+            'total_particoes': result['total_partitions'],
+            'poda': result['pruned'],
+        })
+    return pd.DataFrame(rows)
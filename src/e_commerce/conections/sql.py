@@ -1,13 +1,641 @@
 # Libs
-from sqlalchemy import create_engine, text
+import pandas as pd
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple, Union
+import io
+import os
+import threading
+import time
+import uuid
 import sys
 
+# Registro de engines do processo: uma engine (e um pool de conexões) por connection string
+# e configuração de pool
+_ENGINES: Dict[Tuple[str, Optional[str], str], Engine] = {}
+_STATS: Dict[Tuple[str, Optional[str], str], Dict[str, float]] = {}
+_LOCK = threading.Lock()
+# Tempo gasto abrindo conexões novas na thread atual (descontado da espera pelo checkout)
+_CONNECT_TIME = threading.local()
+
+
+def _new_stats() -> Dict[str, float]:
+    return {
+        'connections_opened': 0,
+        'connect_time_total': 0.0,
+        'checkouts': 0,
+        'checkins': 0,
+        'wait_time_total': 0.0,
+        'waits': 0,
+    }
+
+
+def _instrument(engine: Engine, stats: Dict[str, float]) -> None:
+    """
+    Registra eventos do pool para medir abertura de conexões, checkouts e latência.
+    """
+    @event.listens_for(engine, 'do_connect')
+    def _timed_connect(dialect, conn_rec, cargs, cparams):
+        start = time.perf_counter()
+        dbapi_conn = dialect.connect(*cargs, **cparams)
+        elapsed = time.perf_counter() - start
+        _CONNECT_TIME.seconds = getattr(_CONNECT_TIME, 'seconds', 0.0) + elapsed
+        with _LOCK:
+            stats['connections_opened'] += 1
+            stats['connect_time_total'] += elapsed
+        return dbapi_conn
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_conn, conn_rec, conn_proxy):
+        with _LOCK:
+            stats['checkouts'] += 1
+
+    @event.listens_for(engine, 'checkin')
+    def _on_checkin(dbapi_conn, conn_rec):
+        with _LOCK:
+            stats['checkins'] += 1
+
+
+def _registry_key(
+    connection_string: str,
+    search_path: Optional[str] = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_pre_ping: bool = True,
+    pool_recycle: int = 1800,
+    **engine_kwargs
+) -> Tuple[str, Optional[str], str]:
+    """
+    Chave do registro de engines: connection string, search_path e configuração do pool.
+    Pedidos com parâmetros de pool diferentes recebem engines (e pools) diferentes.
+    """
+    options = dict(engine_kwargs, pool_size=pool_size, max_overflow=max_overflow,
+                   pool_pre_ping=pool_pre_ping, pool_recycle=pool_recycle)
+    return connection_string, search_path, repr(sorted(options.items()))
+
+
+def get_engine(
+    connection_string: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_pre_ping: bool = True,
+    pool_recycle: int = 1800,
+    search_path: Optional[str] = None,
+    **engine_kwargs
+) -> Engine:
+    """
+    Retorna a engine compartilhada do processo para a connection string e a configuração
+    de pool informada (cria na primeira chamada).
+
+    Args:
+        connection_string: String de conexão SQLAlchemy
+        pool_size: Conexões mantidas abertas no pool
+        max_overflow: Conexões extras permitidas em picos
+        pool_pre_ping: Testa a conexão antes de usar (descarta conexões mortas)
+        pool_recycle: Recicla conexões com mais de N segundos
+        search_path: Schema padrão das conexões PostgreSQL (ex.: 'e-commerce')
+        **engine_kwargs: Parâmetros adicionais para create_engine()
+    """
+    key = _registry_key(connection_string, search_path, pool_size, max_overflow, pool_pre_ping, pool_recycle, **engine_kwargs)
+    with _LOCK:
+        engine = _ENGINES.get(key)
+    if engine is not None:
+        return engine
+
+    backend = make_url(connection_string).get_backend_name()
+    kwargs = {'pool_pre_ping': pool_pre_ping, 'pool_recycle': pool_recycle}
+    if backend != 'sqlite':
+        kwargs.update(pool_size=pool_size, max_overflow=max_overflow)
+    if search_path and backend == 'postgresql':
+        # Definido na abertura da conexão, então vale para toda a vida da conexão no pool
+        connect_args = dict(engine_kwargs.pop('connect_args', {}))
+        connect_args['options'] = f'{connect_args.get("options", "")} -c search_path="{search_path}"'.strip()
+        kwargs['connect_args'] = connect_args
+    kwargs.update(engine_kwargs)
+
+    engine = create_engine(connection_string, **kwargs)
+    stats = _new_stats()
+    _instrument(engine, stats)
+
+    with _LOCK:
+        # Outra thread pode ter criado a engine enquanto esta era configurada
+        if key in _ENGINES:
+            engine.dispose()
+            return _ENGINES[key]
+        _ENGINES[key] = engine
+        _STATS[key] = stats
+    return engine
+
+
+@contextmanager
+def connect(connection_string: Union[str, Engine], search_path: Optional[str] = None, **engine_kwargs):
+    """
+    Abre uma conexão do pool compartilhado medindo o tempo de espera pelo checkout
+    (sem o tempo de abrir conexões novas, medido à parte no evento de conexão).
+
+    Exemplo:
+        with connect(connection_string) as conn:
+            df = pd.read_sql_query(query, conn)
+    """
+    if isinstance(connection_string, Engine):
+        engine, key = connection_string, None
+    else:
+        engine = get_engine(connection_string, search_path=search_path, **engine_kwargs)
+        key = _registry_key(connection_string, search_path, **engine_kwargs)
+
+    _CONNECT_TIME.seconds = 0.0
+    start = time.perf_counter()
+    conn = engine.connect()
+    if key is not None:
+        waited = max(0.0, time.perf_counter() - start - _CONNECT_TIME.seconds)
+        with _LOCK:
+            _STATS[key]['wait_time_total'] += waited
+            _STATS[key]['waits'] += 1
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def pool_stats(connection_string: str, search_path: Optional[str] = None, **engine_kwargs) -> Dict[str, Any]:
+    """
+    Estatísticas do pool da engine: checkouts, tempo de espera e latência de conexão.
+
+    avg_wait_ms / total_wait_ms medem só a espera pelo checkout (pool cheio, pre-ping);
+    o tempo de abrir conexões novas fica em avg_connect_latency_ms.
+
+    Args:
+        connection_string: String de conexão SQLAlchemy
+        search_path: Schema padrão usado em get_engine
+        **engine_kwargs: Mesmos parâmetros de pool passados para get_engine/connect
+    """
+    key = _registry_key(connection_string, search_path, **engine_kwargs)
+    with _LOCK:
+        if key not in _STATS:
+            raise ValueError("Nenhuma engine registrada para essa connection string.")
+        stats = dict(_STATS[key])
+        engine = _ENGINES[key]
+
+    opened = stats['connections_opened']
+    waits = stats['waits']
+    return {
+        'checkouts': int(stats['checkouts']),
+        'checkins': int(stats['checkins']),
+        'connections_opened': int(opened),
+        'avg_connect_latency_ms': 1000 * stats['connect_time_total'] / opened if opened else 0.0,
+        'avg_wait_ms': 1000 * stats['wait_time_total'] / waits if waits else 0.0,
+        'total_wait_ms': 1000 * stats['wait_time_total'],
+        'pool_status': engine.pool.status(),
+    }
+
+
+def dispose_engines() -> None:
+    """
+    Fecha todas as conexões e limpa o registro de engines (ex.: ao final de um job).
+    """
+    with _LOCK:
+        engines = list(_ENGINES.values())
+        _ENGINES.clear()
+        _STATS.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+# ---------- Carga em massa (COPY FROM STDIN) ----------
+
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _qualified_name(table_name: str, schema: Optional[str] = None) -> str:
+    """
+    Nome da tabela entre aspas (ex.: "e-commerce"."ecommerce_america").
+    """
+    return f"{_quote_ident(schema)}.{_quote_ident(table_name)}" if schema else _quote_ident(table_name)
+
+
+def _pg_type(dtype) -> str:
+    """
+    Tipo PostgreSQL equivalente ao dtype do pandas.
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER' if getattr(dtype, 'itemsize', 8) <= 4 else 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE PRECISION'
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return 'TIMESTAMPTZ'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return 'INTERVAL'
+    return 'TEXT'
+
+
+def create_table_from_dtypes(
+    conn,
+    table_name: str,
+    dtypes: Dict[str, Any],
+    schema: Optional[str] = None,
+    if_exists: str = 'append',
+    unlogged: bool = False
+) -> None:
+    """
+    Cria a tabela a partir de um mapa {coluna: dtype do pandas ou tipo SQL em texto}.
+
+    Args:
+        conn: Conexão SQLAlchemy
+        table_name: Nome da tabela
+        dtypes: Mapa coluna -> dtype (ex.: df.dtypes) ou tipo SQL (ex.: 'NUMERIC(12,2)')
+        schema: Schema da tabela (opcional)
+        if_exists: 'append' (cria se não existir), 'replace' (recria) ou 'fail'
+        unlogged: Cria como UNLOGGED (sem WAL; para tabelas de staging)
+    """
+    name = _qualified_name(table_name, schema)
+    columns = ', '.join(
+        f"{_quote_ident(col)} {dtype if isinstance(dtype, str) else _pg_type(dtype)}"
+        for col, dtype in dtypes.items()
+    )
+    kind = 'UNLOGGED TABLE' if unlogged else 'TABLE'
+
+    if if_exists == 'replace':
+        conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        conn.execute(text(f"CREATE {kind} {name} ({columns})"))
+    elif if_exists == 'append':
+        conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ({columns})"))
+    elif if_exists == 'fail':
+        conn.execute(text(f"CREATE {kind} {name} ({columns})"))
+    else:
+        raise ValueError(f"Valor inválido para if_exists: {if_exists}")
+
+
+def _to_csv_bytes(df) -> bytes:
+    """
+    Serializa o chunk em CSV com o escritor do pyarrow.
+    Texto sempre sai entre aspas e NULL sai vazio, o que o COPY em CSV distingue.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    columns = []
+    for column in table.columns:
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        elif pa.types.is_timestamp(column.type) and column.type.unit == 'ns':
+            column = column.cast(pa.timestamp('us', column.type.tz), safe=False)
+        columns.append(column)
+    table = pa.table(columns, names=table.column_names)
+
+    sink = io.BytesIO()
+    pv.write_csv(table, sink, pv.WriteOptions(include_header=False))
+    return sink.getvalue()
+
+
+def _copy_from_bytes(dbapi_conn, command: str, data: bytes) -> None:
+    """
+    Executa COPY ... FROM STDIN (psycopg2 ou psycopg 3).
+    """
+    cursor = dbapi_conn.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            cursor.copy_expert(command, io.BytesIO(data))
+        elif hasattr(cursor, 'copy'):
+            with cursor.copy(command) as copy:
+                copy.write(data)
+        else:
+            raise ValueError("O driver não suporta COPY FROM STDIN.")
+    finally:
+        cursor.close()
+
+
+def _stage_name(table_name: str, tag: str) -> str:
+    """
+    Nome único para a tabela de staging (pid + uuid), para cargas simultâneas na mesma
+    tabela (mesmo processo ou não) não usarem a mesma staging. Cabe nos 63 caracteres do PostgreSQL.
+    """
+    suffix = f"_{tag}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+    return f"{table_name[:63 - len(suffix)]}{suffix}"
+
+
+def _align_chunk(chunk: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+    """
+    Reordena as colunas do chunk conforme a lista de colunas da carga.
+    Chunks com colunas faltando ou sobrando geram erro em vez de gravar valores na coluna errada.
+    """
+    if list(chunk.columns) == names:
+        return chunk
+    missing = [col for col in names if col not in chunk.columns]
+    extra = [col for col in chunk.columns if col not in names]
+    if missing or extra:
+        raise ValueError(f"Colunas do chunk diferentes das da carga (faltando: {missing}; sobrando: {extra})")
+    return chunk[names]
+
+
+def _iter_load_chunks(data, chunksize: int):
+    """
+    Divide um DataFrame (ou cada DataFrame de um iterador) em pedaços de até chunksize linhas.
+    """
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for frame in frames:
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+
+
+def _copy_chunks(connection_string, search_path, table, names, chunks, counter) -> None:
+    """
+    Copia uma sequência de chunks para a tabela em uma única transação de uma conexão do pool.
+    Cada chunk é alinhado à lista de colunas names (a mesma do comando COPY).
+    """
+    columns = ', '.join(_quote_ident(col) for col in names)
+    command = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    with connect(connection_string, search_path=search_path) as conn:
+        dbapi_conn = conn.connection.dbapi_connection
+        try:
+            for chunk in chunks:
+                _copy_from_bytes(dbapi_conn, command, _to_csv_bytes(_align_chunk(chunk, names)))
+                with _LOCK:
+                    counter[0] += len(chunk)
+            dbapi_conn.commit()
+        except Exception:
+            dbapi_conn.rollback()
+            raise
+
+
+def bulk_load(
+    data,
+    table_name: str,
+    connection_string: Union[str, Engine],
+    schema: Optional[str] = None,
+    dtype: Optional[Dict[str, Any]] = None,
+    if_exists: str = 'append',
+    chunksize: int = 100_000,
+    workers: int = 1,
+    search_path: Optional[str] = None,
+    analyze: bool = True
+) -> Dict[str, Any]:
+    """
+    Carrega um DataFrame (ou um iterador de DataFrames) no PostgreSQL via COPY FROM STDIN.
+    Substitui o df.to_sql, que envia INSERTs em lotes.
+
+    Com workers > 1, cada thread copia para a sua própria tabela de staging (UNLOGGED)
+    por uma conexão do pool; no final os dados vão para a tabela de destino em uma única
+    transação, então uma falha no meio não deixa a carga pela metade.
+
+    Args:
+        data: DataFrame ou iterador de DataFrames (ex.: get_data(..., chunksize=...))
+        table_name: Tabela de destino (ex.: 'ecommerce_america')
+        connection_string: String de conexão SQLAlchemy (postgresql://...) ou Engine
+        schema: Schema da tabela (opcional; padrão: search_path da conexão)
+        dtype: Tipos por coluna - dtype do pandas ou tipo SQL em texto (padrão: dtypes do primeiro chunk)
+        if_exists: 'append', 'replace' ou 'fail' (como no df.to_sql)
+        chunksize: Linhas por bloco enviado ao COPY
+        workers: Cargas simultâneas em tabelas de staging (1 = COPY direto na tabela)
+        search_path: Schema padrão da conexão (opcional)
+        analyze: Roda ANALYZE na tabela ao final da carga
+
+    Returns:
+        dict com linhas carregadas, segundos e linhas por segundo
+    """
+    import itertools
+    from concurrent.futures import ThreadPoolExecutor
+
+    chunks = _iter_load_chunks(data, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError("Nenhum dado para carregar.")
+    chunks = itertools.chain([first], chunks)
+
+    types = dict(first.dtypes)
+    types.update(dtype or {})
+    names = list(first.columns)
+    columns = ', '.join(_quote_ident(col) for col in names)
+    target = _qualified_name(table_name, schema)
+
+    start = time.perf_counter()
+    with connect(connection_string, search_path=search_path) as conn:
+        create_table_from_dtypes(conn, table_name, types, schema, if_exists)
+        conn.commit()
+
+    counter = [0]
+    if workers <= 1:
+        _copy_chunks(connection_string, search_path, target, names, chunks, counter)
+    else:
+        stages = [_stage_name(table_name, f"stage{i}") for i in range(workers)]
+        chunk_lock = threading.Lock()
+
+        def next_chunks():
+            # Os workers compartilham o mesmo iterador de chunks
+            while True:
+                with chunk_lock:
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        with connect(connection_string, search_path=search_path) as conn:
+            for stage in stages:
+                create_table_from_dtypes(conn, stage, types, schema, 'replace', unlogged=True)
+            conn.commit()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_copy_chunks, connection_string, search_path,
+                                    _qualified_name(stage, schema), names, next_chunks(), counter)
+                    for stage in stages
+                ]
+                for future in futures:
+                    future.result()
+            with connect(connection_string, search_path=search_path) as conn:
+                for stage in stages:
+                    conn.execute(text(
+                        f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {_qualified_name(stage, schema)}"
+                    ))
+                conn.commit()
+        finally:
+            with connect(connection_string, search_path=search_path) as conn:
+                for stage in stages:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {_qualified_name(stage, schema)}"))
+                conn.commit()
+
+    if analyze:
+        analyze_table(connection_string, table_name, schema, search_path)
+
+    elapsed = time.perf_counter() - start
+    rows = counter[0]
+    rows_per_second = rows / elapsed if elapsed else 0.0
+    print(f"✅ {rows} linhas carregadas em {target} em {elapsed:.1f}s ({rows_per_second:,.0f} linhas/s)")
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_second': rows_per_second}
+
+
+def _partition_columns(conn, table: str) -> List[str]:
+    """
+    Colunas da chave de particionamento da tabela (lista vazia se ela não for particionada).
+    """
+    rows = conn.execute(text(
+        "SELECT a.attname FROM pg_partitioned_table p "
+        "CROSS JOIN LATERAL unnest(p.partattrs::int2[]) AS k(attnum) "
+        "JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = k.attnum "
+        "WHERE p.partrelid = to_regclass(:table)"
+    ), {'table': table}).fetchall()
+    return [row[0] for row in rows]
+
+
+def merge_load(
+    data,
+    table_name: str,
+    connection_string: Union[str, Engine],
+    keys: List[str],
+    schema: Optional[str] = None,
+    mode: str = 'upsert',
+    partition_column: Optional[str] = None,
+    partition_grain: str = 'month',
+    dtype: Optional[Dict[str, Any]] = None,
+    chunksize: int = 100_000,
+    search_path: Optional[str] = None,
+    analyze: bool = True
+) -> Dict[str, Any]:
+    """
+    Atualiza a tabela com um lote de dados sem recriá-la (os índices são mantidos).
+
+    O lote é copiado (COPY) para uma tabela de staging UNLOGGED e depois aplicado na
+    tabela de destino em uma única transação:
+
+    - 'upsert': INSERT ... ON CONFLICT (keys) DO UPDATE, alterando só as linhas cujos
+      valores mudaram (IS DISTINCT FROM); exige um índice único em keys (criado se faltar).
+      Em tabela particionada, keys precisa incluir as colunas de partição (ex.: order_date).
+      Chaves repetidas no lote: vale a última linha recebida
+    - 'replace_partitions': apaga da tabela os períodos (partition_grain de partition_column)
+      presentes no lote e insere o lote no lugar
+
+    Args:
+        data: DataFrame ou iterador de DataFrames
+        table_name: Tabela de destino (ex.: 'ecommerce_america')
+        connection_string: String de conexão SQLAlchemy (postgresql://...) ou Engine
+        keys: Chave natural (ex.: ['customer_id', 'order_date', 'product'])
+        schema: Schema da tabela (opcional; padrão: search_path da conexão)
+        mode: 'upsert' ou 'replace_partitions'
+        partition_column: Coluna de data dos períodos (mode='replace_partitions')
+        partition_grain: Período apagado/regravado: 'day', 'week', 'month' ou 'year'
+        dtype: Tipos por coluna, usados se a tabela ainda não existir
+        chunksize: Linhas por bloco enviado ao COPY
+        search_path: Schema padrão da conexão (opcional)
+        analyze: Roda ANALYZE na tabela ao final da carga
+
+    Returns:
+        dict com linhas do lote, linhas alteradas na tabela, segundos e linhas por segundo
+    """
+    import itertools
+
+    if mode not in ('upsert', 'replace_partitions'):
+        raise ValueError(f"Modo de carga inválido: {mode}")
+    if mode == 'replace_partitions' and not partition_column:
+        raise ValueError("Informe partition_column para mode='replace_partitions'.")
+    if partition_grain not in ('day', 'week', 'month', 'year'):
+        raise ValueError(f"Período inválido: {partition_grain}")
+
+    chunks = _iter_load_chunks(data, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError("Nenhum dado para carregar.")
+    chunks = itertools.chain([first], chunks)
+
+    types = dict(first.dtypes)
+    types.update(dtype or {})
+    names = list(first.columns)
+    columns = ', '.join(_quote_ident(col) for col in names)
+    key_columns = ', '.join(_quote_ident(col) for col in keys)
+    target = _qualified_name(table_name, schema)
+    stage_name = _stage_name(table_name, 'merge')
+    stage = _qualified_name(stage_name, schema)
+    # Ordem de chegada das linhas no staging (o ctid não garante essa ordem)
+    sequence = _quote_ident('_load_seq')
+
+    start = time.perf_counter()
+    with connect(connection_string, search_path=search_path) as conn:
+        create_table_from_dtypes(conn, table_name, types, schema, 'append')
+        if mode == 'upsert':
+            missing = [col for col in _partition_columns(conn, target) if col not in keys]
+            if missing:
+                raise ValueError(
+                    f"{target} é particionada: keys precisa incluir as colunas de partição {missing} "
+                    f"para o índice único do upsert."
+                )
+            index = _quote_ident(f"{table_name}_{'_'.join(keys)}_key"[:63])
+            conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {target} ({key_columns})"))
+        create_table_from_dtypes(conn, stage_name, types, schema, 'replace', unlogged=True)
+        conn.execute(text(f"ALTER TABLE {stage} ADD COLUMN {sequence} BIGINT GENERATED ALWAYS AS IDENTITY"))
+        conn.commit()
+
+    counter = [0]
+    try:
+        _copy_chunks(connection_string, search_path, stage, names, chunks, counter)
+
+        with connect(connection_string, search_path=search_path) as conn:
+            if mode == 'upsert':
+                updates = [col for col in names if col not in keys]
+                # DISTINCT ON: uma linha por chave no lote (a última copiada vence)
+                select = (
+                    f"SELECT DISTINCT ON ({key_columns}) {columns} FROM {stage} "
+                    f"ORDER BY {key_columns}, {sequence} DESC"
+                )
+                if updates:
+                    assignments = ', '.join(f"{_quote_ident(c)} = EXCLUDED.{_quote_ident(c)}" for c in updates)
+                    current = ', '.join(f"t.{_quote_ident(c)}" for c in updates)
+                    incoming = ', '.join(f"EXCLUDED.{_quote_ident(c)}" for c in updates)
+                    conflict = (
+                        f"DO UPDATE SET {assignments} "
+                        f"WHERE ROW({current}) IS DISTINCT FROM ROW({incoming})"
+                    )
+                else:
+                    conflict = "DO NOTHING"
+                result = conn.execute(text(
+                    f"INSERT INTO {target} AS t ({columns}) {select} ON CONFLICT ({key_columns}) {conflict}"
+                ))
+                changed = result.rowcount
+            else:
+                column = _quote_ident(partition_column)
+                conn.execute(text(
+                    f"DELETE FROM {target} AS t "
+                    f"USING (SELECT DISTINCT date_trunc('{partition_grain}', {column}::timestamp) AS p FROM {stage}) AS s "
+                    f"WHERE t.{column}::timestamp >= s.p AND t.{column}::timestamp < s.p + INTERVAL '1 {partition_grain}'"
+                ))
+                result = conn.execute(text(f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {stage}"))
+                changed = result.rowcount
+            conn.commit()
+    finally:
+        with connect(connection_string, search_path=search_path) as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+            conn.commit()
+
+    if analyze:
+        analyze_table(connection_string, table_name, schema, search_path)
+
+    elapsed = time.perf_counter() - start
+    rows = counter[0]
+    rows_per_second = rows / elapsed if elapsed else 0.0
+    print(f"✅ {rows} linhas no lote; {changed} alteradas em {target} em {elapsed:.1f}s ({rows_per_second:,.0f} linhas/s)")
+    return {'rows': rows, 'changed': changed, 'seconds': elapsed, 'rows_per_second': rows_per_second}
+
+
+def analyze_table(connection_string: Union[str, Engine], table_name: str, schema: Optional[str] = None, search_path: Optional[str] = None) -> None:
+    """
+    Atualiza as estatísticas do planejador (ANALYZE) depois de uma carga.
+    Em tabelas particionadas, analisa a tabela pai e todas as partições.
+    """
+    with connect(connection_string, search_path=search_path) as conn:
+        conn.execute(text(f"ANALYZE {_qualified_name(table_name, schema)}"))
+        conn.commit()
+
+
 # Testar a conexão ao banco de dados
 # def test_connection(engine, schema):
 
 #     try:
 #         with engine.connect() as connection:
-            
+
 #             # Testar a versão do PostgreSQL
 #             result = connection.execute(text("SELECT version();"))
 #             versao = result.fetchone()
@@ -30,21 +658,37 @@ import sys
 
 
 def test_connection(engine, schema):
+    """
+    Testa a conexão, lista as tabelas do schema e mede a latência de ida e volta.
+
+    Args:
+        engine: Engine SQLAlchemy ou connection string (usa o registro compartilhado)
+        schema: Schema a ser listado
+
+    Returns:
+        dict com versão, tabelas e latência (ms), ou None em caso de erro
+    """
+    if isinstance(engine, str):
+        engine = get_engine(engine, search_path=schema)
     try:
         with engine.connect() as conn:
             # Setar o schema desejado
             conn.execute(text(f'SET search_path TO "{schema}";'))
             # Teste simples
+            start = time.perf_counter()
             versao = conn.execute(text("SELECT version();")).fetchone()
+            latencia_ms = 1000 * (time.perf_counter() - start)
             print("Conectado:", versao[0])
+            print(f"Latência: {latencia_ms:.1f} ms")
             # Listar tabelas do schema
             tabelas = conn.execute(text("""
-                SELECT tablename 
-                FROM pg_tables 
+                SELECT tablename
+                FROM pg_tables
                 WHERE schemaname = CURRENT_SCHEMA();
             """)).fetchall()
             print(f"Tabelas no schema {schema}")
             for t in tabelas:
                 print("-", t[0])
+            return {'versao': versao[0], 'tabelas': [t[0] for t in tabelas], 'latencia_ms': latencia_ms}
     except Exception as e:
         print("Erro:", e)
@@ -0,0 +1,76 @@
+"""
+Registro de schemas dos datasets conhecidos
+Tipos explícitos, colunas categóricas e formatos de data usados pelos extratores
+"""
+
+import os
+from typing import Dict, Optional
+
+# Colunas de baixa cardinalidade que são lidas como 'category'
+CATEGORY_COLUMNS = ['product', 'product_category', 'payment_method', 'gender']
+
+DATASET_SCHEMAS: Dict[str, dict] = {
+    # Camada raw - nomes de colunas originais do Kaggle
+    "e_commerce_dataset.csv": {
+        "dtype": {
+            "Aging": "float64",
+            "Customer_Id": "int64",
+            "Sales": "float64",
+            "Quantity": "float64",
+            "Discount": "float64",
+            "Profit": "float64",
+            "Shipping_Cost": "float64",
+        },
+        "category": ["Product", "Product_Category", "Payment_method", "Gender"],
+        "dates": {"Order_Date": "%Y-%m-%d"},
+    },
+    # Camada interim - saída do notebook data_cleaning
+    "e_commerce_clean.csv": {
+        "dtype": {
+            "lead_time": "int64",
+            "customer_id": "int64",
+            "sales": "float64",
+            "quantity": "int64",
+            "discount": "float64",
+            "profit": "float64",
+            "shipping_cost": "float64",
+        },
+        "category": CATEGORY_COLUMNS,
+        "dates": {"order_date": "%Y-%m-%d %H:%M:%S"},
+    },
+    # Camada processed - saída do notebook feature_engineering
+    "e_commerce_prepared.csv": {
+        "dtype": {
+            "lead_time": "int64",
+            "customer_id": "int64",
+            "sales": "float64",
+            "quantity": "int64",
+            "gross_revenue": "float64",
+            "discount": "float64",
+            "net_total": "float64",
+            "net_revenue": "float64",
+            "cost_difference": "float64",
+            "profit": "float64",
+            "shipping_cost": "float64",
+        },
+        "category": CATEGORY_COLUMNS,
+        "dates": {
+            "order_date": "%Y-%m-%d %H:%M:%S",
+            "estimated_delivery_date": "%Y-%m-%d",
+            "delivery_date": "%Y-%m-%d",
+        },
+    },
+}
+
+
+def get_schema(filename_or_path: str) -> Optional[dict]:
+    """
+    Retorna o schema registrado para o arquivo (busca pelo nome do arquivo).
+
+    Args:
+        filename_or_path: Nome do arquivo ou caminho absoluto
+
+    Returns:
+        dict com 'dtype', 'category' e 'dates', ou None se o dataset não estiver registrado
+    """
+    return DATASET_SCHEMAS.get(os.path.basename(str(filename_or_path)))
@@ -21,3 +21,24 @@ DATA_DIR = BASE_DIR / "data"
 DATA_RAW = DATA_DIR / "raw"
 DATA_PROCESSED = DATA_DIR / "processed"
 DATA_INTERIM = DATA_DIR / "interim"
+
+# Cache colunar das leituras de arquivos (get_data(..., cache=True))
+DATA_CACHE = DATA_DIR / "cache"
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+# Cache das respostas HTTP das APIs (ETag/Last-Modified + TTL por endpoint)
+HTTP_CACHE_DIR = DATA_CACHE / "http"
+HTTP_CACHE_MAX_BYTES = 256 * 1024 ** 2  # 256 MB
+
+# Marcas d'água (high-water marks) da extração incremental do banco
+INCREMENTAL_STATE_FILE = DATA_DIR / "state" / "watermarks.json"
+
+# Consultas de KPI (PostgreSQL) sobre "e-commerce".ecommerce_america
+KPI_SQL_FILE = PACKAGE_DIR.parent / "sql" / "america_ecommerce_kpis.sql"
+
+# Partições despejadas em disco pela agregação fora da memória (etl/aggregation.py)
+SPILL_DIR = DATA_DIR / "spill"
+AGG_MEMORY_BUDGET = 256 * 1024 ** 2  # 256 MB
+
+# Cubo OLAP pré-agregado dos dashboards (etl/cube.py)
+CUBE_FILE = DATA_PROCESSED / "ecommerce_cube.parquet"
@@ -1,30 +1,51 @@
+import json
+import threading
 import requests
 import pandas as pd
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterator, List, Optional, Union
+from e_commerce.data_extraction.http_cache import HTTPResponseCache, get_response_cache
+from e_commerce.data_extraction.rate_limit import RateLimitScheduler
 
-def extract_from_api(
+# Sessões HTTP compartilhadas pelo processo (keep-alive + pool de conexões), uma por tamanho de pool
+_SESSIONS: Dict[int, requests.Session] = {}
+_SESSION_LOCK = threading.Lock()
+
+def get_session(pool_maxsize: int = 32) -> requests.Session:
+    """
+    Retorna a sessão HTTP compartilhada com o tamanho de pool pedido, criando-a na primeira chamada.
+
+    Args:
+        pool_maxsize: Conexões mantidas abertas por host
+    """
+    with _SESSION_LOCK:
+        if pool_maxsize not in _SESSIONS:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _SESSIONS[pool_maxsize] = session
+        return _SESSIONS[pool_maxsize]
+
+def _request(
+    session: requests.Session,
+    method: str,
     url: str,
-    method: str = 'GET',
     params: Optional[Dict[str, Any]] = None,
     headers: Optional[Dict[str, str]] = None,
     json_data: Optional[Dict[str, Any]] = None,
     timeout: int = 30,
-    normalize: bool = True
-) -> pd.DataFrame:
+    scheduler: Optional[RateLimitScheduler] = None
+) -> requests.Response:
     """
-    Extrai dados de uma API REST e retorna como DataFrame.
-    
-    Args:
-        url: URL da API
-        method: Método HTTP ('GET', 'POST', etc.)
-        params: Parâmetros da query string
-        headers: Headers HTTP
-        json_data: Dados JSON para POST/PUT
-        timeout: Timeout em segundos
-        normalize: Se True, usa pd.json_normalize para achatar dados aninhados
+    Executa a requisição e converte erros de rede/HTTP na mensagem padrão do módulo.
+    Com scheduler, a requisição respeita o limite de taxa do host e é repetida após 429.
     """
     try:
-        response = requests.request(
+        send = scheduler.request if scheduler is not None else _send
+        response = send(
+            session,
             method=method,
             url=url,
             params=params,
@@ -33,19 +54,283 @@ def extract_from_api(
             timeout=timeout
         )
         response.raise_for_status()
-        
-        data = response.json()
-        
-        if normalize:
-            return pd.json_normalize(data)
-        else:
-            return pd.DataFrame(data)
-            
+        return response
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Erro ao fazer requisição para API: {e}")
+
+def _send(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Envio direto, sem controle de taxa.
+    """
+    return session.request(method=method, url=url, **kwargs)
+
+def _get_json(
+    session: requests.Session,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    timeout: int,
+    scheduler: Optional[RateLimitScheduler] = None,
+    http_cache: Optional[HTTPResponseCache] = None
+) -> Any:
+    """
+    GET decodificado em JSON, passando pelo cache HTTP quando informado.
+    """
+    if http_cache is None:
+        return _decode_json(_request(session, 'GET', url, params, headers, None, timeout, scheduler))
+    try:
+        body = http_cache.get(session, url, params, headers, timeout, scheduler)
     except requests.exceptions.RequestException as e:
         raise Exception(f"Erro ao fazer requisição para API: {e}")
+    try:
+        return json.loads(body)
     except ValueError as e:
         raise Exception(f"Erro ao decodificar JSON da resposta: {e}")
 
+def _decode_json(response: requests.Response) -> Any:
+    """
+    Decodifica o corpo JSON da resposta.
+    """
+    try:
+        return response.json()
+    except ValueError as e:
+        raise Exception(f"Erro ao decodificar JSON da resposta: {e}")
+
+def _to_dataframe(data: Any, normalize: bool) -> pd.DataFrame:
+    """
+    Converte registros JSON em DataFrame.
+    """
+    return pd.json_normalize(data) if normalize else pd.DataFrame(data)
+
+def _get_path(data: Any, path: Optional[str]) -> Any:
+    """
+    Navega em um JSON usando caminho com pontos (ex.: 'data.items', 'meta.next_cursor').
+    """
+    if not path:
+        return data
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def extract_from_api(
+    url: str,
+    method: str = 'GET',
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    json_data: Optional[Dict[str, Any]] = None,
+    timeout: int = 30,
+    normalize: bool = True,
+    session: Optional[requests.Session] = None,
+    cache: Union[bool, HTTPResponseCache] = False,
+    scheduler: Optional[RateLimitScheduler] = None
+) -> pd.DataFrame:
+    """
+    Extrai dados de uma API REST e retorna como DataFrame.
+
+    Args:
+        url: URL da API
+        method: Método HTTP ('GET', 'POST', etc.)
+        params: Parâmetros da query string
+        headers: Headers HTTP
+        json_data: Dados JSON para POST/PUT
+        timeout: Timeout em segundos
+        normalize: Se True, usa pd.json_normalize para achatar dados aninhados
+        session: Sessão HTTP (padrão: sessão compartilhada com keep-alive)
+        cache: True (cache padrão em disco) ou um HTTPResponseCache; vale apenas para GET
+        scheduler: RateLimitScheduler para respeitar o limite de taxa da API (429/Retry-After)
+    """
+    session = session or get_session()
+
+    if cache and method.upper() == 'GET':
+        http_cache = get_response_cache() if cache is True else cache
+        df = _to_dataframe(_get_json(session, url, params, headers, timeout, scheduler, http_cache), normalize)
+        if scheduler is not None:
+            scheduler.record(len(df))
+        return df
+
+    response = _request(session, method, url, params, headers, json_data, timeout, scheduler)
+    df = _to_dataframe(_decode_json(response), normalize)
+    if scheduler is not None:
+        scheduler.record(len(df))
+    return df
+
+def _iter_offset_pages(session, url, params, headers, timeout, records_path, page_size, page_param, size_param, first_page, step, max_pages, max_workers, scheduler=None, http_cache=None, total_path=None, next_path=None):
+    """
+    Paginação por offset/página: busca até max_workers páginas em paralelo.
+
+    Para na primeira página vazia, ao atingir o total informado pela API (total_path) ou
+    quando a resposta não traz a próxima página (next_path). Uma página menor que page_size
+    não encerra a leitura, pois a API pode limitar o tamanho da página abaixo do pedido;
+    por isso, com step=None (offset), o passo é o tamanho real da primeira página.
+    """
+    def fetch(position):
+        page_params = dict(params or {})
+        page_params[page_param] = position
+        if size_param:
+            page_params[size_param] = page_size
+        return _get_json(session, url, page_params, headers, timeout, scheduler, http_cache)
+
+    def last_page(data, records, fetched):
+        if not records:
+            return True
+        if total_path:
+            total = _get_path(data, total_path)
+            if total is not None and fetched >= int(total):
+                return True
+        return bool(next_path) and not _get_path(data, next_path)
+
+    if max_pages is not None and max_pages <= 0:
+        return
+
+    # A primeira página vem sozinha: ela define o passo real do offset
+    data = fetch(first_page)
+    records = _get_path(data, records_path) or []
+    if records:
+        yield records
+    fetched = len(records)
+    if last_page(data, records, fetched):
+        return
+    step = step or len(records)
+
+    index = 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while max_pages is None or index < max_pages:
+            window = max_workers if max_pages is None else min(max_workers, max_pages - index)
+            pages = executor.map(fetch, [first_page + i * step for i in range(index, index + window)])
+            for data in pages:
+                records = _get_path(data, records_path) or []
+                if records:
+                    yield records
+                fetched += len(records)
+                if last_page(data, records, fetched):
+                    return
+            index += window
+
+def _iter_cursor_pages(session, url, params, headers, timeout, records_path, cursor_param, cursor_path, max_pages, scheduler=None, http_cache=None):
+    """
+    Paginação por cursor: cada resposta informa o cursor da próxima página (sequencial).
+    """
+    page_params = dict(params or {})
+    pages = 0
+    while max_pages is None or pages < max_pages:
+        data = _get_json(session, url, page_params, headers, timeout, scheduler, http_cache)
+        records = _get_path(data, records_path) or []
+        if records:
+            yield records
+        pages += 1
+
+        cursor = _get_path(data, cursor_path)
+        if not cursor or not records:
+            return
+        page_params[cursor_param] = cursor
+
+def _iter_link_pages(session, url, params, headers, timeout, records_path, max_pages, scheduler=None):
+    """
+    Paginação pelo header Link (rel="next"), como na API do GitHub (sequencial).
+    """
+    next_url, page_params = url, params
+    pages = 0
+    while next_url and (max_pages is None or pages < max_pages):
+        response = _request(session, 'GET', next_url, page_params, headers, None, timeout, scheduler)
+        records = _get_path(_decode_json(response), records_path) or []
+        if records:
+            yield records
+        pages += 1
+
+        next_url = response.links.get('next', {}).get('url')
+        page_params = None  # a URL do Link já traz os parâmetros
+
+def _iter_paginated_frames(pages: Iterator[List[Any]], normalize: bool, scheduler: Optional[RateLimitScheduler] = None) -> Iterator[pd.DataFrame]:
+    """
+    Normaliza cada página assim que ela chega.
+    """
+    for records in pages:
+        if scheduler is not None:
+            scheduler.record(len(records))
+        yield _to_dataframe(records, normalize)
+
+def extract_paginated_api(
+    url: str,
+    pagination: str = 'offset',
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    records_path: Optional[str] = None,
+    page_size: int = 100,
+    page_param: Optional[str] = None,
+    size_param: Optional[str] = 'limit',
+    cursor_param: str = 'cursor',
+    cursor_path: str = 'next_cursor',
+    max_pages: Optional[int] = None,
+    max_workers: int = 4,
+    timeout: int = 30,
+    normalize: bool = True,
+    stream: bool = False,
+    session: Optional[requests.Session] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    cache: Union[bool, HTTPResponseCache] = False,
+    total_path: Optional[str] = None,
+    next_path: Optional[str] = None
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Extrai todas as páginas de uma API REST usando o pool de conexões compartilhado.
+
+    Args:
+        url: URL da API
+        pagination: 'offset' (offset=0,100,...), 'page' (page=1,2,...), 'cursor' ou 'link' (header Link)
+        params: Parâmetros fixos da query string
+        headers: Headers HTTP
+        records_path: Caminho dos registros no JSON (ex.: 'data'); None = a resposta é a lista
+        page_size: Registros por página pedidos (a API pode devolver menos; em 'offset'/'page' a
+                   leitura só termina em uma página vazia, no total ou sem próxima página)
+        page_param: Nome do parâmetro de offset/página (padrão: 'offset' ou 'page')
+        size_param: Nome do parâmetro de tamanho da página (None = não enviar)
+        cursor_param: Parâmetro que recebe o cursor (pagination='cursor')
+        cursor_path: Caminho do próximo cursor no JSON (pagination='cursor')
+        max_pages: Limite de páginas (None = todas)
+        max_workers: Máximo de requisições simultâneas ('offset'/'page'; 'cursor' e 'link' são sequenciais)
+        timeout: Timeout em segundos
+        normalize: Se True, usa pd.json_normalize para achatar dados aninhados
+        stream: Se True, retorna um gerador com um DataFrame por página
+        session: Sessão HTTP (padrão: sessão compartilhada com keep-alive)
+        scheduler: RateLimitScheduler; limita a taxa por host e ajusta a concorrência efetiva
+        cache: True (cache padrão em disco) ou um HTTPResponseCache; cada página é uma entrada do cache
+               ('offset', 'page' e 'cursor'; 'link' depende dos headers da resposta e não usa cache)
+        total_path: Caminho do total de registros no JSON (ex.: 'meta.total'), para 'offset'/'page'
+        next_path: Caminho do link/indicador da próxima página no JSON (ex.: 'links.next'), para 'offset'/'page'
+    """
+    session = session or get_session(pool_maxsize=max(max_workers, 32))
+    http_cache = None
+    if cache:
+        if pagination == 'link':
+            raise ValueError("cache não é suportado com pagination='link' (o header Link não fica no cache).")
+        http_cache = get_response_cache() if cache is True else cache
+
+    if pagination in ('offset', 'page'):
+        is_offset = pagination == 'offset'
+        pages = _iter_offset_pages(
+            session, url, params, headers, timeout, records_path, page_size,
+            page_param or pagination, size_param,
+            first_page=0 if is_offset else 1,
+            step=None if is_offset else 1,
+            max_pages=max_pages, max_workers=max_workers, scheduler=scheduler, http_cache=http_cache,
+            total_path=total_path, next_path=next_path,
+        )
+    elif pagination == 'cursor':
+        pages = _iter_cursor_pages(session, url, params, headers, timeout, records_path, cursor_param, cursor_path, max_pages, scheduler, http_cache)
+    elif pagination == 'link':
+        pages = _iter_link_pages(session, url, params, headers, timeout, records_path, max_pages, scheduler)
+    else:
+        raise ValueError(f"Tipo de paginação inválido: {pagination}")
+
+    frames = _iter_paginated_frames(pages, normalize, scheduler)
+    if stream:
+        return frames
+
+    frames = list(frames)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
 def extract_from_rest_api(
     base_url: str,
     endpoint: str,
@@ -55,21 +340,24 @@ def extract_from_rest_api(
 ) -> pd.DataFrame:
     """
     Extrai dados de uma API REST com autenticação por API key.
-    
+
     Args:
         base_url: URL base da API
         endpoint: Endpoint específico
         api_key: Chave da API (se necessário)
         params: Parâmetros da query
         **kwargs: Parâmetros adicionais para extract_from_api()
+                  (ou para extract_paginated_api(), se 'pagination' for informado)
     """
     url = f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-    
+
     headers = kwargs.get('headers', {})
     if api_key:
         headers['Authorization'] = f"Bearer {api_key}"
         # ou headers['X-API-Key'] = api_key, dependendo da API
-    
+
     kwargs['headers'] = headers
-    
-    return extract_from_api(url, params=params, **kwargs)
\ No newline at end of file
+
+    if 'pagination' in kwargs:
+        return extract_paginated_api(url, params=params, **kwargs)
+    return extract_from_api(url, params=params, **kwargs)
@@ -0,0 +1,66 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from typing import List, Optional, Union
+from e_commerce.config.settings import DATA_RAW, DATA_PROCESSED, DATA_INTERIM
+
+
+def _read_arrow(filepath: str, columns: Optional[List[str]] = None, as_table: bool = False, dtype_backend: str = 'numpy') -> Union[pd.DataFrame, pa.Table]:
+    """
+    Lê um arquivo Arrow IPC/Feather mapeando-o em memória (mmap).
+
+    Os buffers da pyarrow.Table apontam direto para o page cache do sistema operacional,
+    então vários processos lendo o mesmo arquivo compartilham as mesmas páginas.
+    - as_table=True retorna a pyarrow.Table (zero-copy)
+    - dtype_backend='pyarrow' retorna um DataFrame com colunas ArrowDtype, também sem cópia
+    - dtype_backend='numpy' converte para os tipos numpy usuais (gera cópia privada)
+    """
+    table = feather.read_table(filepath, columns=columns, memory_map=True)
+    if as_table:
+        return table
+    if dtype_backend == 'pyarrow':
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    if dtype_backend == 'numpy':
+        return table.to_pandas(split_blocks=True)
+    raise ValueError(f"dtype_backend inválido: {dtype_backend}")
+
+
+def extract_arrow_raw(filename_or_path: str, columns: Optional[List[str]] = None, as_table: bool = False, dtype_backend: str = 'numpy') -> Union[pd.DataFrame, pa.Table]:
+    """
+    Lê Arrow IPC/Feather (memory-mapped) da pasta DATA_RAW ou de um caminho absoluto.
+
+    Args:
+        filename_or_path: Nome do arquivo ou caminho absoluto
+        columns: Colunas a serem lidas (None = todas)
+        as_table: Se True, retorna a pyarrow.Table sem converter para pandas
+        dtype_backend: 'numpy' (cópia) ou 'pyarrow' (sem cópia, compartilha o page cache)
+    """
+    filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_RAW, filename_or_path)
+    return _read_arrow(filepath, columns=columns, as_table=as_table, dtype_backend=dtype_backend)
+
+def extract_arrow_processed(filename_or_path: str, columns: Optional[List[str]] = None, as_table: bool = False, dtype_backend: str = 'numpy') -> Union[pd.DataFrame, pa.Table]:
+    """
+    Lê Arrow IPC/Feather (memory-mapped) da pasta DATA_PROCESSED ou de um caminho absoluto.
+
+    Args:
+        filename_or_path: Nome do arquivo ou caminho absoluto
+        columns: Colunas a serem lidas (None = todas)
+        as_table: Se True, retorna a pyarrow.Table sem converter para pandas
+        dtype_backend: 'numpy' (cópia) ou 'pyarrow' (sem cópia, compartilha o page cache)
+    """
+    filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_PROCESSED, filename_or_path)
+    return _read_arrow(filepath, columns=columns, as_table=as_table, dtype_backend=dtype_backend)
+
+def extract_arrow_interim(filename_or_path: str, columns: Optional[List[str]] = None, as_table: bool = False, dtype_backend: str = 'numpy') -> Union[pd.DataFrame, pa.Table]:
+    """
+    Lê Arrow IPC/Feather (memory-mapped) da pasta DATA_INTERIM ou de um caminho absoluto.
+
+    Args:
+        filename_or_path: Nome do arquivo ou caminho absoluto
+        columns: Colunas a serem lidas (None = todas)
+        as_table: Se True, retorna a pyarrow.Table sem converter para pandas
+        dtype_backend: 'numpy' (cópia) ou 'pyarrow' (sem cópia, compartilha o page cache)
+    """
+    filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_INTERIM, filename_or_path)
+    return _read_arrow(filepath, columns=columns, as_table=as_table, dtype_backend=dtype_backend)
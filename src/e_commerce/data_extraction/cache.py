@@ -0,0 +1,152 @@
+import os
+import glob
+import json
+import hashlib
+import pandas as pd
+from typing import Callable, Optional
+from e_commerce.config.settings import DATA_CACHE, CACHE_MAX_BYTES
+
+# Extensão do arquivo de cache por formato
+_CACHE_FORMATS = {'parquet': '.parquet', 'feather': '.feather'}
+
+
+def _path_key(filepath: str, entry: Optional[str] = None) -> str:
+    """
+    Identifica o arquivo de origem (todas as versões do mesmo arquivo compartilham o prefixo).
+    entry diferencia partes independentes de um mesmo arquivo (ex.: planilhas de um Excel).
+    """
+    identity = os.path.abspath(filepath) if entry is None else f'{os.path.abspath(filepath)}::{entry}'
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def _version(filepath: str) -> str:
+    """
+    Versão do arquivo de origem: tamanho e mtime.
+    """
+    stat = os.stat(filepath)
+    payload = f'{stat.st_size}:{stat.st_mtime_ns}'
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def _signature(read_kwargs: dict) -> str:
+    """
+    Assinatura dos parâmetros usados para ler o arquivo.
+    """
+    payload = json.dumps(read_kwargs, sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _evict(cache_dir: str, max_bytes: int) -> None:
+    """
+    Remove as entradas menos usadas recentemente até o cache caber em max_bytes.
+    O mtime do arquivo de cache é atualizado a cada acerto e serve como relógio do LRU.
+    """
+    entries = []
+    for ext in _CACHE_FORMATS.values():
+        for path in glob.glob(os.path.join(cache_dir, f'*{ext}')):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def _remove(path: str) -> None:
+    """
+    Remove um arquivo do cache ignorando se outro processo já o removeu.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def cached_read(
+    filepath: str,
+    reader: Callable[..., pd.DataFrame],
+    cache_dir: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    fmt: str = 'parquet',
+    entry: Optional[str] = None,
+    **read_kwargs
+) -> pd.DataFrame:
+    """
+    Lê um arquivo usando uma cópia colunar em disco quando ela ainda é válida.
+
+    Na primeira leitura chama reader(**read_kwargs) e grava o resultado em Parquet/Feather.
+    As leituras seguintes com o mesmo arquivo (tamanho + mtime) e os mesmos parâmetros
+    carregam a cópia. Se o arquivo de origem mudar, as entradas da versão antiga são
+    descartadas; leituras do mesmo arquivo com outros parâmetros convivem no cache
+    (limitadas apenas pelo despejo LRU).
+
+    Args:
+        filepath: Caminho do arquivo de origem
+        reader: Função de leitura original (ex.: extract_csv_processed)
+        cache_dir: Pasta do cache (padrão: DATA_CACHE)
+        max_bytes: Tamanho máximo do cache (padrão: CACHE_MAX_BYTES), com despejo LRU
+        fmt: 'parquet' ou 'feather'
+        entry: Parte do arquivo cacheada separadamente (ex.: nome da planilha)
+        **read_kwargs: Parâmetros repassados para reader()
+    """
+    if fmt not in _CACHE_FORMATS:
+        raise ValueError(f"Formato de cache inválido: {fmt}")
+
+    cache_dir = str(cache_dir or DATA_CACHE)
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    os.makedirs(cache_dir, exist_ok=True)
+
+    prefix = _path_key(filepath, entry)
+    version = _version(filepath)
+    cache_path = os.path.join(cache_dir, f'{prefix}_{version}_{_signature(read_kwargs)}{_CACHE_FORMATS[fmt]}')
+
+    # Acerto: carrega a cópia e marca como usada recentemente
+    if os.path.exists(cache_path):
+        os.utime(cache_path)
+        return pd.read_parquet(cache_path) if fmt == 'parquet' else pd.read_feather(cache_path)
+
+    # Erro: remove só as entradas de versões antigas do arquivo (tamanho/mtime diferentes)
+    for ext in _CACHE_FORMATS.values():
+        for stale in glob.glob(os.path.join(cache_dir, f'{prefix}_*{ext}')):
+            if not os.path.basename(stale).startswith(f'{prefix}_{version}_'):
+                _remove(stale)
+
+    df = reader(**read_kwargs)
+
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        if fmt == 'parquet':
+            df.to_parquet(tmp_path)
+        else:
+            df.to_feather(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        # Colunas com tipos mistos podem não ser serializáveis; o dado lido continua válido
+        print(f"⚠️ Não foi possível gravar o cache de {filepath}: {e}")
+        _remove(tmp_path)
+        return df
+
+    _evict(cache_dir, max_bytes)
+    return df
+
+
+def clear_cache(cache_dir: Optional[str] = None) -> int:
+    """
+    Remove todas as entradas do cache.
+
+    Returns:
+        Quantidade de arquivos removidos
+    """
+    cache_dir = str(cache_dir or DATA_CACHE)
+    removed = 0
+    for ext in _CACHE_FORMATS.values():
+        for path in glob.glob(os.path.join(cache_dir, f'*{ext}')):
+            os.remove(path)
+            removed += 1
+    return removed
@@ -1,27 +1,194 @@
 import os
 import pandas as pd
+from typing import Iterator, Optional, Union
 from e_commerce.config.settings import DATA_RAW, DATA_PROCESSED, DATA_INTERIM
+from e_commerce.config.schemas import get_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow é opcional: sem ele a leitura usa o engine C do pandas
+    pa = None
+
+# Parâmetros que o leitor Arrow sabe tratar; qualquer outro força o engine do pandas
+_ARROW_KWARGS = {'sep', 'thousands', 'decimal', 'parse_dates', 'date_format', 'index_col', 'usecols'}
+
+
+# Estima quantas linhas cabem em um chunk de N bytes
+def _estimate_chunk_rows(filepath: str, chunk_bytes: int, sample_lines: int = 1000) -> int:
+    """
+    Estima o número de linhas por chunk a partir do tamanho médio de uma amostra de linhas.
+    """
+    total_bytes = 0
+    n_lines = 0
+    with open(filepath, 'rb') as f:
+        f.readline()  # ignora o cabeçalho
+        for line in f:
+            total_bytes += len(line)
+            n_lines += 1
+            if n_lines >= sample_lines:
+                break
+
+    if n_lines == 0:
+        return 1
+    return max(1, int(chunk_bytes // (total_bytes / n_lines)))
+
+
+def _schema_dtypes(schema: Optional[dict]) -> dict:
+    """
+    Monta o dicionário dtype do pandas (numéricos + categóricas) a partir do schema.
+    """
+    if not schema:
+        return {}
+    dtypes = dict(schema.get('dtype', {}))
+    dtypes.update({col: 'category' for col in schema.get('category', [])})
+    return dtypes
+
+
+def _apply_schema_dates(df: pd.DataFrame, schema: Optional[dict]) -> pd.DataFrame:
+    """
+    Converte as colunas de data do schema usando o formato explícito (sem inferência).
+    """
+    if schema:
+        for col, fmt in schema.get('dates', {}).items():
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], format=fmt)
+    return df
+
+
+def _can_use_arrow(schema: Optional[dict], kwargs: dict) -> bool:
+    """
+    O leitor Arrow só é usado com schema registrado e parâmetros que ele suporta.
+    """
+    if pa is None or not schema:
+        return False
+    if set(kwargs) - _ARROW_KWARGS:
+        return False
+    return kwargs.get('parse_dates') is None and kwargs.get('date_format') is None
+
+
+def _read_csv_arrow(filepath: str, schema: dict, sep: str = ',', thousands: Optional[str] = None, decimal: str = '.', index_col=None, usecols=None, **kwargs) -> pd.DataFrame:
+    """
+    Lê o CSV com o parser multithread do pyarrow usando os tipos do schema.
+
+    As colunas categóricas viram dictionary arrays (category no pandas) e as datas são
+    parseadas direto para timestamp, evitando o pico de memória de colunas object.
+    Quando há separador de milhar, as colunas numéricas são lidas como texto e limpas
+    com funções vetorizadas do Arrow antes da conversão.
+    """
+    numeric = schema.get('dtype', {})
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in schema.get('category', [])}
+    column_types.update({col: pa.timestamp('ns') for col in schema.get('dates', {})})
+    if thousands:
+        column_types.update({col: pa.string() for col in numeric})
+    else:
+        column_types.update({col: pa.type_for_alias(dtype) for col, dtype in numeric.items()})
+
+    timestamp_parsers = sorted(set(schema.get('dates', {}).values()))
+
+    table = pa_csv.read_csv(
+        filepath,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        parse_options=pa_csv.ParseOptions(delimiter=sep),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            timestamp_parsers=timestamp_parsers,
+            decimal_point=decimal,
+            include_columns=list(usecols) if usecols is not None else None,
+            strings_can_be_null=True,
+        ),
+    )
+
+    if thousands:
+        for col, dtype in numeric.items():
+            if col not in table.column_names:
+                continue
+            values = pc.replace_substring(table[col], pattern=thousands, replacement='')
+            if decimal != '.':
+                values = pc.replace_substring(values, pattern=decimal, replacement='.')
+            table = table.set_column(table.column_names.index(col), col, pc.cast(values, pa.type_for_alias(dtype)))
+
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+
+    if index_col is not None:
+        df = df.set_index(df.columns[index_col] if isinstance(index_col, int) else index_col)
+    return df
+
+
+def _iter_csv(filepath: str, chunksize: int, schema: Optional[dict] = None, **kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Gera os chunks do CSV e garante o fechamento do arquivo ao final da leitura.
+    """
+    with pd.read_csv(filepath, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield _apply_schema_dates(chunk, schema)
+
+
+def _read_csv(filepath: str, chunksize: Optional[int] = None, chunk_bytes: Optional[int] = None, schema: Union[dict, bool, None] = None, engine: Optional[str] = None, **kwargs) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Lê o CSV inteiro ou, se chunksize/chunk_bytes for informado, retorna um gerador de chunks.
+
+    Se o arquivo tiver schema registrado (config/schemas.py) os tipos são aplicados na
+    leitura e, sempre que possível, o parser multithread do pyarrow é usado.
+    """
+    if schema is None:
+        schema = get_schema(filepath)
+    schema = schema or None
+    custom_dtype = 'dtype' in kwargs
+    if schema and not custom_dtype:
+        kwargs['dtype'] = _schema_dtypes(schema)
+
+    if chunk_bytes:
+        chunksize = _estimate_chunk_rows(filepath, chunk_bytes)
+    if chunksize:
+        return _iter_csv(filepath, chunksize, schema, engine=engine, **kwargs)
+
+    arrow_kwargs = {k: v for k, v in kwargs.items() if k != 'dtype'}
+    if engine in (None, 'pyarrow') and not custom_dtype and _can_use_arrow(schema, arrow_kwargs):
+        try:
+            return _read_csv_arrow(filepath, schema, **arrow_kwargs)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, KeyError) as e:
+            print(f"⚠️ Leitura com pyarrow falhou ({e}); usando o engine padrão do pandas.")
+
+    return _apply_schema_dates(pd.read_csv(filepath, engine=engine, **kwargs), schema)
 
 # Extrai dados Brutos
-def extract_csv_raw(filename_or_path: str, sep: str = ',', thousands='.', decimal= ',', parse_dates=None, date_format=None, index_col=None, **kwargs) -> pd.DataFrame:
+def extract_csv_raw(filename_or_path: str, sep: str = ',', thousands='.', decimal= ',', parse_dates=None, date_format=None, index_col=None, chunksize: Optional[int] = None, chunk_bytes: Optional[int] = None, schema: Union[dict, bool, None] = None, engine: Optional[str] = None, **kwargs) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Lê CSV da pasta DATA_RAW ou de um caminho absoluto.
+
+    Se chunksize (linhas) ou chunk_bytes (tamanho aproximado em bytes) for informado,
+    retorna um gerador de DataFrames em vez de carregar o arquivo inteiro.
+    Datasets registrados em config/schemas.py são lidos com tipos explícitos
+    (passe schema=False para desativar ou um dict para sobrescrever).
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_RAW, filename_or_path)
-    return pd.read_csv(filepath, sep=sep, thousands=thousands, decimal=decimal, parse_dates=parse_dates, date_format=date_format, index_col=index_col, **kwargs)
+    return _read_csv(filepath, chunksize=chunksize, chunk_bytes=chunk_bytes, schema=schema, engine=engine, sep=sep, thousands=thousands, decimal=decimal, parse_dates=parse_dates, date_format=date_format, index_col=index_col, **kwargs)
 
 # Extrai dados Processados
-def extract_csv_processed(filename_or_path: str, sep: str = ',', parse_dates=None, date_format=None, index_col=None, **kwargs) -> pd.DataFrame:
+def extract_csv_processed(filename_or_path: str, sep: str = ',', parse_dates=None, date_format=None, index_col=None, chunksize: Optional[int] = None, chunk_bytes: Optional[int] = None, schema: Union[dict, bool, None] = None, engine: Optional[str] = None, **kwargs) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Lê CSV da pasta DATA_PROCESSED ou de um caminho absoluto.
+
+    Se chunksize (linhas) ou chunk_bytes (tamanho aproximado em bytes) for informado,
+    retorna um gerador de DataFrames em vez de carregar o arquivo inteiro.
+    Datasets registrados em config/schemas.py são lidos com tipos explícitos
+    (passe schema=False para desativar ou um dict para sobrescrever).
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_PROCESSED, filename_or_path)
-    return pd.read_csv(filepath, sep=sep, **kwargs)
+    return _read_csv(filepath, chunksize=chunksize, chunk_bytes=chunk_bytes, schema=schema, engine=engine, sep=sep, parse_dates=parse_dates, date_format=date_format, index_col=index_col, **kwargs)
 
 # Extrai dados Intermediários
-def extract_csv_interim(filename_or_path: str, sep: str = ',', parse_dates=None, date_format=None, index_col=None, **kwargs) -> pd.DataFrame:
+def extract_csv_interim(filename_or_path: str, sep: str = ',', parse_dates=None, date_format=None, index_col=None, chunksize: Optional[int] = None, chunk_bytes: Optional[int] = None, schema: Union[dict, bool, None] = None, engine: Optional[str] = None, **kwargs) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Lê CSV da pasta DATA_INTERIM ou de um caminho absoluto.
+
+    Se chunksize (linhas) ou chunk_bytes (tamanho aproximado em bytes) for informado,
+    retorna um gerador de DataFrames em vez de carregar o arquivo inteiro.
+    Datasets registrados em config/schemas.py são lidos com tipos explícitos
+    (passe schema=False para desativar ou um dict para sobrescrever).
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_INTERIM, filename_or_path)
-    return pd.read_csv(filepath, sep=sep, **kwargs)
+    return _read_csv(filepath, chunksize=chunksize, chunk_bytes=chunk_bytes, schema=schema, engine=engine, sep=sep, parse_dates=parse_dates, date_format=date_format, index_col=index_col, **kwargs)
@@ -1,39 +1,130 @@
 import os
+import importlib.util
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
 from e_commerce.config.settings import DATA_RAW, DATA_PROCESSED, DATA_INTERIM
+from e_commerce.data_extraction.cache import cached_read
 
-def extract_excel_raw(filename_or_path: str, sheet_name: str = None, **kwargs) -> pd.DataFrame:
+# calamine (python-calamine) é um leitor somente-leitura em Rust, bem mais rápido que o openpyxl
+DEFAULT_EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else None
+
+SheetName = Union[str, int, List[Union[str, int]], None]
+
+
+def _read_sheet(filepath: str, sheet_name: Union[str, int], engine: Optional[str], **kwargs) -> pd.DataFrame:
+    """
+    Lê uma única planilha do arquivo.
+    """
+    return pd.read_excel(filepath, sheet_name=sheet_name, engine=engine, **kwargs)
+
+
+def _load_sheet(filepath: str, sheet_name: Union[str, int], engine: Optional[str], cache: bool, kwargs: dict) -> pd.DataFrame:
+    """
+    Lê uma planilha usando o cache colunar: cada planilha é convertida uma única vez
+    por versão do arquivo. Função de nível de módulo para poder rodar em outro processo.
+    """
+    if not cache:
+        return _read_sheet(filepath, sheet_name, engine, **kwargs)
+    return cached_read(
+        filepath,
+        lambda **read_kwargs: _read_sheet(filepath, **read_kwargs),
+        entry=str(sheet_name),
+        sheet_name=sheet_name,
+        engine=engine,
+        **kwargs
+    )
+
+
+def _read_excel(
+    filepath: str,
+    sheet_name: SheetName = None,
+    engine: Optional[str] = DEFAULT_EXCEL_ENGINE,
+    max_workers: Optional[int] = None,
+    concat: bool = False,
+    cache: bool = False,
+    **kwargs
+) -> Union[pd.DataFrame, Dict[Union[str, int], pd.DataFrame]]:
+    """
+    Lê uma ou várias planilhas. Com várias planilhas, cada uma é lida em um processo do pool.
+    """
+    if isinstance(sheet_name, (str, int)):
+        return _load_sheet(filepath, sheet_name, engine, cache, kwargs)
+
+    if sheet_name is None:
+        with pd.ExcelFile(filepath, engine=engine) as workbook:
+            sheets = list(workbook.sheet_names)
+    else:
+        sheets = list(sheet_name)
+
+    if len(sheets) <= 1 or max_workers == 1:
+        frames = [_load_sheet(filepath, sheet, engine, cache, kwargs) for sheet in sheets]
+    else:
+        workers = min(len(sheets), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(
+                _load_sheet,
+                [filepath] * len(sheets),
+                sheets,
+                [engine] * len(sheets),
+                [cache] * len(sheets),
+                [kwargs] * len(sheets),
+            ))
+
+    if concat:
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(
+            [frame.assign(sheet=sheet) for sheet, frame in zip(sheets, frames)],
+            ignore_index=True,
+        )
+    return dict(zip(sheets, frames))
+
+
+def extract_excel_raw(filename_or_path: str, sheet_name: SheetName = None, engine: Optional[str] = DEFAULT_EXCEL_ENGINE, max_workers: Optional[int] = None, concat: bool = False, cache: bool = False, **kwargs) -> Union[pd.DataFrame, Dict[Union[str, int], pd.DataFrame]]:
     """
     Lê Excel (.xlsx, .xls) da pasta DATA_RAW ou de um caminho absoluto.
-    
+
     Args:
         filename_or_path: Nome do arquivo ou caminho absoluto
-        sheet_name: Nome da planilha (None = primeira planilha)
+        sheet_name: Nome/índice da planilha, lista de planilhas ou None (todas, lidas em paralelo)
+        engine: Engine do pd.read_excel (padrão: 'calamine' se instalado)
+        max_workers: Processos usados para ler várias planilhas (None = núcleos da máquina)
+        concat: Se True, junta as planilhas em um único DataFrame com a coluna 'sheet'
+        cache: Se True, guarda a conversão de cada planilha em Parquet (data/cache); padrão: False
         **kwargs: Parâmetros adicionais para pd.read_excel()
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_RAW, filename_or_path)
-    return pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
+    return _read_excel(filepath, sheet_name=sheet_name, engine=engine, max_workers=max_workers, concat=concat, cache=cache, **kwargs)
 
-def extract_excel_processed(filename_or_path: str, sheet_name: str = None, **kwargs) -> pd.DataFrame:
+def extract_excel_processed(filename_or_path: str, sheet_name: SheetName = None, engine: Optional[str] = DEFAULT_EXCEL_ENGINE, max_workers: Optional[int] = None, concat: bool = False, cache: bool = False, **kwargs) -> Union[pd.DataFrame, Dict[Union[str, int], pd.DataFrame]]:
     """
     Lê Excel (.xlsx, .xls) da pasta DATA_PROCESSED ou de um caminho absoluto.
-    
+
     Args:
         filename_or_path: Nome do arquivo ou caminho absoluto
-        sheet_name: Nome da planilha (None = primeira planilha)
+        sheet_name: Nome/índice da planilha, lista de planilhas ou None (todas, lidas em paralelo)
+        engine: Engine do pd.read_excel (padrão: 'calamine' se instalado)
+        max_workers: Processos usados para ler várias planilhas (None = núcleos da máquina)
+        concat: Se True, junta as planilhas em um único DataFrame com a coluna 'sheet'
+        cache: Se True, guarda a conversão de cada planilha em Parquet (data/cache); padrão: False
         **kwargs: Parâmetros adicionais para pd.read_excel()
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_PROCESSED, filename_or_path)
-    return pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
+    return _read_excel(filepath, sheet_name=sheet_name, engine=engine, max_workers=max_workers, concat=concat, cache=cache, **kwargs)
 
-def extract_excel_interim(filename_or_path: str, sheet_name: str = None, **kwargs) -> pd.DataFrame:
+def extract_excel_interim(filename_or_path: str, sheet_name: SheetName = None, engine: Optional[str] = DEFAULT_EXCEL_ENGINE, max_workers: Optional[int] = None, concat: bool = False, cache: bool = False, **kwargs) -> Union[pd.DataFrame, Dict[Union[str, int], pd.DataFrame]]:
     """
     Lê Excel (.xlsx, .xls) da pasta DATA_INTERIM ou de um caminho absoluto.
-    
+
     Args:
         filename_or_path: Nome do arquivo ou caminho absoluto
-        sheet_name: Nome da planilha (None = primeira planilha)
+        sheet_name: Nome/índice da planilha, lista de planilhas ou None (todas, lidas em paralelo)
+        engine: Engine do pd.read_excel (padrão: 'calamine' se instalado)
+        max_workers: Processos usados para ler várias planilhas (None = núcleos da máquina)
+        concat: Se True, junta as planilhas em um único DataFrame com a coluna 'sheet'
+        cache: Se True, guarda a conversão de cada planilha em Parquet (data/cache); padrão: False
         **kwargs: Parâmetros adicionais para pd.read_excel()
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_INTERIM, filename_or_path)
-    return pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
\ No newline at end of file
+    return _read_excel(filepath, sheet_name=sheet_name, engine=engine, max_workers=max_workers, concat=concat, cache=cache, **kwargs)
@@ -18,10 +18,16 @@ from e_commerce.data_extraction.parquet_extraction import (
     extract_parquet_interim,
     extract_parquet_processed,
 )
+from e_commerce.data_extraction.arrow_extraction import (
+    extract_arrow_raw,
+    extract_arrow_interim,
+    extract_arrow_processed,
+)
 
 from e_commerce.data_extraction.api_extraction import (
     extract_from_api,
-    extract_from_rest_api
+    extract_from_rest_api,
+    extract_paginated_api
 )
 
 from e_commerce.data_extraction.database_extraction import (
@@ -30,21 +36,54 @@ from e_commerce.data_extraction.database_extraction import (
     extract_table_from_database
 )
 
+from e_commerce.conections.local_sql import query_local
+from e_commerce.data_extraction.cache import cached_read
+from e_commerce.utils.file_paths import get_file_path
+
+# Fontes de arquivo que podem usar o cache colunar (excel faz cache por planilha: cache é repassado)
+_CACHEABLE_SOURCES = ("csv", "json")
+
 
-def get_data(source_type: str, type_name: str = None, **kwargs):
+def get_data(source_type: str, type_name: str = None, cache=False, **kwargs):
     """
     Orquestrador de extração de dados.
     
     Args:
-        source_type (str): tipo da fonte ("csv", "excel", "json", "parquet", "xml", "api", "db", "web")
+        source_type (str): tipo da fonte ("csv", "excel", "json", "parquet", "arrow", "xml", "api", "db", "duckdb", "web")
         type_name (str, opcional): camada de dados ("raw", "processed", "interim") 
-                                    - obrigatório para csv, excel, json, parquet, xml
+                                    - obrigatório para csv, excel, json, parquet, arrow, xml
+                                    - duckdb: camada do arquivo registrado como "e-commerce".ecommerce_america (padrão: processed)
                                     - ignorado para api, db e web
+        cache (bool ou HTTPResponseCache): se True, guarda/usa uma cópia Parquet da leitura (csv e json)
+                      - api: cache HTTP em disco com revalidação ETag/Last-Modified (True = cache padrão)
+                      - invalidada automaticamente quando o arquivo muda
         **kwargs: parâmetros extras para a função de extração (ex.: file_name, url, query, connection_string, css_selector) - passe filename_or_path
-    
+                  - csv: chunksize (linhas) ou chunk_bytes (bytes) ativam o modo streaming
+                  - excel: sheet_name=None lê todas as planilhas em paralelo (concat=True junta em um DataFrame);
+                           com cache=True cada planilha convertida fica em cache
+                  - api: pagination ("offset", "page", "cursor", "link") busca todas as páginas; stream=True retorna um gerador
+                  - api: scheduler=RateLimitScheduler(...) respeita 429/Retry-After e os headers de limite da API
+                  - json: lines=True (NDJSON) e chunksize (registros) ativam o modo streaming; columns fixa as colunas
+                  - csv: schema=False desativa o schema registrado em config/schemas.py; engine="c" força o parser do pandas
+                  - parquet: columns=[...] e filters (dict ou lista de tuplas do pyarrow) para ler só as colunas/row groups necessários
+                  - arrow: leitura memory-mapped; as_table=True ou dtype_backend="pyarrow" evitam cópia
+                  - db: em URLs postgresql, a leitura completa usa COPY (query) TO STDOUT + pyarrow, com fallback para
+                        pd.read_sql_query se o COPY falhar (use_copy=False desativa; use_copy=True dispensa o fallback)
+                  - db: stream=True (ou chunksize) usa cursor no servidor e retorna um gerador de chunks com dtypes fixos (dtype)
+                  - db: table_name + partition_column (ex.: "order_date") e num_partitions leem faixas da tabela em paralelo
+                  - db: table_name + watermark_column (ex.: "order_date") busca só as linhas novas e as acrescenta a um
+                        dataset Parquet particionado; lookback (ex.: "3D") relê a janela de dados atrasados
+                  - duckdb: query (SQL do PostgreSQL, ex.: as consultas de america_ecommerce_kpis.sql) executada localmente
+                            sobre filename_or_path (CSV, Parquet ou pasta de dataset), sem servidor de banco
+
     Returns:
-        DataFrame ou objeto retornado pela função de extração
+        DataFrame, gerador de DataFrames (modo streaming) ou objeto retornado pela função de extração
     """
+    # Cache colunar em disco (não se aplica ao modo streaming)
+    if cache and source_type in _CACHEABLE_SOURCES and not kwargs.get("chunksize") and not kwargs.get("chunk_bytes"):
+        filepath = get_file_path(kwargs["filename_or_path"], folder=type_name)
+        return cached_read(filepath, lambda **read_kwargs: get_data(source_type, type_name, **read_kwargs), **kwargs)
+
     # Fontes que possuem camadas (raw, processed, interim)
     if source_type == "csv":
         if type_name == "raw":
@@ -57,6 +96,7 @@ def get_data(source_type: str, type_name: str = None, **kwargs):
             raise ValueError(f"Tipo de CSV inválido: {type_name}")
 
     elif source_type == "excel":
+        kwargs["cache"] = bool(cache)
         if type_name == "raw":
             return extract_excel_raw(**kwargs)
         elif type_name == "processed":
@@ -86,10 +126,24 @@ def get_data(source_type: str, type_name: str = None, **kwargs):
         else:
             raise ValueError(f"Tipo de Parquet inválido: {type_name}")
 
+    elif source_type == "arrow":
+        if type_name == "raw":
+            return extract_arrow_raw(**kwargs)
+        elif type_name == "processed":
+            return extract_arrow_processed(**kwargs)
+        elif type_name == "interim":
+            return extract_arrow_interim(**kwargs)
+        else:
+            raise ValueError(f"Tipo de Arrow inválido: {type_name}")
+
     # APIs
     elif source_type == "api":
+        if cache:
+            kwargs["cache"] = cache
         if "base_url" in kwargs and "endpoint" in kwargs:
             return extract_from_rest_api(**kwargs)
+        elif "url" in kwargs and "pagination" in kwargs:
+            return extract_paginated_api(**kwargs)
         elif "url" in kwargs:
             return extract_from_api(**kwargs)
         else:
@@ -106,5 +160,11 @@ def get_data(source_type: str, type_name: str = None, **kwargs):
         else:
             raise ValueError("Para DB, forneça 'database_path', ou 'connection_string' + 'query', ou 'table_name' + 'connection_string'.")
 
+    # SQL local (DuckDB) sobre os arquivos das camadas
+    elif source_type == "duckdb":
+        if "query" not in kwargs:
+            raise ValueError("Para DuckDB, forneça 'query'.")
+        return query_local(type_name=type_name or "processed", **kwargs)
+
     else:
         raise ValueError(f"Fonte de dados não suportada: {source_type}")
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import glob
+import hashlib
+import threading
+import requests
+from typing import Any, Dict, Optional
+from e_commerce.config.settings import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+
+# Headers que definem o "escopo" de autenticação da resposta (guardados apenas como hash)
+_AUTH_HEADERS = ('authorization', 'x-api-key', 'cookie')
+
+
+class HTTPResponseCache:
+    """
+    Cache persistente de respostas HTTP (GET) com revalidação condicional.
+
+    - Dentro do TTL do endpoint a resposta é servida do disco sem ir à rede
+    - Fora do TTL a requisição vai com If-None-Match / If-Modified-Since e um 304
+      reaproveita o corpo salvo
+    - O tamanho total é limitado e as entradas menos usadas são removidas (LRU)
+
+    Args:
+        cache_dir: Pasta do cache (padrão: HTTP_CACHE_DIR)
+        max_bytes: Tamanho máximo do cache (padrão: HTTP_CACHE_MAX_BYTES)
+        default_ttl: TTL em segundos para endpoints sem regra específica
+        ttl_by_endpoint: dict {prefixo_da_url: ttl_em_segundos}; vale o prefixo mais longo
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        default_ttl: int = 0,
+        ttl_by_endpoint: Optional[Dict[str, int]] = None
+    ):
+        self.cache_dir = str(cache_dir or HTTP_CACHE_DIR)
+        self.max_bytes = HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_by_endpoint = dict(ttl_by_endpoint or {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def ttl_for(self, url: str) -> int:
+        """
+        TTL do endpoint: regra com o prefixo mais longo que casa com a URL.
+        """
+        matches = [prefix for prefix in self.ttl_by_endpoint if url.startswith(prefix)]
+        if not matches:
+            return self.default_ttl
+        return self.ttl_by_endpoint[max(matches, key=len)]
+
+    def key(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        Chave da entrada: URL + parâmetros + escopo de autenticação (hash dos headers de credencial).
+        """
+        auth = sorted((k.lower(), v) for k, v in (headers or {}).items() if k.lower() in _AUTH_HEADERS)
+        payload = json.dumps({'url': url, 'params': params or {}, 'auth': auth}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, f'{key}.json'), os.path.join(self.cache_dir, f'{key}.body')
+
+    def _load(self, key: str) -> Optional[dict]:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                meta['body'] = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        return meta
+
+    def _store(self, key: str, url: str, response: requests.Response) -> None:
+        meta_path, body_path = self._paths(key)
+        meta = {
+            'url': url,
+            'stored_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(body_path + suffix, 'wb') as f:
+            f.write(response.content)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(body_path + suffix, body_path)
+        os.replace(meta_path + suffix, meta_path)
+        self._evict()
+
+    def _touch(self, key: str, refresh: bool = False) -> None:
+        """
+        Marca a entrada como usada recentemente (relógio do LRU) e, após um 304, renova o TTL.
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            if refresh:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                meta['stored_at'] = time.time()
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+            os.utime(body_path)
+        except FileNotFoundError:
+            pass  # entrada removida por outro processo (LRU)
+
+    def _evict(self) -> None:
+        """
+        Remove as entradas menos usadas recentemente até o cache caber em max_bytes.
+        """
+        entries = []
+        for body_path in glob.glob(os.path.join(self.cache_dir, '*.body')):
+            try:
+                stat = os.stat(body_path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, body_path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, body_path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: int = 30,
+        scheduler=None
+    ) -> bytes:
+        """
+        Faz um GET passando pelo cache e retorna o corpo da resposta.
+        Com scheduler (RateLimitScheduler), as idas à rede respeitam o limite de taxa do host.
+
+        Returns:
+            Corpo da resposta (bytes), vindo do disco (acerto/304) ou da rede
+        """
+        key = self.key(url, params, headers)
+        entry = self._load(key)
+
+        if entry is not None and time.time() - entry['stored_at'] < self.ttl_for(url):
+            self._count('hits')
+            self._touch(key)
+            return entry['body']
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        if scheduler is not None:
+            response = scheduler.request(session, 'GET', url, params=params, headers=request_headers, timeout=timeout)
+        else:
+            response = session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            self._count('revalidated')
+            self._touch(key, refresh=True)
+            return entry['body']
+
+        response.raise_for_status()
+        self._count('misses')
+
+        cacheable = 'no-store' not in response.headers.get('Cache-Control', '')
+        if cacheable and (response.headers.get('ETag') or response.headers.get('Last-Modified') or self.ttl_for(url) > 0):
+            self._store(key, url, response)
+        return response.content
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Contadores do cache: acertos locais, revalidações (304), erros e taxa de acerto.
+        """
+        total = self.hits + self.revalidated + self.misses
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.revalidated) / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """
+        Remove todas as entradas do cache (os contadores são mantidos).
+        """
+        for path in glob.glob(os.path.join(self.cache_dir, '*.body')) + glob.glob(os.path.join(self.cache_dir, '*.json')):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+# Instância padrão compartilhada pelo processo
+_DEFAULT_CACHE: Optional[HTTPResponseCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+def get_response_cache() -> HTTPResponseCache:
+    """
+    Retorna o cache HTTP padrão (HTTP_CACHE_DIR), criando-o na primeira chamada.
+    """
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = HTTPResponseCache()
+        return _DEFAULT_CACHE
@@ -0,0 +1,165 @@
+import os
+import json
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+from sqlalchemy import text
+from e_commerce.config.settings import INCREMENTAL_STATE_FILE
+from e_commerce.conections.sql import connect
+from e_commerce.utils.file_paths import get_file_path
+from e_commerce.utils.save import save_to_parquet_processed, save_to_parquet_interim
+from e_commerce.data_extraction.parquet_extraction import _read_parquet
+
+_PARTITION_COLS = ['year', 'month']
+
+
+def load_watermarks(state_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Lê o arquivo de estado com as marcas d'água de cada dataset incremental.
+    """
+    state_path = str(state_path or INCREMENTAL_STATE_FILE)
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_watermark(state_path: Optional[str], key: str, value: Any, column: str) -> None:
+    """
+    Grava a nova marca d'água de forma atômica (arquivo temporário + os.replace).
+    """
+    state_path = str(state_path or INCREMENTAL_STATE_FILE)
+    state = load_watermarks(state_path)
+
+    if isinstance(value, (pd.Timestamp, datetime)):
+        entry = {'column': column, 'kind': 'datetime', 'value': pd.Timestamp(value).isoformat()}
+    elif isinstance(value, str):
+        entry = {'column': column, 'kind': 'text', 'value': value}
+    else:
+        entry = {'column': column, 'kind': 'number', 'value': value.item() if hasattr(value, 'item') else value}
+    entry['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    state[key] = entry
+
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp_path = f'{state_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def _watermark_value(entry: Optional[Dict[str, Any]]) -> Any:
+    if entry is None:
+        return None
+    if entry['kind'] == 'datetime':
+        return pd.Timestamp(entry['value']).to_pydatetime()
+    return entry['value']
+
+
+def _lower_bound(watermark: Any, lookback: Union[None, int, float, str, pd.Timedelta]) -> Any:
+    """
+    Limite inferior da busca: a marca d'água recuada pela janela de dados atrasados.
+    Para datas, lookback é um Timedelta ou texto ('3D', '12h'); para ids, um número.
+    """
+    if not lookback:
+        return watermark
+    if isinstance(watermark, (int, float)):
+        return watermark - lookback
+    bound = pd.Timestamp(watermark) - pd.Timedelta(lookback)
+    if isinstance(watermark, str):
+        return str(bound)  # mesmo formato 'YYYY-MM-DD HH:MM:SS' das datas gravadas como texto
+    return bound.to_pydatetime()
+
+
+def extract_incremental(
+    connection_string: str,
+    table_name: str,
+    watermark_column: str = 'order_date',
+    date_column: str = 'order_date',
+    schema: Optional[str] = None,
+    lookback: Union[None, int, float, str, pd.Timedelta] = None,
+    dataset: Optional[str] = None,
+    type_name: str = 'interim',
+    state_path: Optional[str] = None,
+    search_path: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Extração incremental por marca d'água (high-water mark).
+
+    Busca apenas as linhas com watermark_column acima da última marca gravada e as grava em
+    um dataset Parquet particionado por year/month. Com lookback, a busca recomeça um pouco
+    antes da marca para capturar dados que chegaram atrasados; as partições tocadas são
+    regravadas (delete_matching), então as linhas da janela são substituídas, não duplicadas.
+    Na primeira execução (sem marca) a tabela inteira é carregada.
+
+    Args:
+        connection_string: String de conexão SQLAlchemy
+        table_name: Nome da tabela (ex.: 'ecommerce_america')
+        watermark_column: Coluna crescente usada como marca (data como 'order_date' ou id monotônico)
+        date_column: Coluna de data que define as partições year/month (padrão: 'order_date';
+                     informe-a quando a marca d'água não for a data, ex.: watermark_column='id')
+        schema: Schema da tabela (opcional)
+        lookback: Janela de dados atrasados ('3D', pd.Timedelta(hours=12) ou, para ids, um número)
+        dataset: Nome/caminho do dataset Parquet (padrão: '<table_name>.parquet')
+        type_name: Camada onde o dataset é gravado ('interim' ou 'processed')
+        state_path: Arquivo de estado das marcas (padrão: INCREMENTAL_STATE_FILE)
+        search_path: Schema padrão da conexão PostgreSQL (opcional)
+
+    Returns:
+        DataFrame com as linhas buscadas nesta execução
+    """
+    if type_name not in ('interim', 'processed'):
+        raise ValueError(f"Tipo de dataset inválido: {type_name}")
+    source = f"{schema}.{table_name}" if schema else table_name
+    dataset_path = get_file_path(dataset or f"{table_name}.parquet", folder=type_name)
+    key = os.path.abspath(dataset_path)
+
+    watermark = _watermark_value(load_watermarks(state_path).get(key))
+    lower = None if watermark is None else _lower_bound(watermark, lookback)
+
+    query = f"SELECT * FROM {source}"
+    params = {}
+    if lower is not None:
+        # Sem lookback só entram linhas depois da marca; com lookback a janela inteira é relida
+        query += f" WHERE {watermark_column} {'>=' if lookback else '>'} :lower"
+        params['lower'] = lower
+
+    try:
+        with connect(connection_string, search_path=search_path) as conn:
+            new = pd.read_sql_query(text(query), conn, params=params)
+    except Exception as e:
+        raise Exception(f"Erro ao conectar com banco de dados: {e}")
+
+    if new.empty:
+        print(f"Nenhuma linha nova em {source} desde {watermark}")
+        return new
+
+    if date_column not in new.columns:
+        raise ValueError(f"Coluna de data '{date_column}' não encontrada em {source}; informe date_column.")
+    if pd.api.types.is_numeric_dtype(new[date_column]) or pd.api.types.is_bool_dtype(new[date_column]):
+        raise ValueError(f"A coluna '{date_column}' não é uma data; informe em date_column a coluna de data das partições.")
+    new = new.drop(columns=[c for c in _PARTITION_COLS if c in new.columns])
+    dates = pd.to_datetime(new[date_column])
+    touched = sorted(set(zip(dates.dt.year, dates.dt.month)))
+
+    frames = [new]
+    if lower is not None and os.path.exists(dataset_path):
+        # As partições tocadas são regravadas inteiras: junta as linhas que já estavam nelas
+        old = _read_parquet(dataset_path, filters=[
+            [('year', '==', int(year)), ('month', '==', int(month))] for year, month in touched
+        ])
+        old = old.drop(columns=[c for c in _PARTITION_COLS if c in old.columns])
+        if lookback:
+            # Linhas da janela relida são substituídas pela versão atual do banco
+            if isinstance(lower, datetime):
+                old = old[pd.to_datetime(old[watermark_column]) < pd.Timestamp(lower)]
+            else:
+                old = old[old[watermark_column] < lower]
+        frames.insert(0, old)
+
+    merged = pd.concat(frames, ignore_index=True)
+    save = save_to_parquet_processed if type_name == 'processed' else save_to_parquet_interim
+    save(merged, dataset_path, partition_cols=_PARTITION_COLS, sort_by=date_column, partition_mode='delete_matching')
+
+    _save_watermark(state_path, key, new[watermark_column].max(), watermark_column)
+    print(f"{len(new)} linhas extraídas de {source}; {len(touched)} partição(ões) atualizada(s)")
+    return new
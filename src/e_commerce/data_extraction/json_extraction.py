@@ -1,31 +1,163 @@
 import os
+import re
 import json
 import pandas as pd
+from typing import Any, Iterator, List, Optional, Union
 from e_commerce.config.settings import DATA_RAW, DATA_PROCESSED, DATA_INTERIM
 
-def extract_json_raw(filename_or_path: str) -> pd.DataFrame:
+# Extensões tratadas como JSON delimitado por linha (NDJSON)
+_NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _iter_ndjson(filepath: str) -> Iterator[Any]:
     """
-    Lê JSON da pasta DATA_RAW ou de um caminho absoluto e retorna como DataFrame.
+    Lê um arquivo NDJSON registro a registro (uma linha = um objeto JSON).
     """
-    filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_RAW, filename_or_path)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _iter_json_array(filepath: str, read_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Parser incremental para arquivos com um array JSON no nível superior.
+
+    Lê o arquivo em blocos de read_size caracteres e decodifica um elemento por vez,
+    então a memória depende do tamanho do bloco e não do tamanho do arquivo.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        buffer = f.read(read_size)
+        pos = _WHITESPACE.match(buffer).end()
+        if buffer[pos:pos + 1] != '[':
+            raise ValueError(f"O modo streaming requer NDJSON ou um array JSON no nível superior: {filepath}")
+        pos += 1
+        eof = False
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+
+            # Precisa de mais dados para continuar
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"JSON incompleto: {filepath}")
+                chunk = f.read(read_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            char = buffer[pos]
+            if char == ']':
+                return
+            if char == ',':
+                pos += 1
+                continue
+
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                obj, end = None, None
+
+            # Elemento cortado no fim do bloco (ou número que pode continuar): lê mais e tenta de novo
+            if end is None or (end >= len(buffer) and not eof):
+                if eof:
+                    raise ValueError(f"JSON inválido perto da posição {pos}: {filepath}")
+                chunk = f.read(read_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield obj
+            pos = end
+
+
+def _iter_batches(filepath: str, lines: bool, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Agrupa os registros em lotes de chunksize e achata cada lote com pd.json_normalize.
+    Cada lote tem só as colunas dos seus próprios registros.
+    """
+    records = _iter_ndjson(filepath) if lines else _iter_json_array(filepath)
+
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= chunksize:
+            yield pd.json_normalize(batch)
+            batch = []
+
+    if batch:
+        yield pd.json_normalize(batch)
+
+
+def _iter_json_chunks(filepath: str, lines: bool, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Gera os lotes do modo streaming, todos com o mesmo conjunto de colunas: columns ou,
+    se não informado, as do primeiro lote (chaves que só aparecem em lotes posteriores
+    são descartadas).
+    """
+    for chunk in _iter_batches(filepath, lines, chunksize):
+        columns = columns if columns is not None else list(chunk.columns)
+        yield chunk.reindex(columns=columns)
+
+
+def _read_json(filepath: str, lines: Optional[bool] = None, chunksize: Optional[int] = None, columns: Optional[List[str]] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Lê JSON/NDJSON inteiro ou, se chunksize for informado, retorna um gerador de chunks.
+    """
+    filepath = os.fspath(filepath)  # aceita pathlib.Path
+    if lines is None:
+        lines = filepath.lower().endswith(_NDJSON_EXTENSIONS)
+
+    if chunksize:
+        return _iter_json_chunks(filepath, lines, chunksize, columns)
+
+    if lines:
+        # Leitura completa: sem columns, o resultado tem a união das colunas de todos os lotes
+        chunks = list(_iter_batches(filepath, lines, 100_000))
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        df = pd.concat(chunks, ignore_index=True)
+        return df.reindex(columns=columns) if columns is not None else df
+
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
-    return pd.json_normalize(data)
+    df = pd.json_normalize(data)
+    return df.reindex(columns=columns) if columns is not None else df
 
-def extract_json_processed(filename_or_path: str) -> pd.DataFrame:
+def extract_json_raw(filename_or_path: str, lines: Optional[bool] = None, chunksize: Optional[int] = None, columns: Optional[List[str]] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Lê JSON da pasta DATA_RAW ou de um caminho absoluto e retorna como DataFrame.
+
+    lines=True (ou extensão .ndjson/.jsonl) lê JSON delimitado por linha. Com chunksize,
+    retorna um gerador de DataFrames com chunksize registros e colunas fixas (columns ou,
+    se não informado, as do primeiro lote).
+    """
+    filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_RAW, filename_or_path)
+    return _read_json(filepath, lines=lines, chunksize=chunksize, columns=columns)
+
+def extract_json_processed(filename_or_path: str, lines: Optional[bool] = None, chunksize: Optional[int] = None, columns: Optional[List[str]] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Lê JSON da pasta DATA_PROCESSED ou de um caminho absoluto e retorna como DataFrame.
+
+    lines=True (ou extensão .ndjson/.jsonl) lê JSON delimitado por linha. Com chunksize,
+    retorna um gerador de DataFrames com chunksize registros e colunas fixas (columns ou,
+    se não informado, as do primeiro lote).
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_PROCESSED, filename_or_path)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return pd.json_normalize(data)
+    return _read_json(filepath, lines=lines, chunksize=chunksize, columns=columns)
 
-def extract_json_interim(filename_or_path: str) -> pd.DataFrame:
+def extract_json_interim(filename_or_path: str, lines: Optional[bool] = None, chunksize: Optional[int] = None, columns: Optional[List[str]] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Lê JSON da pasta DATA_INTERIM ou de um caminho absoluto e retorna como DataFrame.
+
+    lines=True (ou extensão .ndjson/.jsonl) lê JSON delimitado por linha. Com chunksize,
+    retorna um gerador de DataFrames com chunksize registros e colunas fixas (columns ou,
+    se não informado, as do primeiro lote).
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_INTERIM, filename_or_path)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return pd.json_normalize(data)
+    return _read_json(filepath, lines=lines, chunksize=chunksize, columns=columns)
@@ -1,36 +1,86 @@
 import os
 import pandas as pd
+from typing import Any, Dict, List, Optional, Union
 from e_commerce.config.settings import DATA_RAW, DATA_PROCESSED, DATA_INTERIM
 
-def extract_parquet_raw(filename_or_path: str, **kwargs) -> pd.DataFrame:
+
+def _to_filters(filters: Union[Dict[str, Any], List, None]) -> Optional[List]:
+    """
+    Converte o atalho em dict para o formato de filtros do pyarrow (lista de tuplas).
+
+    - {'coluna': valor}            -> ('coluna', '==', valor)
+    - {'coluna': [v1, v2]}         -> ('coluna', 'in', [v1, v2])
+    - {'coluna': (inicio, fim)}    -> ('coluna', '>=', inicio), ('coluna', '<', fim)
+    Strings em intervalos são convertidas para Timestamp (ex.: ('2018-01-01', '2018-02-01')).
+    Listas de tuplas (formato do pyarrow) são repassadas sem alteração.
+    """
+    if filters is None or isinstance(filters, list):
+        return filters
+
+    converted = []
+    for col, value in filters.items():
+        if isinstance(value, tuple) and len(value) == 2:
+            start, end = (pd.Timestamp(v) if isinstance(v, str) else v for v in value)
+            if start is not None:
+                converted.append((col, '>=', start))
+            if end is not None:
+                converted.append((col, '<', end))
+        elif isinstance(value, (list, set)):
+            converted.append((col, 'in', list(value)))
+        else:
+            converted.append((col, '==', value))
+    return converted
+
+
+def _read_parquet(filepath: str, columns: Optional[List[str]] = None, filters=None, **kwargs) -> pd.DataFrame:
+    """
+    Lê um arquivo ou diretório Parquet (inclusive particionado no estilo hive: year=/month=).
+
+    Somente as colunas pedidas são lidas e os filtros são aplicados pelo pyarrow, que usa as
+    estatísticas (min/max) de cada row group e os valores das partições para pular o que
+    não atende ao filtro.
+    """
+    return pd.read_parquet(filepath, engine='pyarrow', columns=columns, filters=_to_filters(filters), **kwargs)
+
+
+def extract_parquet_raw(filename_or_path: str, columns: Optional[List[str]] = None, filters=None, **kwargs) -> pd.DataFrame:
     """
     Lê Parquet da pasta DATA_RAW ou de um caminho absoluto.
-    
+
     Args:
-        filename_or_path: Nome do arquivo ou caminho absoluto
+        filename_or_path: Nome do arquivo/diretório ou caminho absoluto
+        columns: Colunas a serem lidas (None = todas)
+        filters: Filtros de linhas - dict (ex.: {'order_date': ('2018-01-01', '2018-02-01')})
+                 ou lista de tuplas do pyarrow (ex.: [('product_category', '==', 'Fashion')])
         **kwargs: Parâmetros adicionais para pd.read_parquet()
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_RAW, filename_or_path)
-    return pd.read_parquet(filepath, **kwargs)
+    return _read_parquet(filepath, columns=columns, filters=filters, **kwargs)
 
-def extract_parquet_processed(filename_or_path: str, **kwargs) -> pd.DataFrame:
+def extract_parquet_processed(filename_or_path: str, columns: Optional[List[str]] = None, filters=None, **kwargs) -> pd.DataFrame:
     """
     Lê Parquet da pasta DATA_PROCESSED ou de um caminho absoluto.
-    
+
     Args:
-        filename_or_path: Nome do arquivo ou caminho absoluto
+        filename_or_path: Nome do arquivo/diretório ou caminho absoluto
+        columns: Colunas a serem lidas (None = todas)
+        filters: Filtros de linhas - dict (ex.: {'order_date': ('2018-01-01', '2018-02-01')})
+                 ou lista de tuplas do pyarrow (ex.: [('product_category', '==', 'Fashion')])
         **kwargs: Parâmetros adicionais para pd.read_parquet()
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_PROCESSED, filename_or_path)
-    return pd.read_parquet(filepath, **kwargs)
+    return _read_parquet(filepath, columns=columns, filters=filters, **kwargs)
 
-def extract_parquet_interim(filename_or_path: str, **kwargs) -> pd.DataFrame:
+def extract_parquet_interim(filename_or_path: str, columns: Optional[List[str]] = None, filters=None, **kwargs) -> pd.DataFrame:
     """
     Lê Parquet da pasta DATA_INTERIM ou de um caminho absoluto.
-    
+
     Args:
-        filename_or_path: Nome do arquivo ou caminho absoluto
+        filename_or_path: Nome do arquivo/diretório ou caminho absoluto
+        columns: Colunas a serem lidas (None = todas)
+        filters: Filtros de linhas - dict (ex.: {'order_date': ('2018-01-01', '2018-02-01')})
+                 ou lista de tuplas do pyarrow (ex.: [('product_category', '==', 'Fashion')])
         **kwargs: Parâmetros adicionais para pd.read_parquet()
     """
     filepath = filename_or_path if os.path.isabs(filename_or_path) else os.path.join(DATA_INTERIM, filename_or_path)
-    return pd.read_parquet(filepath, **kwargs)
\ No newline at end of file
+    return _read_parquet(filepath, columns=columns, filters=filters, **kwargs)
@@ -0,0 +1,188 @@
+import os
+import threading
+from decimal import Decimal
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.engine import make_url
+from e_commerce.conections.sql import connect
+
+# OID do tipo PostgreSQL -> tipo Arrow usado no parse do COPY (tipos fora da lista são lidos como texto)
+_PG_ARROW_TYPES = {
+    16: 'bool',
+    20: 'int64', 21: 'int16', 23: 'int32', 26: 'int64',
+    700: 'float32', 701: 'float64',
+    1082: 'date32',
+    1114: 'timestamp',
+    1184: 'timestamptz',
+}
+
+# NUMERIC: lido como texto e convertido para Decimal, como o driver faz no pd.read_sql_query
+_PG_NUMERIC = 1700
+
+
+def is_postgres(connection_string: str) -> bool:
+    """
+    Verifica se a connection string aponta para PostgreSQL.
+    """
+    try:
+        return make_url(connection_string).get_backend_name() == 'postgresql'
+    except Exception:
+        return False
+
+
+def _bind(cursor, query: str, params: Optional[Dict[str, Any]]) -> str:
+    """
+    Incorpora os parâmetros à query pelo próprio driver (mogrify), com o escape correto.
+    COPY não aceita parâmetros.
+    """
+    if params:
+        if not hasattr(cursor, 'mogrify'):
+            raise ValueError("O driver não suporta parâmetros no COPY (mogrify indisponível).")
+        query = cursor.mogrify(query, params)
+        query = query.decode('utf-8') if isinstance(query, bytes) else query
+    return query.strip().rstrip(';')
+
+
+def _copy_query(query: str) -> str:
+    # FORCE_QUOTE *: valores não nulos saem entre aspas, NULL sai vazio sem aspas.
+    # Assim '' (texto vazio) e NULL continuam distintos na leitura.
+    return f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true, FORCE_QUOTE *)"
+
+
+def _column_types(cursor, query: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Tipos Arrow de cada coluna a partir do cursor.description (query com LIMIT 0),
+    mais a lista das colunas NUMERIC.
+
+    Fixar os tipos evita que a inferência do CSV mude o resultado em relação ao
+    pd.read_sql_query (ex.: texto 't'/'f' virando bool ou texto numérico virando número).
+    """
+    import pyarrow as pa
+
+    arrow_types = {
+        'bool': pa.bool_(), 'int16': pa.int16(), 'int32': pa.int32(), 'int64': pa.int64(),
+        'float32': pa.float32(), 'float64': pa.float64(), 'date32': pa.date32(),
+        'timestamp': pa.timestamp('us'), 'timestamptz': pa.timestamp('us', tz='UTC'),
+    }
+    cursor.execute(f"SELECT * FROM ({query}) AS _copy_probe LIMIT 0")
+    types = {
+        column.name: arrow_types.get(_PG_ARROW_TYPES.get(column.type_code), pa.string())
+        for column in cursor.description
+    }
+    numeric = [column.name for column in cursor.description if column.type_code == _PG_NUMERIC]
+    return types, numeric
+
+
+def _copy_to_pipe(dbapi_conn, query: str, writer, errors: list) -> None:
+    """
+    Executa COPY ... TO STDOUT escrevendo no pipe (roda em uma thread; psycopg2 ou psycopg 3).
+    """
+    cursor = dbapi_conn.cursor()
+    try:
+        # Datas com fuso saem em UTC, o mesmo fuso usado no tipo Arrow
+        cursor.execute("SET LOCAL TIME ZONE 'UTC'")
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2
+            cursor.copy_expert(_copy_query(query), writer)
+        elif hasattr(cursor, 'copy'):
+            # psycopg 3
+            with cursor.copy(_copy_query(query)) as copy:
+                for block in copy:
+                    writer.write(block)
+        else:
+            raise ValueError("O driver PostgreSQL não suporta COPY TO STDOUT.")
+    except Exception as e:
+        errors.append(e)
+    finally:
+        cursor.close()
+        try:
+            writer.close()
+        except OSError:
+            pass  # o leitor já fechou o pipe
+
+
+def _read_copy(dbapi_conn, query: str, column_types: Dict[str, Any], block_size: int = 1 << 24):
+    """
+    Lê o COPY em fluxo: o servidor escreve em um pipe e o leitor CSV do pyarrow consome os
+    blocos conforme chegam, sem acumular o CSV inteiro em memória.
+    """
+    import pyarrow.csv as pv
+
+    read_fd, write_fd = os.pipe()
+    reader_file, writer_file = os.fdopen(read_fd, 'rb'), os.fdopen(write_fd, 'wb')
+    errors = []
+    producer = threading.Thread(target=_copy_to_pipe, args=(dbapi_conn, query, writer_file, errors), daemon=True)
+    producer.start()
+
+    read_options = pv.ReadOptions(block_size=block_size)
+    convert_options = pv.ConvertOptions(
+        column_types=column_types,
+        null_values=[''],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False,
+        true_values=['t', 'true'],
+        false_values=['f', 'false'],
+    )
+    try:
+        table = pv.open_csv(reader_file, read_options=read_options, convert_options=convert_options).read_all()
+    except Exception:
+        reader_file.close()
+        producer.join()
+        if errors:
+            raise errors[0]
+        raise
+    reader_file.close()
+    producer.join()
+    if errors:
+        raise errors[0]
+    return table
+
+
+def extract_from_postgres_copy(
+    connection_string: str,
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    search_path: Optional[str] = None,
+    column_types: Optional[Dict[str, Any]] = None,
+    as_table: bool = False,
+    dtype_backend: str = 'numpy'
+) -> pd.DataFrame:
+    """
+    Extrai o resultado de uma query PostgreSQL via COPY (query) TO STDOUT.
+
+    O servidor envia o resultado em CSV e o pyarrow.csv monta as colunas à medida que os
+    blocos chegam, evitando o passo linha a linha (tuplas Python) do pd.read_sql_query.
+    Os tipos das colunas vêm do cursor.description (não são inferidos do CSV); tipos sem
+    equivalente direto (json, uuid, interval...) são lidos como texto. Colunas NUMERIC
+    viram objetos Decimal no dtype_backend 'numpy', como no pd.read_sql_query; na
+    pyarrow.Table (as_table) e no backend 'pyarrow' elas ficam como texto.
+
+    Args:
+        connection_string: String de conexão SQLAlchemy (postgresql://...)
+        query: Query SQL para execução
+        params: Parâmetros da query (estilo do driver, ex.: %(data)s); incorporados pelo driver
+        search_path: Schema padrão da conexão (opcional)
+        column_types: Tipos Arrow por coluna que substituem os do banco (ex.: {'order_date': pa.timestamp('s')})
+        as_table: Se True, retorna a pyarrow.Table sem converter para pandas
+        dtype_backend: 'numpy' (padrão) ou 'pyarrow' (colunas ArrowDtype, sem cópia)
+    """
+    with connect(connection_string, search_path=search_path) as conn:
+        dbapi_conn = conn.connection.dbapi_connection
+        cursor = dbapi_conn.cursor()
+        try:
+            query = _bind(cursor, query, params)
+            types, numeric = _column_types(cursor, query)
+        finally:
+            cursor.close()
+        types.update(column_types or {})
+        table = _read_copy(dbapi_conn, query, types)
+
+    if as_table:
+        return table
+    if dtype_backend == 'pyarrow':
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    df = table.to_pandas()
+    for column in numeric:
+        if column not in (column_types or {}):
+            df[column] = df[column].map(Decimal, na_action='ignore')
+    return df
@@ -0,0 +1,287 @@
+import time
+import random
+import threading
+import requests
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+# Status que indicam limite de requisições atingido
+_THROTTLE_STATUS = (429, 503)
+
+
+class RateLimitError(Exception):
+    """
+    Limite de requisições da API excedido mesmo após todas as novas tentativas.
+    """
+
+
+class TokenBucket:
+    """
+    Balde de tokens thread-safe: libera no máximo `rate` requisições por segundo,
+    com rajadas de até `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Aguarda um token e retorna o tempo (segundos) que ficou esperando.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def block(self, seconds: float) -> None:
+        """
+        Suspende o balde por alguns segundos (ex.: Retry-After ou janela esgotada).
+        """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class RateLimitScheduler:
+    """
+    Agendador adaptativo de requisições para APIs com limite de taxa.
+
+    - Um balde de tokens por host, ajustado pelos headers X-RateLimit-* / RateLimit-*
+    - Retry-After respeitado; sem ele, backoff exponencial com jitter
+    - Concorrência AIMD: cresce devagar a cada sucesso e cai pela metade a cada 429,
+      ficando logo abaixo do limite do provedor
+    - Métricas de vazão (registros/s) e de tempo gasto esperando pelo limite
+
+    Args:
+        rate: Requisições por segundo iniciais por host
+        burst: Tamanho máximo de rajada (padrão: rate)
+        max_concurrency: Teto de requisições simultâneas
+        min_concurrency: Piso de requisições simultâneas
+        max_retries: Novas tentativas após 429/503 antes de RateLimitError
+        backoff_base: Espera base (s) do backoff exponencial
+        backoff_max: Espera máxima (s) do backoff
+        safety_factor: Fração do limite anunciado pelo provedor que será usada
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        safety_factor: float = 0.9
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.safety_factor = safety_factor
+
+        self.concurrency = float(max_concurrency)
+        self._active = 0
+        self._slots = threading.Condition()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self._started = None
+        self.requests = 0
+        self.records = 0
+        self.retries = 0
+        self.throttled_responses = 0
+        self.throttled_seconds = 0.0
+
+    # ---------- controle de taxa e concorrência ----------
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    @contextmanager
+    def _slot(self):
+        """
+        Limita as requisições simultâneas ao valor atual (adaptativo) de concorrência.
+        """
+        with self._slots:
+            while self._active >= max(self.min_concurrency, int(self.concurrency)):
+                self._slots.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._active -= 1
+                self._slots.notify_all()
+
+    def _on_success(self, bucket: TokenBucket, header_driven: bool) -> None:
+        with self._slots:
+            # Aumento aditivo: +1 de concorrência a cada "janela" de sucessos
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / max(self.concurrency, 1.0))
+            self._slots.notify_all()
+        if not header_driven:
+            # Sem headers de limite, a taxa volta aos poucos para o valor inicial após um 429
+            with bucket._lock:
+                bucket.rate = min(self.rate, bucket.rate * 1.05)
+
+    def _on_throttle(self, bucket: TokenBucket) -> None:
+        with self._slots:
+            # Redução multiplicativa
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+        with bucket._lock:
+            bucket.rate = max(bucket.rate / 2, 0.1)
+
+    def _observe_headers(self, bucket: TokenBucket, response: requests.Response) -> bool:
+        """
+        Ajusta o balde do host com base nos headers de limite retornados pelo provedor.
+
+        Returns:
+            True se o provedor informou o limite (e o balde foi ajustado por ele)
+        """
+        headers = response.headers
+        remaining = _first_number(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+        reset = _first_number(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+        if remaining is None or reset is None:
+            return False
+
+        # Reset pode vir em segundos restantes ou como timestamp Unix
+        reset_in = reset - time.time() if reset > 1e9 else reset
+        reset_in = max(reset_in, 1.0)
+
+        if remaining <= 0:
+            bucket.block(reset_in)
+            return True
+        with bucket._lock:
+            bucket.rate = max(0.1, self.safety_factor * remaining / reset_in)
+        return True
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """
+        Tempo de espera antes da nova tentativa: Retry-After ou backoff exponencial com jitter.
+        """
+        retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    # ---------- API pública ----------
+
+    def request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa a requisição respeitando o limite do host e repetindo após 429/503.
+
+        Raises:
+            RateLimitError: se o limite continuar excedido após max_retries tentativas
+        """
+        bucket = self._bucket(urlparse(url).netloc)
+        with self._metrics_lock:
+            if self._started is None:
+                self._started = time.monotonic()
+
+        for attempt in range(self.max_retries + 1):
+            with self._slot():
+                waited = bucket.acquire()
+                response = session.request(method=method, url=url, **kwargs)
+
+            header_driven = self._observe_headers(bucket, response)
+            with self._metrics_lock:
+                self.requests += 1
+                self.throttled_seconds += waited
+
+            if response.status_code not in _THROTTLE_STATUS:
+                self._on_success(bucket, header_driven)
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            self._on_throttle(bucket)
+            bucket.block(delay)
+            with self._metrics_lock:
+                self.throttled_responses += 1
+                if attempt < self.max_retries:
+                    self.retries += 1
+
+        raise RateLimitError(f"Limite de requisições excedido para {url} após {self.max_retries} novas tentativas")
+
+    def record(self, n_records: int) -> None:
+        """
+        Contabiliza registros extraídos (para a métrica de registros por segundo).
+        """
+        with self._metrics_lock:
+            self.records += n_records
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Métricas de vazão e de tempo gasto com limite de taxa.
+        throttled_seconds soma a espera de todas as threads (pode passar do tempo decorrido).
+        """
+        elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+        return {
+            'requests': self.requests,
+            'records': self.records,
+            'elapsed_seconds': elapsed,
+            'requests_per_second': self.requests / elapsed if elapsed else 0.0,
+            'records_per_second': self.records / elapsed if elapsed else 0.0,
+            'throttled_responses': self.throttled_responses,
+            'throttled_seconds': self.throttled_seconds,
+            'retries': self.retries,
+            'concurrency': self.concurrency,
+            'rate_by_host': {host: bucket.rate for host, bucket in self._buckets.items()},
+        }
+
+
+def _first_number(headers, *names) -> Optional[float]:
+    """
+    Primeiro header numérico encontrado entre os nomes informados.
+    """
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                continue
+    return None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After em segundos ou como data HTTP.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
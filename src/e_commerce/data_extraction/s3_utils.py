@@ -1,71 +1,123 @@
-import boto3
 import pandas as pd
 import io
-import s3fs
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Formatos lidos por importar_arquivos_s3
+_EXTENSOES_SUPORTADAS = (".csv", ".parquet")
+
+
+def listar_objetos_s3(s3_bucket: str, s3_prefix: str, s3_client=None):
+    """
+    Lista todas as chaves de um prefixo, página por página (list_objects_v2 devolve no máximo 1.000 por chamada).
+
+    Params:
+        s3_bucket (str): Nome do bucket.
+        s3_prefix (str): Prefixo da camada (ex: 'tech_3/bronze/').
+        s3_client: Cliente boto3 (opcional).
+
+    Returns:
+        Gerador com os objetos ({'Key': ..., 'Size': ...}) do prefixo.
+    """
+    if s3_client is None:
+        import boto3
+        s3_client = boto3.client("s3")
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=s3_bucket, Prefix=s3_prefix):
+        yield from page.get("Contents", [])
+
+
+def _ler_arquivo_s3(s3_client, s3_bucket: str, file_key: str, sep: str):
+    """
+    Baixa um objeto e converte em DataFrame (None se o arquivo estiver vazio ou inválido).
+    """
+    file_name = file_key.split("/")[-1]
+    obj_data = s3_client.get_object(Bucket=s3_bucket, Key=file_key)
+    file_bytes = io.BytesIO(obj_data["Body"].read())
+
+    if file_name.lower().endswith(".csv"):
+        try:
+            return pd.read_csv(file_bytes, sep=sep)
+        except pd.errors.EmptyDataError:
+            print(f"⚠️ Arquivo CSV vazio: {file_name}")
+            return None
+    try:
+        return pd.read_parquet(file_bytes)
+    except Exception as e:
+        print(f"❌ Erro ao ler Parquet {file_name}: {e}")
+        return None
+
 
 # Importar dados do S3
 def importar_arquivos_s3(
     s3_bucket: str,
     s3_prefix: str,
     arquivos_desejados: list = None,
-    sep: str = ","
+    sep: str = ",",
+    max_workers: int = 8,
+    s3_client=None,
+    endpoint_url: str = None
 ) -> pd.DataFrame:
     """
     Importa arquivos do S3 de uma camada específica (bronze, silver ou gold).
     Funciona tanto para CSV quanto Parquet.
-    
+
+    A listagem percorre todas as páginas do prefixo e as chaves são filtradas (nome e
+    extensão) antes de qualquer download. Os arquivos são baixados e lidos em paralelo
+    por até max_workers threads; cada um vira um DataFrame assim que termina (o download
+    é liberado na hora). Os DataFrames são unidos com um único pd.concat, na ordem da
+    listagem, que tolera esquemas diferentes entre arquivos (colunas ausentes, uma coluna
+    vazia num CSV e com texto em outro, tipos mistos).
+
     Params:
         s3_bucket (str): Nome do bucket.
         s3_prefix (str): Prefixo da camada (ex: 'tech_3/bronze/').
         arquivos_desejados (list): Lista com nomes de arquivos desejados. 
                                     Se None, puxa todos.
         sep (str): Separador do arquivo CSV (default: ',').
-    
+        max_workers (int): Downloads simultâneos (default: 8).
+        s3_client: Cliente boto3 já configurado (ex.: de testes com um S3 local); opcional.
+        endpoint_url (str): Endpoint S3 alternativo (ex.: 'http://localhost:9000' do MinIO); opcional.
+
     Returns:
         DataFrame consolidado com todos os arquivos lidos.
     """
-    
-    s3_client = boto3.client("s3")
-    
-    # Lista objetos no prefixo
-    response = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix=s3_prefix)
-    lista_dfs = []
-    
-    for obj in response.get("Contents", []):
+    # Clientes boto3 podem ser compartilhados entre threads
+    if s3_client is None:
+        import boto3
+        s3_client = boto3.client("s3", endpoint_url=endpoint_url)
+    desejados = set(arquivos_desejados) if arquivos_desejados is not None else None
+
+    chaves = []
+    for obj in listar_objetos_s3(s3_bucket, s3_prefix, s3_client):
         file_key = obj["Key"]
         file_name = file_key.split("/")[-1]
-        
-        if (arquivos_desejados is None) or (file_name in arquivos_desejados):
-            print(f"📥 Lendo s3://{s3_bucket}/{file_key}")
-            
-            obj_data = s3_client.get_object(Bucket=s3_bucket, Key=file_key)
-            file_bytes = io.BytesIO(obj_data["Body"].read())
-            
-            # Detectar extensão
-            if file_name.lower().endswith(".csv"):
-                try:
-                    df_temp = pd.read_csv(file_bytes, sep=sep)
-                except pd.errors.EmptyDataError:
-                    print(f"⚠️ Arquivo CSV vazio: {file_name}")
-                    continue
-            elif file_name.lower().endswith(".parquet"):
-                try:
-                    df_temp = pd.read_parquet(file_bytes)
-                except Exception as e:
-                    print(f"❌ Erro ao ler Parquet {file_name}: {e}")
-                    continue
-            else:
-                print(f"⚠️ Formato não suportado: {file_name}, ignorando...")
-                continue
-            
-            lista_dfs.append(df_temp)
-    
-    if not lista_dfs:
+        if not file_name or (desejados is not None and file_name not in desejados):
+            continue
+        if not file_name.lower().endswith(_EXTENSOES_SUPORTADAS):
+            print(f"⚠️ Formato não suportado: {file_name}, ignorando...")
+            continue
+        chaves.append(file_key)
+
+    if not chaves:
         print("⚠️ Nenhum arquivo encontrado!")
         return pd.DataFrame()
-    
-    df_consolidado = pd.concat(lista_dfs, ignore_index=True)
+
+    workers = max(1, min(max_workers, len(chaves)))
+    print(f"📥 Lendo {len(chaves)} arquivo(s) de s3://{s3_bucket}/{s3_prefix} com {workers} worker(s)")
+    dfs = [None] * len(chaves)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_ler_arquivo_s3, s3_client, s3_bucket, key, sep): i for i, key in enumerate(chaves)}
+        for future in as_completed(futures):
+            dfs[futures[future]] = future.result()
+    dfs = [df for df in dfs if df is not None]
+
+    if not dfs:
+        print("⚠️ Nenhum arquivo encontrado!")
+        return pd.DataFrame()
+
+    df_consolidado = pd.concat(dfs, ignore_index=True)
+    del dfs
     print(f"\n✅ Consolidação concluída: {len(df_consolidado)} linhas")
     
     return df_consolidado
@@ -81,6 +133,8 @@ def salvar_s3_parquet(df: pd.DataFrame, caminho_s3: str, engine: str = "fastparq
         caminho_s3 (str): Caminho completo no S3 (ex: 's3://bucket/silver/arquivo.parquet').
         engine (str): Motor de escrita parquet, default 'fastparquet'.
     """
+    import s3fs
+
     print(f"\n💾 Salvando dados no S3: {caminho_s3}")
 
     fs = s3fs.S3FileSystem(
@@ -0,0 +1,224 @@
+# src/etl/aggregation.py
+
+import shutil
+import tempfile
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from e_commerce.config.settings import SPILL_DIR, AGG_MEMORY_BUDGET
+from e_commerce.utils.chunks import is_chunk_stream
+
+# Chaves de agrupamento padrão dos KPIs
+DEFAULT_BY = ['product', 'product_category', 'payment_method', 'month']
+
+# Agregações padrão por coluna
+DEFAULT_AGGS = {
+    'sales': ['sum', 'count', 'mean', 'min', 'max'],
+    'gross_revenue': ['sum', 'mean'],
+    'profit': ['sum', 'mean', 'min', 'max'],
+    'quantity': ['sum'],
+}
+
+# Chaves derivadas da coluna de data (frequência do período)
+_DATE_KEYS = {'month': 'M', 'day': 'D'}
+
+# Estado parcial necessário para cada agregação e como os parciais são combinados
+_STATES = {'sum': ['sum'], 'count': ['count'], 'mean': ['sum', 'count'], 'min': ['min'], 'max': ['max']}
+_COMBINE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+# Profundidade máxima de reparticionamento de uma partição que ainda não cabe no orçamento
+_MAX_DEPTH = 3
+
+
+def _nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+class _HashAggregator:
+    """
+    Agregação por hash com despejo em disco (estilo hash aggregate dos bancos de dados).
+
+    Cada chunk é pré-agregado (um registro por grupo do chunk) e os parciais se acumulam em
+    memória. Quando passam do orçamento, são combinados; se mesmo combinados não cabem, são
+    divididos por hash das chaves em num_partitions arquivos Parquet e liberados da memória.
+    No fim, cada partição é relida e combinada sozinha: como um grupo cai sempre na mesma
+    partição, o resultado de cada uma já é final. Uma partição que ainda não cabe é
+    redividida com outra semente de hash.
+    """
+
+    def __init__(self, by: List[str], aggs: Dict[str, List[str]], memory_budget: int, num_partitions: int):
+        invalid = {func for funcs in aggs.values() for func in funcs} - set(_STATES)
+        if invalid:
+            raise ValueError(f"Agregação inválida: {', '.join(sorted(invalid))}. Opções: {', '.join(_STATES)}")
+        self.by = by
+        self.aggs = aggs
+        self.memory_budget = memory_budget
+        self.num_partitions = num_partitions
+        self.states = {
+            f'{col}__{state}': (col, state)
+            for col, funcs in aggs.items()
+            for state in dict.fromkeys(s for func in funcs for s in _STATES[func])
+        }
+        self.spilled_bytes = 0
+        self._sequence = 0
+
+    def partial(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pré-agrega um chunk: um registro por grupo com os estados parciais.
+        """
+        spec = {name: (col, state) for name, (col, state) in self.states.items()}
+        spec['orders'] = (self.by[0], 'size')
+        return df.groupby(self.by, dropna=False, sort=False, observed=True).agg(**spec).reset_index()
+
+    def combine(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Junta parciais do mesmo grupo (soma de somas e contagens, mínimo de mínimos...).
+        """
+        if len(frames) == 1:
+            return frames[0]
+        spec = {name: (name, _COMBINE[state]) for name, (_, state) in self.states.items()}
+        spec['orders'] = ('orders', 'sum')
+        data = pd.concat(frames, ignore_index=True)
+        return data.groupby(self.by, dropna=False, sort=False, observed=True).agg(**spec).reset_index()
+
+    def finalize(self, state: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converte os estados nas agregações pedidas (ex.: mean = soma / contagem).
+        """
+        result = state[self.by + ['orders']].copy()
+        for col, funcs in self.aggs.items():
+            for func in funcs:
+                if func == 'mean':
+                    result[f'{col}_mean'] = state[f'{col}__sum'] / state[f'{col}__count'].where(state[f'{col}__count'] > 0)
+                else:
+                    result[f'{col}_{func}'] = state[f'{col}__{func}']
+        return result
+
+    def _spill(self, state: pd.DataFrame, directory: Path, depth: int) -> None:
+        """
+        Divide o estado por hash das chaves e grava cada pedaço no arquivo da sua partição.
+        """
+        hash_key = f'e_commerce{depth:06d}'  # 16 caracteres; semente diferente a cada nível
+        partition = pd.util.hash_pandas_object(state[self.by], index=False, hash_key=hash_key) % self.num_partitions
+        self._sequence += 1
+        for part, frame in state.groupby(partition.to_numpy(), sort=False):
+            folder = directory / f'part-{part:04d}'
+            folder.mkdir(parents=True, exist_ok=True)
+            path = folder / f'{self._sequence:08d}.parquet'
+            frame.to_parquet(path, index=False)
+            self.spilled_bytes += path.stat().st_size
+
+    def reduce(self, frames: Iterable[pd.DataFrame], directory: Path, depth: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Combina um fluxo de parciais dentro do orçamento de memória e gera os estados finais.
+        """
+        buffer, size, spilled = [], 0, False
+        for frame in frames:
+            buffer.append(frame)
+            size += _nbytes(frame)
+            if size <= self.memory_budget:
+                continue
+            combined = self.combine(buffer)
+            buffer, size = [combined], _nbytes(combined)
+            if size > self.memory_budget // 2 and depth < _MAX_DEPTH:
+                self._spill(combined, directory, depth)
+                buffer, size, spilled = [], 0, True
+
+        if not spilled:
+            if buffer:
+                yield self.combine(buffer)
+            return
+        if buffer:
+            self._spill(self.combine(buffer), directory, depth)
+
+        for folder in sorted(p for p in directory.iterdir() if p.is_dir()):
+            files = sorted(folder.glob('*.parquet'))
+            yield from self.reduce((pd.read_parquet(path) for path in files), folder / 'sub', depth + 1)
+            shutil.rmtree(folder)
+
+
+def _with_date_keys(df: pd.DataFrame, by: List[str], date_column: str) -> pd.DataFrame:
+    """
+    Cria as chaves 'month'/'day' a partir da coluna de data (início do período como Timestamp).
+    Substitui uma coluna 'month' numérica (ex.: partições year/month do Parquet).
+    """
+    keys = [key for key in by if key in _DATE_KEYS]
+    if not keys or date_column not in df.columns:
+        return df
+    dates = pd.to_datetime(df[date_column], format='ISO8601')
+    df = df.copy(deep=False)
+    for key in keys:
+        df[key] = dates.dt.to_period(_DATE_KEYS[key]).dt.to_timestamp()
+    return df
+
+
+def iter_aggregate_out_of_core(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    by: Optional[List[str]] = None,
+    aggs: Optional[Dict[str, List[str]]] = None,
+    date_column: str = 'order_date',
+    memory_budget: int = AGG_MEMORY_BUDGET,
+    num_partitions: int = 16,
+    spill_dir: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Versão geradora de aggregate_out_of_core: entrega o resultado partição por partição,
+    para quando nem o resultado final cabe na memória (ex.: gravar cada parte em Parquet).
+    Os arquivos temporários são apagados ao fim (ou se o gerador for interrompido).
+    """
+    by = list(by or DEFAULT_BY)
+    aggregator = _HashAggregator(by, aggs or DEFAULT_AGGS, memory_budget, num_partitions)
+    chunks = data if is_chunk_stream(data) else [data]
+    partials = (aggregator.partial(_with_date_keys(chunk, by, date_column)) for chunk in chunks)
+
+    root = Path(spill_dir or SPILL_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    directory = Path(tempfile.mkdtemp(prefix='agg-', dir=root))
+    try:
+        for state in aggregator.reduce(partials, directory):
+            yield aggregator.finalize(state)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        if aggregator.spilled_bytes:
+            print(f"✅ Agregação concluída com {aggregator.spilled_bytes / 1024 ** 2:.1f} MB despejados em disco")
+
+
+def aggregate_out_of_core(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    by: Optional[List[str]] = None,
+    aggs: Optional[Dict[str, List[str]]] = None,
+    date_column: str = 'order_date',
+    memory_budget: int = AGG_MEMORY_BUDGET,
+    num_partitions: int = 16,
+    spill_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Agregação agrupada (sum/count/mean/min/max) sobre dados maiores que a memória.
+
+    Consome um fluxo de chunks (ex.: get_data(..., chunksize=...)) e mantém o estado da
+    agregação dentro de memory_budget; o excedente é despejado em disco em partições por
+    hash e combinado no fim. O pico de memória fica em torno de memory_budget mais um chunk.
+
+    Args:
+        data: DataFrame ou fluxo de chunks
+        by: Chaves de agrupamento (padrão: product, product_category, payment_method, month);
+            'month' e 'day' são derivados de date_column
+        aggs: {coluna: [agregações]} com sum, count, mean, min e max (padrão: DEFAULT_AGGS)
+        date_column: Coluna de data usada nas chaves 'month'/'day'
+        memory_budget: Orçamento em bytes para o estado da agregação (padrão: AGG_MEMORY_BUDGET)
+        num_partitions: Partições de hash usadas ao despejar em disco
+        spill_dir: Pasta dos arquivos temporários (padrão: SPILL_DIR)
+
+    Returns:
+        DataFrame com uma linha por grupo: chaves, orders (linhas do grupo) e <coluna>_<agregação>
+
+    Exemplo:
+        chunks = get_data('csv', 'processed', filename_or_path='e_commerce_prepared.csv', chunksize=500_000)
+        kpis = aggregate_out_of_core(chunks, memory_budget=64 * 1024 ** 2)
+    """
+    by = list(by or DEFAULT_BY)
+    parts = list(iter_aggregate_out_of_core(data, by, aggs, date_column, memory_budget, num_partitions, spill_dir))
+    if not parts:
+        return pd.DataFrame(columns=by)
+    result = pd.concat(parts, ignore_index=True)
+    return result.sort_values(by, na_position='last', kind='stable').reset_index(drop=True)
@@ -0,0 +1,332 @@
+# src/etl/cube.py
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Union
+from e_commerce.config.settings import CUBE_FILE
+from e_commerce.utils.chunks import is_chunk_stream
+
+# Grão do cubo: uma célula por produto x categoria x forma de pagamento x gênero x dia
+DIMENSIONS = ['product', 'product_category', 'payment_method', 'gender']
+MEASURES = ['sales', 'gross_revenue', 'profit', 'quantity']
+
+# Níveis de tempo derivados do dia (início do período)
+TIME_LEVELS = {'day': 'D', 'month': 'M', 'year': 'Y'}
+
+
+def _to_days(values) -> np.ndarray:
+    """
+    Datas como inteiros (dias desde 1970), a unidade do eixo de tempo do cubo.
+    """
+    dates = pd.to_datetime(pd.Series(values), format='ISO8601')
+    if dates.isna().any():
+        raise ValueError("O cubo não aceita datas nulas.")
+    return dates.to_numpy().astype('datetime64[D]').astype(np.int32)
+
+
+def _time_codes(days: np.ndarray, level: str) -> np.ndarray:
+    """
+    Dia, mês (meses desde 1970) ou ano de cada célula.
+    """
+    return days.astype('datetime64[D]').astype(f'datetime64[{TIME_LEVELS[level]}]').astype(np.int32)
+
+
+class SalesCube:
+    """
+    Cubo OLAP pré-agregado das vendas para os dashboards.
+
+    As linhas são agregadas uma única vez no grão mais fino (produto x categoria x forma de
+    pagamento x gênero x dia). Cada dimensão é guardada como códigos inteiros + dicionário
+    de valores e cada medida como um array NumPy, então roll-ups, filtros e top-N são
+    resolvidos sobre as células (np.isin + np.bincount), sem reler os dados linha a linha.
+
+    Exemplo:
+        cube = SalesCube.build(get_data('csv', 'processed', filename_or_path='e_commerce_prepared.csv'))
+        cube.query(by=['month'], measures=['sales'])
+        cube.query(by=['product'], measures=['profit'], filters={'product_category': 'Fashion', 'month': '2018-03'}, top=10)
+        cube.append(novos_dias).save()
+    """
+
+    def __init__(self, dimensions: Optional[List[str]] = None, measures: Optional[List[str]] = None):
+        self.dimensions = list(dimensions or DIMENSIONS)
+        self.measures = list(measures or MEASURES)
+        self._levels: Dict[str, List[Any]] = {dim: [] for dim in self.dimensions}
+        self._index: Dict[str, Dict[Any, int]] = {dim: {} for dim in self.dimensions}
+        self._codes: Dict[str, np.ndarray] = {dim: np.empty(0, dtype=np.int32) for dim in self.dimensions}
+        self._days = np.empty(0, dtype=np.int32)
+        self._values: Dict[str, np.ndarray] = {m: np.empty(0) for m in ['orders'] + self.measures}
+        self._time: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __repr__(self) -> str:
+        span = f"{self.start.date()} a {self.end.date()}" if len(self) else "vazio"
+        return f"SalesCube({len(self)} células, {span})"
+
+    @property
+    def start(self) -> pd.Timestamp:
+        return pd.Timestamp(self._days.min().astype('datetime64[D]'))
+
+    @property
+    def end(self) -> pd.Timestamp:
+        return pd.Timestamp(self._days.max().astype('datetime64[D]'))
+
+    # ---------- construção ----------
+
+    @classmethod
+    def build(
+        cls,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        date_column: str = 'order_date',
+        dimensions: Optional[List[str]] = None,
+        measures: Optional[List[str]] = None
+    ) -> 'SalesCube':
+        """
+        Cria o cubo a partir do dataset preparado (DataFrame ou fluxo de chunks).
+        """
+        return cls(dimensions, measures).append(data, date_column)
+
+    def append(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], date_column: str = 'order_date') -> 'SalesCube':
+        """
+        Acrescenta novas linhas (ex.: os dias que chegaram desde o último build).
+
+        Cada chunk é agregado e codificado sozinho; as células de todos os chunks são juntadas
+        ao cubo uma única vez, no fim. Linhas de dias que já estão no cubo são somadas às
+        células existentes (só nesse caso o cubo inteiro é reagrupado).
+        """
+        spec = {m: (m, 'sum') for m in self.measures}
+        spec['orders'] = ('day', 'size')
+        batch = []
+        for chunk in (data if is_chunk_stream(data) else [data]):
+            if chunk.empty:
+                continue
+            cells = chunk.assign(day=pd.to_datetime(chunk[date_column], format='ISO8601').dt.normalize())
+            cells = cells.groupby(self.dimensions + ['day'], dropna=False, sort=False, observed=True).agg(**spec).reset_index()
+            batch.append(self._encode_cells(cells))
+        if batch:
+            self._add_cells(batch)
+        return self
+
+    def _encode(self, dim: str, values: pd.Series) -> np.ndarray:
+        """
+        Códigos da dimensão no dicionário do cubo (valores novos entram no fim; nulo é um valor próprio).
+        """
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        levels, index = self._levels[dim], self._index[dim]
+        lookup = np.empty(len(uniques) + 1, dtype=np.int32)
+        uniques = list(uniques)
+        if (codes == -1).any():
+            uniques.append(None)  # código -1 (nulo) lê a última posição
+        for i, value in enumerate(uniques):
+            if value not in index:
+                index[value] = len(levels)
+                levels.append(value)
+            lookup[i] = index[value]
+        return lookup[codes]
+
+    def _encode_cells(self, cells: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Células já agregadas (dimensões, 'day', 'orders' e medidas) como arrays: códigos, dias e valores.
+        """
+        arrays = {dim: self._encode(dim, cells[dim]) for dim in self.dimensions}
+        arrays['day'] = _to_days(cells['day'])
+        arrays.update({m: cells[m].to_numpy(dtype=np.float64) for m in self._values})
+        return arrays
+
+    def _sum_duplicates(self, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Soma as células com as mesmas chaves (dimensões + dia).
+        """
+        keys = pd.DataFrame({key: arrays[key] for key in self.dimensions + ['day']})
+        group = keys.groupby(list(keys.columns), sort=False).ngroup().to_numpy()
+        first = np.unique(group, return_index=True)[1]
+        if len(first) == len(group):
+            return arrays
+        merged = {key: arrays[key][first] for key in self.dimensions + ['day']}
+        merged.update({m: np.bincount(group, weights=arrays[m]) for m in self._values})
+        return merged
+
+    def _add_cells(self, batch: List[Dict[str, np.ndarray]]) -> None:
+        """
+        Junta um lote de células codificadas (_encode_cells) ao cubo.
+        """
+        new = {key: np.concatenate([arrays[key] for arrays in batch]) for key in batch[0]}
+        if len(batch) > 1:
+            # Chunks do mesmo lote podem repetir células (ex.: um dia dividido entre dois chunks)
+            new = self._sum_duplicates(new)
+        order = np.argsort(new['day'], kind='stable')
+        new = {key: col[order] for key, col in new.items()}
+
+        if len(self):
+            days = np.unique(new['day'])
+            pos = np.minimum(np.searchsorted(self._days, days), len(self) - 1)
+            overlap = bool((self._days[pos] == days).any())
+            ordered = new['day'][0] > self._days[-1]
+
+            old = {dim: self._codes[dim] for dim in self.dimensions}
+            old['day'] = self._days
+            old.update(self._values)
+            new = {key: np.concatenate([old[key], col]) for key, col in new.items()}
+            if overlap:
+                # Dias repetidos (dados atrasados): reagrupa o cubo inteiro
+                new = self._sum_duplicates(new)
+            if not ordered:
+                order = np.argsort(new['day'], kind='stable')
+                new = {key: col[order] for key, col in new.items()}
+
+        # Células ordenadas por dia: filtros de período viram fatias (searchsorted)
+        self._codes = {dim: new[dim] for dim in self.dimensions}
+        self._days = new['day']
+        self._values = {m: new[m] for m in self._values}
+        self._time = {}
+
+    # ---------- consulta ----------
+
+    def _time_level(self, level: str) -> np.ndarray:
+        if level not in self._time:
+            self._time[level] = self._days if level == 'day' else _time_codes(self._days, level)
+        return self._time[level]
+
+    def _time_filter(self, level: str, value) -> np.ndarray:
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        days = _to_days([pd.Timestamp(v) for v in values])
+        return np.isin(self._time_level(level), _time_codes(days, level))
+
+    def query(
+        self,
+        by: Optional[List[str]] = None,
+        measures: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start=None,
+        end=None,
+        top: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False
+    ) -> pd.DataFrame:
+        """
+        Roll-up do cubo: soma as medidas pelas dimensões pedidas, após os filtros.
+
+        Args:
+            by: Dimensões do resultado (DIMENSIONS e/ou 'day', 'month', 'year'); vazio = total geral
+            measures: Medidas (padrão: todas); 'orders' é o número de linhas originais
+            filters: {dimensão: valor ou lista}, ex.: {'product_category': 'Fashion', 'month': '2018-03'}
+            start: Primeiro dia (inclusive, opcional)
+            end: Último dia (exclusivo, opcional)
+            top: Retorna só os N maiores por sort_by (ex.: top 10 produtos)
+            sort_by: Medida usada no top-N (padrão: a primeira de measures)
+            ascending: Ordem do top-N (False = maiores primeiro)
+
+        Returns:
+            DataFrame com as dimensões e as medidas agregadas
+        """
+        by = list(by or [])
+        measures = list(measures or ['orders'] + self.measures)
+        unknown = [k for k in by + list(filters or {}) if k not in self.dimensions and k not in TIME_LEVELS]
+        unknown += [m for m in measures + ([sort_by] if sort_by else []) if m not in self._values]
+        if unknown:
+            raise ValueError(f"Dimensão ou medida inválida: {', '.join(unknown)}")
+
+        # Período: as células estão ordenadas por dia, então start/end recortam uma fatia
+        lo = 0 if start is None else int(np.searchsorted(self._days, _to_days([start])[0], 'left'))
+        hi = len(self) if end is None else int(np.searchsorted(self._days, _to_days([end])[0], 'left'))
+        rows = slice(lo, hi)
+
+        mask = None
+        for key, value in (filters or {}).items():
+            if key in TIME_LEVELS:
+                selected = self._time_filter(key, value)[rows]
+            else:
+                values = value if isinstance(value, (list, tuple, set)) else [value]
+                wanted = [self._index[key][v] for v in values if v in self._index[key]]
+                selected = np.isin(self._codes[key][rows], wanted)
+            mask = selected if mask is None else mask & selected
+
+        def select(values: np.ndarray) -> np.ndarray:
+            values = values[rows]
+            return values if mask is None else values[mask]
+
+        if not by:
+            out = pd.DataFrame({m: [select(self._values[m]).sum()] for m in measures})
+            return out.astype({'orders': np.int64}) if 'orders' in out else out
+
+        # Chave densa por grupo: códigos das dimensões combinados em um índice linear
+        keys = [select(self._time_level(key) if key in TIME_LEVELS else self._codes[key]) for key in by]
+        offsets = [int(k.min()) if len(k) else 0 for k in keys]
+        shape = tuple(int(k.max()) - off + 1 if len(k) else 1 for k, off in zip(keys, offsets))
+        flat = np.ravel_multi_index([k - off for k, off in zip(keys, offsets)], shape)
+        size = int(np.prod(shape))
+        present = np.flatnonzero(np.bincount(flat, minlength=size))
+
+        result = {}
+        for key, off, codes in zip(by, offsets, np.unravel_index(present, shape)):
+            codes = codes + off
+            if key in TIME_LEVELS:
+                result[key] = codes.astype(f'datetime64[{TIME_LEVELS[key]}]').astype('datetime64[ns]')
+            else:
+                result[key] = np.asarray(self._levels[key], dtype=object)[codes]
+        for m in measures:
+            result[m] = np.bincount(flat, weights=select(self._values[m]), minlength=size)[present]
+        out = pd.DataFrame(result)
+        if 'orders' in out:
+            out['orders'] = out['orders'].astype(np.int64)
+
+        if top:
+            sort_by = sort_by or measures[0]
+            values = out[sort_by].to_numpy()
+            if top < len(out):
+                # argpartition: separa os N maiores sem ordenar todos os grupos
+                picked = np.argpartition(values if ascending else -values, top - 1)[:top]
+                out = out.iloc[picked]
+            out = out.sort_values(sort_by, ascending=ascending, kind='stable')
+        else:
+            out = out.sort_values(by, na_position='last', kind='stable')
+        return out.reset_index(drop=True)
+
+    # ---------- persistência ----------
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Células do cubo como DataFrame colunar (dimensões categóricas, dia e medidas).
+        """
+        frame = {}
+        for dim in self.dimensions:
+            levels = pd.Index(self._levels[dim], dtype=object)
+            codes = self._codes[dim]
+            if any(value is None for value in self._levels[dim]):
+                # Categorical não guarda nulo como categoria: o código do nulo vira -1
+                null_code = self._levels[dim].index(None)
+                codes = np.where(codes == null_code, -1, codes - (codes > null_code))
+                levels = levels.delete(null_code)
+            frame[dim] = pd.Categorical.from_codes(codes, categories=levels)
+        frame['day'] = self._days.astype('datetime64[D]').astype('datetime64[ns]')
+        for m, col in self._values.items():
+            frame[m] = col
+        return pd.DataFrame(frame)
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Grava o cubo em Parquet (dicionários das dimensões + colunas das medidas).
+        """
+        path = str(path or CUBE_FILE)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.to_frame().to_parquet(path, index=False)
+        print(f"✅ Cubo salvo em: {path} ({len(self)} células)")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'SalesCube':
+        """
+        Carrega um cubo gravado com save().
+        """
+        path = str(path or CUBE_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"❌ Cubo não encontrado: {path}")
+        frame = pd.read_parquet(path)
+        dimensions = [col for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)]
+        measures = [col for col in frame.columns if col not in dimensions + ['day', 'orders']]
+        cube = cls(dimensions, measures)
+        if len(frame):
+            cube._add_cells([cube._encode_cells(frame)])
+        return cube
@@ -0,0 +1,343 @@
+# src/etl/kpis.py
+
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Union
+from e_commerce.utils.chunks import is_chunk_stream
+
+# Eixos dos grupos de agregação (o mesmo grão da tabela de resumo do banco)
+AXES = ['day', 'product', 'product_category', 'payment_method']
+
+# Medidas somadas por grupo (dia x produto x categoria x forma de pagamento)
+MEASURES = ['orders', 'payments', 'quantity', 'sales', 'gross_revenue', 'discount', 'profit', 'margin_sum', 'margin_count']
+
+# Bits de cada eixo na chave int64 do grupo (valores distintos por eixo: 2**bits)
+_KEY_BITS = [20, 23, 10, 10]
+_KEY_SHIFTS = [sum(_KEY_BITS[i + 1:]) for i in range(len(_KEY_BITS))]
+
+# Posições dos rankings "Top 10 produtos" (LIMIT 10 no arquivo SQL)
+TOP_PRODUCTS = 10
+
+
+def _round_sql(value: float, decimals: int) -> float:
+    """
+    Arredonda como o ROUND(numeric) do PostgreSQL (metade para longe do zero),
+    e não como o round() do Python (metade para o par).
+    """
+    if value is None or not np.isfinite(value):
+        return value
+    factor = 10 ** decimals
+    return float(np.sign(value) * np.floor(abs(value) * factor + 0.5) / factor)
+
+
+class KPIAccumulator:
+    """
+    Calcula todos os KPIs de america_ecommerce_kpis.sql em uma única passada.
+
+    Cada linha cai em um grupo dia x produto x categoria x forma de pagamento. Só existem os
+    grupos que aparecem nos dados (a memória cresce com o número de grupos, não com o produto
+    das cardinalidades): as chaves são fatorizadas (códigos inteiros estáveis entre chunks),
+    a combinação dos códigos (empacotada em um int64) vira um id de grupo denso por um
+    dicionário global e as medidas
+    são somadas com np.bincount. Todos os KPIs saem de somas sobre a tabela de grupos, sem
+    novos groupbys sobre as linhas.
+
+    Exemplo:
+        acc = KPIAccumulator()
+        for chunk in get_data('csv', 'processed', filename_or_path='e_commerce_prepared.csv', chunksize=100_000):
+            acc.update(chunk)
+        kpis = acc.result()
+    """
+
+    def __init__(self, date_column: str = 'order_date'):
+        self.date_column = date_column
+        self.rows = 0
+        self._levels: Dict[str, List[Any]] = {axis: [] for axis in AXES}
+        self._index: Dict[str, Dict[Any, int]] = {axis: {} for axis in AXES}
+        self._groups: Dict[int, int] = {}
+        # Tabela de grupos por colunas (eixo x grupo e medida x grupo), com folga para crescer
+        self._group_codes = np.zeros((len(AXES), 0), dtype=np.int64)
+        self._sums = np.zeros((len(MEASURES), 0))
+        self._totals: Dict[str, np.ndarray] = {}
+
+    def _encode(self, axis: str, values) -> np.ndarray:
+        """
+        Códigos globais do eixo: fatoriza o chunk e traduz apenas os valores únicos.
+        """
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        levels, index = self._levels[axis], self._index[axis]
+        lookup = np.empty(len(uniques) + 1, dtype=np.int64)
+        uniques = list(uniques)
+        if (codes == -1).any():
+            uniques.append(None)  # nulos formam um grupo próprio, como no GROUP BY do SQL
+        for i, value in enumerate(uniques):
+            if value not in index:
+                index[value] = len(levels)
+                levels.append(value)
+            lookup[i] = index[value]
+        return lookup[codes]  # código -1 (nulo) lê a última posição
+
+    def _days(self, values: pd.Series) -> np.ndarray:
+        """
+        Dia de cada linha como inteiro (dias desde 1970); nulos viram o sentinela mínimo.
+        """
+        if not pd.api.types.is_datetime64_any_dtype(values):
+            values = pd.to_datetime(values, format='ISO8601')
+        days = values.to_numpy().astype('datetime64[D]').astype(np.int64)
+        return np.where(values.isna().to_numpy(), np.iinfo(np.int64).min, days)
+
+    def _group_ids(self, codes: List[np.ndarray]) -> np.ndarray:
+        """
+        Id global (denso) do grupo de cada linha. O dicionário só é consultado para as
+        combinações distintas do chunk; grupos novos recebem os próximos ids.
+        """
+        key = np.zeros(len(codes[0]), dtype=np.int64)
+        for axis, axis_codes, bits, shift in zip(AXES, codes, _KEY_BITS, _KEY_SHIFTS):
+            if len(self._levels[axis]) > 1 << bits:
+                raise ValueError(f"Valores distintos demais em {axis} (máximo: {1 << bits}).")
+            key |= axis_codes << shift
+        local, uniques = pd.factorize(key)
+
+        groups = self._groups
+        if groups:
+            lookup = np.array([groups.get(k, -1) for k in uniques.tolist()], dtype=np.int64)
+        else:
+            lookup = np.full(len(uniques), -1, dtype=np.int64)
+        new = np.flatnonzero(lookup < 0)
+        if len(new):
+            start = len(groups)
+            lookup[new] = np.arange(start, start + len(new))
+            groups.update(zip(uniques[new].tolist(), range(start, start + len(new))))
+            capacity = self._sums.shape[1]
+            if len(groups) > capacity:
+                extra = max(len(groups), 2 * capacity) - capacity
+                self._sums = np.hstack([self._sums, np.zeros((len(MEASURES), extra))])
+                self._group_codes = np.hstack([self._group_codes, np.zeros((len(AXES), extra), dtype=np.int64)])
+            for j, (bits, shift) in enumerate(zip(_KEY_BITS, _KEY_SHIFTS)):
+                self._group_codes[j, lookup[new]] = (uniques[new] >> shift) & ((1 << bits) - 1)
+        return lookup[local]
+
+    def update(self, df: pd.DataFrame) -> 'KPIAccumulator':
+        """
+        Acumula um DataFrame (ou chunk) com as colunas do dataset preparado.
+        """
+        if df.empty:
+            return self
+
+        codes = [self._encode('day', self._days(df[self.date_column]))]
+        codes += [self._encode(axis, df[axis]) for axis in AXES[1:]]
+        gids = self._group_ids(codes)
+        n_groups = len(self._groups)
+
+        sales = df['sales'].to_numpy(dtype=np.float64, na_value=np.nan)
+        profit = df['profit'].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margin = profit / sales
+        margin_ok = np.isfinite(margin)
+
+        measures = [
+            None,
+            df['payment_method'].notna().to_numpy(dtype=np.float64),
+            np.nan_to_num(df['quantity'].to_numpy(dtype=np.float64, na_value=np.nan)),
+            np.nan_to_num(sales),
+            np.nan_to_num(df['gross_revenue'].to_numpy(dtype=np.float64, na_value=np.nan)),
+            np.nan_to_num(df['discount'].to_numpy(dtype=np.float64, na_value=np.nan)),
+            np.nan_to_num(profit),
+            np.where(margin_ok, margin, 0.0),
+            margin_ok.astype(np.float64),
+        ]
+        for j, weights in enumerate(measures):
+            self._sums[j, :n_groups] += np.bincount(gids, weights=weights, minlength=n_groups)
+        self._totals.clear()
+        self.rows += len(df)
+        return self
+
+    # ---------- roll-ups ----------
+
+    def _totals_by(self, axis: str) -> np.ndarray:
+        """
+        Medidas somadas por valor do eixo: matriz (valores do eixo x medidas).
+        """
+        if axis not in self._totals:
+            n_groups = len(self._groups)
+            codes = self._group_codes[AXES.index(axis), :n_groups]
+            size = len(self._levels[axis])
+            self._totals[axis] = np.column_stack([
+                np.bincount(codes, weights=self._sums[j, :n_groups], minlength=size) for j in range(len(MEASURES))
+            ])
+        return self._totals[axis]
+
+    def _by_axis(self, axis: str, measure: str, label: str, value: str) -> pd.DataFrame:
+        totals = self._totals_by(axis)
+        present = np.flatnonzero(totals[:, MEASURES.index('orders')] > 0)
+        result = pd.DataFrame({
+            label: [self._levels[axis][i] for i in present],
+            value: totals[present, MEASURES.index(measure)],
+        })
+        return result.sort_values([value, label], ascending=[False, True], kind='stable', na_position='last').reset_index(drop=True)
+
+    def _by_period(self, freq: str, label: str) -> pd.DataFrame:
+        totals = self._totals_by('day')
+        days = np.array(self._levels['day'], dtype=np.int64)
+        # datetime64[ns], como o DATE_TRUNC lido do banco (datetime64[D] viraria [s] no pandas 2)
+        dates = pd.DatetimeIndex(days.astype('datetime64[D]').astype('datetime64[ns]'))
+        periods = dates.to_period('M').to_timestamp() if freq == 'M' else dates
+        sales = pd.Series(totals[:, MEASURES.index('sales')]).groupby(periods, dropna=False).sum()
+        return pd.DataFrame({label: sales.index, 'total_de_vendas': sales.to_numpy()}).sort_values(label, na_position='last').reset_index(drop=True)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Todos os KPIs do arquivo SQL, com os mesmos nomes de colunas e arredondamentos.
+        """
+        if self.rows == 0:
+            raise ValueError("Nenhuma linha acumulada.")
+        total = self._totals_by('payment_method').sum(axis=0)
+        m = {name: total[i] for i, name in enumerate(MEASURES)}
+
+        by_product = self._totals_by('product')
+        present = np.flatnonzero(by_product[:, MEASURES.index('orders')] > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margins = by_product[present, MEASURES.index('margin_sum')] / by_product[present, MEASURES.index('margin_count')]
+        margem = pd.DataFrame({
+            'product': [self._levels['product'][i] for i in present],
+            'margem_lucro_media': [_round_sql(v * 100, 1) if np.isfinite(v) else np.nan for v in margins],
+        }).sort_values(['margem_lucro_media', 'product'], ascending=[False, True], kind='stable', na_position='first').reset_index(drop=True)
+
+        pagamentos = self._by_axis('payment_method', 'payments', 'payment_method', 'qtde_metodo_pagamento')
+        pagamentos['qtde_metodo_pagamento'] = pagamentos['qtde_metodo_pagamento'].astype(np.int64)
+
+        return {
+            'ticket_medio': _round_sql(m['sales'] / m['orders'], 2),
+            'desconto_medio': _round_sql(m['discount'] / m['orders'], 1) * 10,
+            'volume_vendas': int(m['quantity']),
+            'vendas_mes': self._by_period('M', 'mes'),
+            'vendas_dia': self._by_period('D', 'dia_mes'),
+            'top_produtos_faturamento': self._by_axis('product', 'gross_revenue', 'produto', 'faturamento_bruto').head(TOP_PRODUCTS),
+            'top_categorias_faturamento': self._by_axis('product_category', 'gross_revenue', 'categoria_do_produto', 'faturamento_bruto'),
+            'top_produtos_lucro': self._by_axis('product', 'profit', 'produto', 'lucro_por_produto').head(TOP_PRODUCTS),
+            'top_categorias_lucro': self._by_axis('product_category', 'profit', 'categoria_do_produto', 'lucro_por_categoria'),
+            'margem_produto': margem,
+            'formas_pagamento': pagamentos,
+        }
+
+
+def compute_kpis(data: Union[pd.DataFrame, Iterable[pd.DataFrame]], date_column: str = 'order_date') -> Dict[str, Any]:
+    """
+    Calcula os KPIs de america_ecommerce_kpis.sql sem banco de dados.
+
+    Args:
+        data: DataFrame ou fluxo de chunks (ex.: get_data(..., chunksize=...)) do dataset preparado
+        date_column: Coluna com a data do pedido
+
+    Returns:
+        dict {nome_do_kpi: valor ou DataFrame}; os nomes são os mesmos de get_kpi()
+    """
+    acc = KPIAccumulator(date_column)
+    for chunk in (data if is_chunk_stream(data) else [data]):
+        acc.update(chunk)
+    return acc.result()
+
+
+# ---------- Referência ingênua e benchmark ----------
+
+def _kpis_naive(df: pd.DataFrame, date_column: str = 'order_date') -> Dict[str, Any]:
+    """
+    Uma consulta do arquivo SQL por vez, cada uma com o seu groupby do pandas.
+    """
+    dates = pd.to_datetime(df[date_column])
+
+    def top(col, measure, label, value):
+        out = df.groupby(col, dropna=False)[measure].sum().rename(value).rename_axis(label).reset_index()
+        return out.sort_values([value, label], ascending=[False, True], kind='stable', na_position='last').reset_index(drop=True)
+
+    vendas_mes = df.groupby(dates.dt.to_period('M').dt.to_timestamp(), dropna=False)['sales'].sum()
+    vendas_dia = df.groupby(dates.dt.normalize(), dropna=False)['sales'].sum()
+    margem = (df['profit'] / df['sales']).replace([np.inf, -np.inf], np.nan).groupby(df['product'], dropna=False).mean()
+    pagamentos = df.groupby('payment_method', dropna=False)['payment_method'].count()
+
+    return {
+        'ticket_medio': _round_sql(df['sales'].sum() / len(df), 2),
+        'desconto_medio': _round_sql(df['discount'].sum() / len(df), 1) * 10,
+        'volume_vendas': int(df['quantity'].sum()),
+        'vendas_mes': pd.DataFrame({'mes': vendas_mes.index, 'total_de_vendas': vendas_mes.to_numpy()}).sort_values('mes', na_position='last').reset_index(drop=True),
+        'vendas_dia': pd.DataFrame({'dia_mes': vendas_dia.index, 'total_de_vendas': vendas_dia.to_numpy()}).sort_values('dia_mes', na_position='last').reset_index(drop=True),
+        'top_produtos_faturamento': top('product', 'gross_revenue', 'produto', 'faturamento_bruto').head(TOP_PRODUCTS),
+        'top_categorias_faturamento': top('product_category', 'gross_revenue', 'categoria_do_produto', 'faturamento_bruto'),
+        'top_produtos_lucro': top('product', 'profit', 'produto', 'lucro_por_produto').head(TOP_PRODUCTS),
+        'top_categorias_lucro': top('product_category', 'profit', 'categoria_do_produto', 'lucro_por_categoria'),
+        'margem_produto': pd.DataFrame({
+            'product': margem.index,
+            'margem_lucro_media': [_round_sql(v * 100, 1) if np.isfinite(v) else np.nan for v in margem.to_numpy()],
+        }).sort_values(['margem_lucro_media', 'product'], ascending=[False, True], kind='stable', na_position='first').reset_index(drop=True),
+        'formas_pagamento': pagamentos.rename('qtde_metodo_pagamento').rename_axis('payment_method').reset_index()
+            .sort_values(['qtde_metodo_pagamento', 'payment_method'], ascending=[False, True], kind='stable', na_position='last').reset_index(drop=True),
+    }
+
+
+def _normalize_column(col: pd.Series) -> pd.Series:
+    if col.dtype == object:
+        return col.where(col.notna(), None)
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col.astype('datetime64[ns]')
+    return col
+
+
+def compare_kpis(left: Dict[str, Any], right: Dict[str, Any], rtol: float = 1e-9) -> List[str]:
+    """
+    Compara dois conjuntos de KPIs e retorna os nomes dos que divergem.
+    """
+    different = []
+    for name, value in left.items():
+        other = right[name]
+        if isinstance(value, pd.DataFrame):
+            # None (grupo nulo do motor) e NaN (groupby do pandas) representam o mesmo NULL do SQL;
+            # datas são comparadas na mesma unidade ([s] e [ns] têm inteiros diferentes)
+            value, other = (frame.apply(_normalize_column) for frame in (value, other))
+            try:
+                pd.testing.assert_frame_equal(value, other, check_dtype=False, rtol=rtol)
+            except AssertionError:
+                different.append(name)
+        elif not np.isclose(value, other, rtol=rtol, equal_nan=True):
+            different.append(name)
+    return different
+
+
+def benchmark_kpis(df: pd.DataFrame, repeat: int = 3, chunksize: Optional[int] = None) -> pd.DataFrame:
+    """
+    Mede o motor de passada única contra os groupbys separados e confere se os resultados batem.
+
+    Args:
+        df: Dataset preparado (ex.: e_commerce_prepared.csv)
+        repeat: Repetições (vale o melhor tempo)
+        chunksize: Se informado, o motor também é medido processando o DataFrame em chunks
+
+    Returns:
+        DataFrame com o melhor tempo (s), o ganho sobre o ingênuo e se os KPIs conferem
+    """
+    def best(func):
+        times, result = [], None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    naive_time, reference = best(lambda: _kpis_naive(df))
+    runs = {'groupbys separados': (naive_time, reference), 'passada única': best(lambda: compute_kpis(df))}
+    if chunksize:
+        runs[f'passada única (chunks de {chunksize})'] = best(
+            lambda: compute_kpis(df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+        )
+
+    rows = []
+    for method, (seconds, result) in runs.items():
+        divergent = compare_kpis(reference, result)
+        rows.append({
+            'metodo': method,
+            'segundos': seconds,
+            'ganho': naive_time / seconds if seconds else np.nan,
+            'kpis_conferem': not divergent,
+            'divergencias': ', '.join(divergent),
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,191 @@
+# src/etl/topk.py
+
+import pandas as pd
+from typing import Callable, Iterable, Iterator, Optional, Union
+from e_commerce.utils.chunks import is_chunk_stream
+
+ChunkSource = Union[pd.DataFrame, Iterable[pd.DataFrame], Callable[[], Iterable[pd.DataFrame]]]
+
+
+def _chunks(data: ChunkSource) -> Iterator[pd.DataFrame]:
+    if callable(data):
+        data = data()
+    return iter(data) if is_chunk_stream(data) else iter([data])
+
+
+class TopKIncompleteError(Exception):
+    """
+    A segunda passada não conseguiu provar o Top-K: uma chave descartada ainda pode superar
+    o K-ésimo total exato (é preciso uma capacity maior).
+    """
+
+
+class TopK:
+    """
+    Top-K por soma (ou contagem) sobre um fluxo de chunks com memória limitada (Space-Saving).
+
+    Cada chunk é pré-agregado e somado a um resumo de no máximo capacity chaves. Quando o
+    resumo passa da capacidade, as menores estimativas saem e floor guarda a maior estimativa
+    descartada: nenhuma chave fora do resumo pode ter total maior que floor, e toda chave do
+    resumo tem estimativa >= total real. As estimativas viram valores exatos com refine(),
+    uma segunda passada que soma apenas as chaves candidatas.
+
+    Exemplo:
+        chunks = lambda: get_data('csv', 'processed', filename_or_path='e_commerce_prepared.csv', chunksize=200_000)
+        top = TopK('customer_id', k=10)
+        for chunk in chunks():
+            top.update(chunk)
+        top.refine(chunks)
+    """
+
+    def __init__(self, key: str, measure: Optional[str] = None, k: int = 10, capacity: Optional[int] = None):
+        if k < 1:
+            raise ValueError("k deve ser maior que zero.")
+        self.key = key
+        self.measure = measure
+        self.k = k
+        self.capacity = max(capacity or 50 * k, k)
+        self.value_name = measure or 'quantidade'
+        self.floor: Optional[float] = None  # None = nenhuma chave foi descartada ainda
+        self._estimate = pd.Series(dtype='float64')
+        self._error = pd.Series(dtype='float64')
+
+    def _aggregate(self, chunk: pd.DataFrame) -> pd.Series:
+        group = chunk.groupby(self.key, dropna=False, sort=False, observed=True)
+        totals = group.size() if self.measure is None else group[self.measure].sum()
+        return totals.astype('float64')
+
+    def update(self, chunk: pd.DataFrame) -> 'TopK':
+        """
+        Soma um chunk ao resumo.
+        """
+        if chunk.empty:
+            return self
+        totals = self._aggregate(chunk)
+        known = totals.index.isin(self._estimate.index)
+
+        # Chave nova pode ter sido descartada antes com total de até floor (ou nunca vista: 0)
+        bound = 0.0 if self.floor is None else max(self.floor, 0.0)
+        new = totals[~known]
+        estimate = self._estimate.add(totals[known], fill_value=0.0)
+        self._estimate = pd.concat([estimate, new + bound])
+        self._error = pd.concat([self._error, pd.Series(bound, index=new.index)])
+
+        if len(self._estimate) > self.capacity:
+            keep = self._estimate.nlargest(self.capacity, keep='first').index
+            evicted = self._estimate.drop(keep).max()
+            self.floor = evicted if self.floor is None else max(self.floor, evicted)
+            self._estimate = self._estimate.loc[keep]
+            self._error = self._error.loc[keep]
+        return self
+
+    @property
+    def exact(self) -> bool:
+        """
+        True se nenhuma chave foi descartada (as estimativas são os totais exatos).
+        """
+        return self.floor is None
+
+    def candidates(self) -> pd.DataFrame:
+        """
+        Chaves monitoradas com estimativa (limite superior) e erro máximo, da maior para a menor.
+        """
+        frame = pd.DataFrame({'estimativa': self._estimate, 'erro_maximo': self._error.reindex(self._estimate.index)})
+        return frame.rename_axis(self.key).sort_values('estimativa', ascending=False, kind='stable').reset_index()
+
+    def _ranking(self, totals: pd.Series) -> pd.DataFrame:
+        top = totals.nlargest(self.k, keep='first')
+        if self.measure is None:
+            top = top.astype('int64')
+        return top.rename(self.value_name).rename_axis(self.key).reset_index()
+
+    def result(self) -> pd.DataFrame:
+        """
+        Top-K do resumo. Se nenhuma chave foi descartada (exact), os valores são os totais
+        exatos [key, valor]; senão, as K maiores candidatas com [key, estimativa, erro_maximo],
+        pois as estimativas são apenas limites superiores (use refine() para o valor exato).
+        """
+        if self.exact:
+            return self._ranking(self._estimate)
+        return self.candidates().head(self.k)
+
+    def refine(self, data: ChunkSource) -> pd.DataFrame:
+        """
+        Segunda passada: soma exatamente as chaves candidatas e devolve o ranking exato.
+
+        Args:
+            data: Os mesmos dados da primeira passada (DataFrame ou função que gera os chunks de novo)
+
+        Returns:
+            DataFrame [key, valor] com os K maiores totais exatos
+
+        Raises:
+            TopKIncompleteError: se alguma chave descartada ainda puder superar o K-ésimo total
+        """
+        if self.exact:
+            return self.result()
+        candidates = self._estimate.index
+        totals = pd.Series(dtype='float64')
+        for chunk in _chunks(data):
+            selected = chunk[chunk[self.key].isin(candidates)]
+            totals = totals.add(self._aggregate(selected), fill_value=0.0)
+
+        ranking = self._ranking(totals)
+        if len(ranking) < self.k or ranking[self.value_name].iloc[-1] < self.floor:
+            # Alguma chave descartada ainda pode superar o K-ésimo total
+            raise TopKIncompleteError(
+                f"Top-{self.k} de {self.key} não pôde ser provado com capacity={self.capacity}; use uma capacity maior"
+            )
+        return ranking
+
+
+def top_k(
+    data: ChunkSource,
+    key: str = 'product',
+    measure: Optional[str] = 'gross_revenue',
+    k: int = 10,
+    capacity: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Ranking exato dos K maiores totais por chave (produto, categoria, customer_id...).
+
+    Com um DataFrame, agrega e seleciona com nlargest (sem ordenar todos os grupos). Com um
+    fluxo de chunks, usa o resumo Space-Saving de TopK (memória limitada a capacity chaves);
+    se data for uma função que gera os chunks, uma segunda passada torna os valores exatos
+    (se ela não provar o ranking, as duas passadas são refeitas com capacity 4x maior).
+    Um fluxo que não pode ser relido só dá o ranking exato se nenhuma chave for descartada;
+    senão retorna as estimativas (colunas 'estimativa' e 'erro_maximo').
+
+    Args:
+        data: DataFrame, fluxo de chunks ou função sem argumentos que retorna um fluxo de chunks
+        key: Coluna de agrupamento (ex.: 'product', 'product_category', 'customer_id')
+        measure: Coluna somada (ex.: 'gross_revenue', 'profit'); None conta as linhas (pedidos)
+        k: Número de posições do ranking
+        capacity: Chaves mantidas no resumo (padrão: 50 * k)
+
+    Returns:
+        DataFrame [key, measure (ou 'quantidade')] em ordem decrescente
+        (ou [key, estimativa, erro_maximo] no caso aproximado)
+
+    Exemplo:
+        top_k(df, 'product', 'profit')
+        top_k(lambda: get_data('csv', 'processed', filename_or_path='e_commerce_prepared.csv', chunksize=200_000),
+              key='customer_id', measure=None)
+    """
+    summary = TopK(key, measure, k, capacity)
+    if isinstance(data, pd.DataFrame):
+        return summary._ranking(summary._aggregate(data))
+
+    while True:
+        for chunk in _chunks(data):
+            summary.update(chunk)
+        if summary.exact:
+            return summary.result()
+        if not callable(data):
+            print(f"⚠️ Top-{k} aproximado: o fluxo não pode ser relido; passe uma função que gere os chunks para o valor exato")
+            return summary.result()
+        try:
+            return summary.refine(data)
+        except TopKIncompleteError:
+            print(f"⚠️ Top-{k} não provado com capacity={summary.capacity}; refazendo com {summary.capacity * 4}")
+            summary = TopK(key, measure, k, summary.capacity * 4)
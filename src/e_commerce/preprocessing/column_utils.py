@@ -6,6 +6,7 @@ Funções para limpeza, renomeação e padronização de nomes de colunas
 import pandas as pd
 import re
 from typing import Dict, Optional
+from e_commerce.utils.chunks import is_chunk_stream
 
 
 def clean_columns(df, remove_spaces=True, lowercase=True, remove_special_chars=True, 
@@ -14,7 +15,7 @@ def clean_columns(df, remove_spaces=True, lowercase=True, remove_special_chars=T
     Limpa nomes das colunas
     
     Args:
-        df: DataFrame
+        df: DataFrame ou gerador de chunks (modo streaming)
         remove_spaces: remover espaços
         lowercase: converter para minúsculas
         remove_special_chars: remover caracteres especiais
@@ -22,8 +23,12 @@ def clean_columns(df, remove_spaces=True, lowercase=True, remove_special_chars=T
         verbose: mostrar alterações
     
     Returns:
-        DataFrame com colunas limpas
+        DataFrame com colunas limpas (ou gerador de chunks)
     """
+    if is_chunk_stream(df):
+        return _apply_to_chunks(df, clean_columns, verbose, remove_spaces=remove_spaces, lowercase=lowercase,
+                                remove_special_chars=remove_special_chars, custom_replacements=custom_replacements)
+
     df_clean = df.copy()
     old_columns = df_clean.columns.tolist()
     new_columns = old_columns.copy()
@@ -63,13 +68,16 @@ def rename_columns(df, column_mapping, verbose=True):
     Renomeia colunas específicas
     
     Args:
-        df: DataFrame
+        df: DataFrame ou gerador de chunks (modo streaming)
         column_mapping: dict {'nome_antigo': 'nome_novo'}
         verbose: mostrar alterações
     
     Returns:
-        DataFrame com colunas renomeadas
+        DataFrame com colunas renomeadas (ou gerador de chunks)
     """
+    if is_chunk_stream(df):
+        return _apply_to_chunks(df, rename_columns, verbose, column_mapping=column_mapping)
+
     df_renamed = df.copy()
     
     # Verificar se colunas existem
@@ -85,4 +93,13 @@ def rename_columns(df, column_mapping, verbose=True):
         for old, new in column_mapping.items():
             print(f"   '{old}' → '{new}'")
     
-    return df_renamed
\ No newline at end of file
+    return df_renamed
+
+
+def _apply_to_chunks(chunks, func, verbose, **kwargs):
+    """
+    Aplica func em cada chunk; as mensagens são mostradas apenas no primeiro,
+    já que todos os chunks têm as mesmas colunas.
+    """
+    for i, chunk in enumerate(chunks):
+        yield func(chunk, verbose=verbose and i == 0, **kwargs)
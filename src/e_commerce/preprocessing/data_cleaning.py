@@ -6,6 +6,7 @@ Funções para remoção de nulos e duplicatas
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
+from e_commerce.utils.chunks import is_chunk_stream
 
 
 def remove_nulls(df, strategy='drop', columns=None, fill_value=None, verbose=True):
@@ -13,15 +14,21 @@ def remove_nulls(df, strategy='drop', columns=None, fill_value=None, verbose=Tru
     Remove ou trata valores nulos
     
     Args:
-        df: DataFrame
+        df: DataFrame ou gerador de chunks (modo streaming)
         strategy: 'drop', 'fill_mean', 'fill_median', 'fill_mode', 'fill_value'
+                  - em modo streaming apenas 'drop' e 'fill_value' (estratégias sem estatística global)
         columns: colunas específicas (None = todas)
         fill_value: valor para preencher quando strategy='fill_value'
         verbose: mostrar informações
     
     Returns:
-        DataFrame tratado
+        DataFrame tratado (ou gerador de chunks tratados)
     """
+    if is_chunk_stream(df):
+        if strategy not in ('drop', 'fill_value'):
+            raise ValueError(f"Estratégia '{strategy}' depende do dataset inteiro e não é suportada em modo streaming.")
+        return _remove_nulls_chunks(df, strategy, columns, fill_value, verbose)
+
     df_clean = df.copy()
     
     if columns is None:
@@ -61,14 +68,19 @@ def remove_duplicates(df, columns=None, keep='first', verbose=True):
     Remove duplicatas
     
     Args:
-        df: DataFrame
+        df: DataFrame ou gerador de chunks (modo streaming)
         columns: colunas para considerar (None = todas)
-        keep: 'first', 'last' ou False
+        keep: 'first', 'last' ou False - em modo streaming apenas 'first'
         verbose: mostrar informações
     
     Returns:
-        DataFrame sem duplicatas
+        DataFrame sem duplicatas (ou gerador de chunks sem duplicatas)
     """
+    if is_chunk_stream(df):
+        if keep != 'first':
+            raise ValueError("Em modo streaming apenas keep='first' é suportado.")
+        return _remove_duplicates_chunks(df, columns, verbose)
+
     df_clean = df.copy()
     
     duplicates_before = df_clean.duplicated(subset=columns).sum()
@@ -79,4 +91,83 @@ def remove_duplicates(df, columns=None, keep='first', verbose=True):
         print(f"🔄 Duplicatas removidas: {duplicates_removed}")
         print(f"📊 Linhas: {len(df)} → {len(df_clean)}")
     
-    return df_clean
\ No newline at end of file
+    return df_clean
+
+
+def _remove_nulls_chunks(chunks, strategy, columns, fill_value, verbose):
+    """
+    Versão streaming de remove_nulls: trata cada chunk e mostra o resumo ao final.
+    """
+    nulls_before = nulls_after = rows_before = rows_after = 0
+
+    for chunk in chunks:
+        cols = chunk.columns if columns is None else columns
+        nulls_before += int(chunk[cols].isnull().sum().sum())
+        rows_before += len(chunk)
+
+        chunk_clean = remove_nulls(chunk, strategy=strategy, columns=columns, fill_value=fill_value, verbose=False)
+
+        nulls_after += int(chunk_clean[cols].isnull().sum().sum())
+        rows_after += len(chunk_clean)
+        yield chunk_clean
+
+    if verbose:
+        print(f"🧹 Valores nulos: {nulls_before} → {nulls_after}")
+        if strategy == 'drop' and rows_before:
+            rows_removed = rows_before - rows_after
+            print(f"📉 Linhas removidas: {rows_removed} ({rows_removed/rows_before*100:.2f}%)")
+
+
+class _SeenHashes:
+    """
+    Conjunto de hashes uint64 já vistos, guardado em runs ordenados de NumPy (8 bytes por hash).
+
+    Cada chunk vira um run novo; quando o último run fica com pelo menos metade do tamanho do
+    anterior, os dois são intercalados. Assim há no máximo O(log N) runs, a consulta é um
+    searchsorted por run e cada hash é regravado O(log N) vezes no total, em vez de o
+    conjunto inteiro ser percorrido a cada chunk.
+    """
+
+    def __init__(self):
+        self._runs: List[np.ndarray] = []
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[pos] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        self._runs.append(np.sort(hashes))
+        while len(self._runs) > 1 and 2 * len(self._runs[-1]) >= len(self._runs[-2]):
+            last = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]), kind='stable')
+
+
+def _remove_duplicates_chunks(chunks, columns, verbose):
+    """
+    Versão streaming de remove_duplicates.
+    Guarda apenas o hash (64 bits) de cada linha já vista (_SeenHashes), então a memória
+    cresce com o número de linhas únicas (8 bytes por linha) e não com o tamanho das linhas;
+    ela não é limitada: um fluxo com 100 milhões de linhas distintas guarda ~800 MB de hashes.
+    """
+    seen = _SeenHashes()
+    rows_before = rows_after = 0
+
+    for chunk in chunks:
+        subset = chunk if columns is None else chunk[columns]
+        hashes = pd.util.hash_pandas_object(subset, index=False)
+        values = hashes.to_numpy()
+        mask = ~hashes.duplicated(keep='first').to_numpy() & ~seen.contains(values)
+        seen.add(values[mask])
+
+        rows_before += len(chunk)
+        rows_after += int(mask.sum())
+        yield chunk[mask]
+
+    if verbose:
+        print(f"🔄 Duplicatas removidas: {rows_before - rows_after}")
+        print(f"📊 Linhas: {rows_before} → {rows_after}")
@@ -5,6 +5,7 @@ Funções para conversão e detecção automática de tipos
 
 import pandas as pd
 from typing import Dict, Optional
+from e_commerce.utils.chunks import is_chunk_stream
 
 
 def padroniza_tipos_dados(df, type_mapping=None, auto_detect=True, verbose=True):
@@ -12,14 +13,17 @@ def padroniza_tipos_dados(df, type_mapping=None, auto_detect=True, verbose=True)
     Padroniza tipos de dados
     
     Args:
-        df: DataFrame
+        df: DataFrame ou gerador de chunks (modo streaming)
         type_mapping: dict {'coluna': 'tipo'}
         auto_detect: tentar detectar tipos automaticamente
         verbose: mostrar alterações
     
     Returns:
-        DataFrame com tipos padronizados
+        DataFrame com tipos padronizados (ou gerador de chunks padronizados)
     """
+    if is_chunk_stream(df):
+        return _padroniza_tipos_chunks(df, type_mapping, auto_detect, verbose)
+
     df_typed = df.copy()
     
     if auto_detect:
@@ -43,6 +47,10 @@ def padroniza_tipos_dados(df, type_mapping=None, auto_detect=True, verbose=True)
     if type_mapping:
         for col, dtype in type_mapping.items():
             if col in df_typed.columns:
+                # Coluna já no tipo desejado (ex.: lida com o schema de config/schemas.py)
+                current = df_typed[col].dtype
+                if str(current) == str(dtype) or (dtype == 'datetime' and pd.api.types.is_datetime64_any_dtype(current)):
+                    continue
                 try:
                     if dtype == 'datetime':
                         df_typed[col] = pd.to_datetime(df_typed[col])
@@ -57,4 +65,20 @@ def padroniza_tipos_dados(df, type_mapping=None, auto_detect=True, verbose=True)
         print("🔧 TIPOS DE DADOS:")
         print(df_typed.dtypes)
     
-    return df_typed
\ No newline at end of file
+    return df_typed
+
+
+def _padroniza_tipos_chunks(chunks, type_mapping, auto_detect, verbose):
+    """
+    Versão streaming de padroniza_tipos_dados: converte chunk a chunk.
+    Com auto_detect=True cada chunk é inferido isoladamente, então prefira
+    um type_mapping explícito para garantir os mesmos tipos em todos os chunks.
+    """
+    last_chunk = None
+    for chunk in chunks:
+        last_chunk = padroniza_tipos_dados(chunk, type_mapping=type_mapping, auto_detect=auto_detect, verbose=False)
+        yield last_chunk
+
+    if verbose and last_chunk is not None:
+        print("🔧 TIPOS DE DADOS:")
+        print(last_chunk.dtypes)
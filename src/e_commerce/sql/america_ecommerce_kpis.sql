@@ -20,18 +20,18 @@ FROM "e-commerce".ecommerce_america;
 
 -- Total de Vendas por mês no ano
 SELECT
-	DATE_TRUNC('month', order_date::timestamp) AS mes,
+	DATE_TRUNC('month', order_date) AS mes,
 	SUM(sales) AS total_de_vendas
 FROM "e-commerce".ecommerce_america
-GROUP BY DATE_TRUNC('month', order_date::timestamp)
+GROUP BY DATE_TRUNC('month', order_date)
 ORDER BY mes;
 
 -- Tabela de vendas por dia no mês
 SELECT
-	DATE_TRUNC('day', order_date::timestamp) AS dia_mes,
+	DATE_TRUNC('day', order_date) AS dia_mes,
 	SUM(sales) AS total_de_vendas
 FROM "e-commerce".ecommerce_america
-GROUP BY DATE_TRUNC('day', order_date::timestamp)
+GROUP BY DATE_TRUNC('day', order_date)
 ORDER BY dia_mes;
 
 -- Top 10 produtos por faturamento bruto
@@ -41,7 +41,8 @@ SELECT
 	to_char(SUM(gross_revenue), 'L999G999G999G990') AS faturamento_bruto
 FROM "e-commerce".ecommerce_america
 GROUP BY product
-ORDER BY faturamento_bruto DESC;
+ORDER BY SUM(gross_revenue) DESC
+LIMIT 10;
 
 -- Top categorias por faturamento bruto
 -- Caso queira forçar o cifrão na frente do resultado insir antes do to_char 'R$' ou 'S' || ....
@@ -50,7 +51,7 @@ SELECT
 	to_char(SUM(gross_revenue), 'L999G999G999G990') AS faturamento_bruto
 FROM "e-commerce".ecommerce_america
 GROUP BY product_category
-ORDER BY faturamento_bruto DESC;
+ORDER BY SUM(gross_revenue) DESC;
 
 -- Top 10 produtos por lucro obtido
 -- Caso queira forçar o cifrão na frente do resultado insir antes do to_char 'R$' ou 'S' || ....
@@ -59,7 +60,8 @@ SELECT
 	'$' || to_char(SUM(profit), '999,999,999,990.99') AS lucro_por_produto
 FROM "e-commerce".ecommerce_america
 GROUP BY product
-ORDER BY lucro_por_produto DESC;
+ORDER BY SUM(profit) DESC
+LIMIT 10;
 
 -- Top categorias por lucro obtido
 -- Caso queira forçar o cifrão na frente do resultado insir antes do to_char 'R$' ou 'S' || ....
@@ -68,7 +70,7 @@ SELECT
 	'$' || to_char(SUM(profit), '999,999,999,990.99') AS lucro_por_categoria
 FROM "e-commerce".ecommerce_america
 GROUP BY product_category
-ORDER BY lucro_por_categoria DESC;
+ORDER BY SUM(profit) DESC;
 
 -- Margem Média de lucro por produto
 SELECT
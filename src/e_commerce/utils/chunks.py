@@ -0,0 +1,23 @@
+"""
+Módulo para processamento em chunks
+Funções auxiliares para trabalhar com fluxos (iteradores) de DataFrames
+"""
+
+import pandas as pd
+from typing import Any
+
+
+def is_chunk_stream(obj: Any) -> bool:
+    """
+    Verifica se o objeto é um fluxo de chunks (iterável de DataFrames).
+
+    Args:
+        obj: DataFrame, iterador/gerador de DataFrames ou TextFileReader
+
+    Returns:
+        True se for um fluxo de chunks, False se for um DataFrame comum
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series, str, bytes, dict)):
+        return False
+    return hasattr(obj, '__iter__')
+
@@ -1,4 +1,5 @@
 import os
+import shutil
 import pandas as pd
 from e_commerce.config.settings import DATA_PROCESSED, DATA_INTERIM, DATA_RAW  # ✅ Import correto (sem 'src.')
 
@@ -95,4 +96,146 @@ def load_from_csv_raw(filename: str, parse_dates: str = None):
     if parse_dates == None:
         return pd.read_csv(filepath)
     else:
-        return pd.read_csv(filepath, parse_dates=parse_dates)
\ No newline at end of file
+        return pd.read_csv(filepath, parse_dates=parse_dates)
+
+def _replace_path(tmp_path, filepath):
+    """
+    Troca o conteúdo de filepath pelo de tmp_path (o antigo só é apagado depois da troca).
+    """
+    old_path = f"{filepath}.old-{os.getpid()}"
+    if os.path.exists(filepath):
+        os.replace(filepath, old_path)
+    os.replace(tmp_path, filepath)
+    if os.path.isdir(old_path):
+        shutil.rmtree(old_path)
+    elif os.path.exists(old_path):
+        os.remove(old_path)
+
+def _save_parquet(df, folder, filename, partition_cols=None, sort_by=None, row_group_size=100_000, index=False, partition_mode='overwrite'):
+    """
+    Grava o DataFrame em Parquet otimizado para leitura com filtros.
+
+    - sort_by ordena as linhas antes de gravar, deixando o min/max de cada row group
+      estreito (ex.: 'order_date'), o que permite pular row groups na leitura
+    - partition_cols grava um diretório particionado no estilo hive (ex.: year=2018/month=1);
+      'year' e 'month' são derivados de sort_by quando não existem no DataFrame
+    - partition_mode='overwrite' grava o dataset em uma pasta temporária e substitui o
+      anterior inteiro; 'delete_matching' substitui só as partições presentes em df e
+      mantém as demais (acréscimo/atualização de partições)
+    """
+    if partition_mode not in ('overwrite', 'delete_matching'):
+        raise ValueError(f"Valor inválido para partition_mode: {partition_mode}")
+    os.makedirs(folder, exist_ok=True)
+    filepath = os.path.join(folder, filename)
+
+    if sort_by:
+        df = df.sort_values(sort_by, kind='stable')
+
+    if partition_cols:
+        df = df.copy()
+        date_col = sort_by if isinstance(sort_by, str) else None
+        for part in ('year', 'month'):
+            if part in partition_cols and part not in df.columns:
+                if date_col is None:
+                    raise ValueError(f"Informe sort_by com a coluna de data para derivar '{part}'.")
+                dates = pd.to_datetime(df[date_col])
+                df[part] = dates.dt.year if part == 'year' else dates.dt.month
+        if partition_mode == 'delete_matching':
+            df.to_parquet(filepath, engine='pyarrow', index=index, partition_cols=partition_cols,
+                            max_rows_per_group=row_group_size, existing_data_behavior='delete_matching')
+        else:
+            tmp_path = f"{filepath}.tmp-{os.getpid()}"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            df.to_parquet(tmp_path, engine='pyarrow', index=index, partition_cols=partition_cols,
+                            max_rows_per_group=row_group_size)
+            _replace_path(tmp_path, filepath)
+    else:
+        df.to_parquet(filepath, engine='pyarrow', index=index, row_group_size=row_group_size)
+
+    print(f"✅ Arquivo salvo em: {filepath}")
+    return filepath
+
+# Salva Parquet em Processed
+def save_to_parquet_processed(df, filename: str, partition_cols=None, sort_by=None, row_group_size=100_000, index=False, partition_mode='overwrite'):
+    """
+    Salva um DataFrame como Parquet na pasta DATA_PROCESSED.
+    
+    Args:
+        df: DataFrame do pandas
+        filename: Nome do arquivo ou diretório (ex: 'dados.parquet')
+        partition_cols: Colunas de partição hive (ex: ['year', 'month'])
+        sort_by: Coluna usada para ordenar as linhas (ex: 'order_date')
+        row_group_size: Quantidade de linhas por row group
+        partition_mode: 'overwrite' (substitui o dataset inteiro) ou 'delete_matching'
+                        (substitui só as partições presentes no DataFrame)
+    
+    Returns:
+        str: Caminho completo do arquivo salvo
+    """
+    return _save_parquet(df, DATA_PROCESSED, filename, partition_cols, sort_by, row_group_size, index, partition_mode)
+
+# Salva Parquet em Interim
+def save_to_parquet_interim(df, filename: str, partition_cols=None, sort_by=None, row_group_size=100_000, index=False, partition_mode='overwrite'):
+    """
+    Salva um DataFrame como Parquet na pasta DATA_INTERIM.
+    
+    Args:
+        df: DataFrame do pandas
+        filename: Nome do arquivo ou diretório (ex: 'dados.parquet')
+        partition_cols: Colunas de partição hive (ex: ['year', 'month'])
+        sort_by: Coluna usada para ordenar as linhas (ex: 'order_date')
+        row_group_size: Quantidade de linhas por row group
+        partition_mode: 'overwrite' (substitui o dataset inteiro) ou 'delete_matching'
+                        (substitui só as partições presentes no DataFrame)
+    
+    Returns:
+        str: Caminho completo do arquivo salvo
+    """
+    return _save_parquet(df, DATA_INTERIM, filename, partition_cols, sort_by, row_group_size, index, partition_mode)
+
+
+def _save_arrow(df, folder, filename, chunksize=None):
+    """
+    Grava o DataFrame em Arrow IPC/Feather v2 sem compressão.
+    Sem compressão o arquivo pode ser mapeado em memória (mmap) na leitura,
+    permitindo que vários processos compartilhem as mesmas páginas.
+    """
+    import pyarrow.feather as feather
+
+    os.makedirs(folder, exist_ok=True)
+    filepath = os.path.join(folder, filename)
+
+    feather.write_feather(df, filepath, compression='uncompressed', chunksize=chunksize)
+
+    print(f"✅ Arquivo salvo em: {filepath}")
+    return filepath
+
+# Salva Arrow em Processed
+def save_to_arrow_processed(df, filename: str, chunksize=None):
+    """
+    Salva um DataFrame como Arrow IPC/Feather (sem compressão) na pasta DATA_PROCESSED.
+    
+    Args:
+        df: DataFrame do pandas
+        filename: Nome do arquivo (ex: 'dados.arrow')
+        chunksize: Linhas por record batch (None = padrão do pyarrow)
+    
+    Returns:
+        str: Caminho completo do arquivo salvo
+    """
+    return _save_arrow(df, DATA_PROCESSED, filename, chunksize)
+
+# Salva Arrow em Interim
+def save_to_arrow_interim(df, filename: str, chunksize=None):
+    """
+    Salva um DataFrame como Arrow IPC/Feather (sem compressão) na pasta DATA_INTERIM.
+    
+    Args:
+        df: DataFrame do pandas
+        filename: Nome do arquivo (ex: 'dados.arrow')
+        chunksize: Linhas por record batch (None = padrão do pyarrow)
+    
+    Returns:
+        str: Caminho completo do arquivo salvo
+    """
+    return _save_arrow(df, DATA_INTERIM, filename, chunksize)
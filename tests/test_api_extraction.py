@@ -0,0 +1,82 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from e_commerce.data_extraction.api_extraction import extract_paginated_api, get_session
+
+# API de teste: 95 registros e no máximo 20 por página, qualquer que seja o limit pedido
+RECORDS = [{'id': i} for i in range(95)]
+PAGE_CAP = 20
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        limit = min(int(query.get('limit', 10)), PAGE_CAP)
+        if 'page' in query:
+            start = (int(query['page']) - 1) * limit
+        else:
+            start = int(query.get('offset', 0))
+        records = RECORDS[start:start + limit]
+        if parsed.path == '/envelope':
+            payload = {'data': records, 'meta': {'total': len(RECORDS)}}
+        else:
+            payload = records
+        self.server.requests += 1
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def api_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path='/items'):
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+@pytest.mark.parametrize('pagination', ['offset', 'page'])
+def test_paginacao_com_pagina_limitada_pela_api(api_server, pagination):
+    df = extract_paginated_api(_url(api_server), pagination=pagination, page_size=50, max_workers=3)
+    assert df['id'].tolist() == list(range(95))
+
+
+def test_paginacao_para_no_total_informado(api_server):
+    df = extract_paginated_api(
+        _url(api_server, '/envelope'), records_path='data', total_path='meta.total',
+        page_size=20, max_workers=1,
+    )
+    assert df['id'].tolist() == list(range(95))
+    # 5 páginas com dados e nenhuma requisição extra para descobrir a página vazia
+    assert api_server.requests == 5
+
+
+def test_paginacao_stream(api_server):
+    frames = list(extract_paginated_api(_url(api_server), page_size=20, max_workers=2, stream=True))
+    assert [len(frame) for frame in frames] == [20, 20, 20, 20, 15]
+
+
+def test_get_session_por_tamanho_de_pool():
+    small, large = get_session(pool_maxsize=4), get_session(pool_maxsize=64)
+    assert small is not large
+    assert get_session(pool_maxsize=64) is large
+    assert large.get_adapter('https://example.com')._pool_maxsize == 64
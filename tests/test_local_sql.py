@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from e_commerce.conections.local_sql import run_kpis_local, to_duckdb_sql
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    df = pd.DataFrame({
+        'order_date': ['2018-01-05', '2018-01-20', '2018-02-03', '2018-02-10', '2018-03-15'],
+        'product': ['Notebook', 'Mouse', 'Notebook', 'Teclado', 'Mouse'],
+        'product_category': ['Eletrônicos', 'Acessórios', 'Eletrônicos', 'Acessórios', 'Acessórios'],
+        'sales': [1000.0, 50.0, 1200.0, 0.0, 70.0],
+        'quantity': [1, 2, 1, 1, 3],
+        'gross_revenue': [1000.0, 100.0, 1200.0, 80.0, 210.0],
+        'discount': [0.1, 0.0, 0.2, 0.0, 0.1],
+        'profit': [200.0, 20.0, 300.0, None, 30.0],
+        'payment_method': ['credit_card', 'pix', 'credit_card', 'pix', 'credit_card'],
+    })
+    path = tmp_path / 'e_commerce_teste.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_run_kpis_local(dataset):
+    kpis = run_kpis_local(filename_or_path=dataset)
+
+    assert kpis['Ticket Médio das Vendas']['ticket_medio'].iloc[0] == pytest.approx(464.0)
+    assert kpis['Volume de vendas no ano']['qtde_vendidas'].iloc[0] == 8
+    assert len(kpis['Total de Vendas por mês no ano']) == 3
+
+    top = kpis['Top 10 produtos por faturamento bruto']
+    assert top['produto'].tolist() == ['Notebook', 'Mouse', 'Teclado']
+    assert top['faturamento_bruto'].tolist() == [2200, 310, 80]
+
+    pagamento = kpis['Forma de pagamento quantidade']
+    assert pagamento['qtde_metodo_pagamento'].tolist() == [3, 2]
+
+
+def test_margem_com_null_vem_primeiro_como_no_postgres(dataset):
+    margem = run_kpis_local(filename_or_path=dataset)['Margem Média de lucro por produto']
+    # Teclado: profit NULL -> margem NULL, que o PostgreSQL ordena primeiro em DESC
+    assert margem['product'].tolist() == ['Teclado', 'Mouse', 'Notebook']
+    assert pd.isna(margem['margem_lucro_media'].iloc[0])
+
+
+def test_to_duckdb_sql_desc_nulls_first():
+    sql = to_duckdb_sql('SELECT "desc" FROM t ORDER BY a DESC, b desc NULLS LAST, c')
+    assert sql == 'SELECT "desc" FROM t ORDER BY a DESC NULLS FIRST, b desc NULLS LAST, c'
@@ -0,0 +1,103 @@
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from e_commerce.data_extraction.s3_utils import importar_arquivos_s3, listar_objetos_s3
+
+
+class _Paginator:
+    def __init__(self, client, page_size):
+        self.client = client
+        self.page_size = page_size
+
+    def paginate(self, Bucket, Prefix):
+        keys = sorted(key for key in self.client.objects[Bucket] if key.startswith(Prefix))
+        for start in range(0, len(keys), self.page_size):
+            yield {"Contents": [{"Key": key, "Size": len(self.client.objects[Bucket][key])}
+                                for key in keys[start:start + self.page_size]]}
+
+
+class StubS3Client:
+    """
+    Cliente S3 em memória com a parte da API do boto3 usada por s3_utils.
+    """
+
+    def __init__(self, objects, page_size=1000):
+        self.objects = objects
+        self.page_size = page_size
+        self.downloads = []
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation):
+        assert operation == "list_objects_v2"
+        return _Paginator(self, self.page_size)
+
+    def get_object(self, Bucket, Key):
+        with self._lock:
+            self.downloads.append(Key)
+        return {"Body": io.BytesIO(self.objects[Bucket][Key])}
+
+
+def _csv(df):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _parquet(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client():
+    objects = {
+        f"bronze/vendas_{i:02d}.csv": _csv(pd.DataFrame({"id": range(i * 10, i * 10 + 10), "valor": [float(i)] * 10}))
+        for i in range(5)
+    }
+    objects["bronze/vendas_05.parquet"] = _parquet(pd.DataFrame({"id": range(50, 60), "valor": [5.0] * 10}))
+    objects["bronze/leia-me.txt"] = b"ignorar"
+    objects["bronze/vazio.csv"] = b""
+    objects["silver/outro.csv"] = _csv(pd.DataFrame({"id": [999], "valor": [0.0]}))
+    return StubS3Client({"bucket": objects}, page_size=2)
+
+
+def test_listagem_percorre_todas_as_paginas(client):
+    keys = [obj["Key"] for obj in listar_objetos_s3("bucket", "bronze/", client)]
+    assert len(keys) == 8
+
+
+def test_importa_csv_e_parquet_na_ordem_da_listagem(client):
+    df = importar_arquivos_s3("bucket", "bronze/", max_workers=4, s3_client=client)
+    assert df["id"].tolist() == list(range(60))
+    assert df["valor"].dtype == "float64"
+    assert "bronze/leia-me.txt" not in client.downloads
+
+
+def test_filtra_arquivos_antes_do_download(client):
+    df = importar_arquivos_s3("bucket", "bronze/", arquivos_desejados=["vendas_03.csv"], s3_client=client)
+    assert df["id"].tolist() == list(range(30, 40))
+    assert client.downloads == ["bronze/vendas_03.csv"]
+
+
+def test_sem_arquivos(client):
+    assert importar_arquivos_s3("bucket", "gold/", s3_client=client).empty
+
+
+def test_une_arquivos_com_esquemas_diferentes():
+    objects = {
+        # cupom vazio vira float64 num arquivo e texto no outro; codigo mistura int e str
+        "bronze/a.csv": b"id,cupom,codigo\n1,,10\n2,,11\n",
+        "bronze/b.csv": b"id,cupom,codigo\n3,PROMO10,X1\n",
+        "bronze/c.parquet": _parquet(pd.DataFrame({"id": [4], "codigo": pd.Series([12], dtype=object), "extra": ["novo"]})),
+    }
+    client = StubS3Client({"bucket": objects})
+    df = importar_arquivos_s3("bucket", "bronze/", s3_client=client)
+    assert df["id"].tolist() == [1, 2, 3, 4]
+    assert df["cupom"].iloc[2] == "PROMO10"
+    assert df["cupom"].iloc[:2].isna().all()
+    assert df["codigo"].tolist() == [10, 11, "X1", 12]
+    assert df["extra"].iloc[3] == "novo" and df["extra"].iloc[:3].isna().all()